@@ -0,0 +1,49 @@
+"""Compare 2D-first and legacy 3D meshing of gears and sprockets.
+
+Run from the repository root::
+
+    python benchmarks/gear_modes.py --teeth 10 20 40 80 120
+"""
+
+import argparse
+import logging
+import time
+
+from parametric_cad.cache import set_mesh_cache
+from parametric_cad.primitives.gear import SpurGear
+from parametric_cad.primitives.sprocket import ChainSprocket
+
+
+def best_time(factory, repeat):
+    best = float("inf")
+    mesh = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        mesh = factory().mesh()
+        best = min(best, time.perf_counter() - start)
+    return best, mesh
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teeth", type=int, nargs="+", default=[10, 20, 40, 80, 120])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    set_mesh_cache(None)
+
+    print(f"{'part':<10}{'teeth':>6}{'3d ms':>10}{'2d ms':>10}{'speedup':>9}{'2d watertight':>15}")
+    for name, cls in (("SpurGear", SpurGear), ("Sprocket", ChainSprocket)):
+        for teeth in args.teeth:
+            kwargs = {"module": 1.0} if cls is SpurGear else {}
+            t3, _ = best_time(lambda: cls(teeth=teeth, mode="3d", **kwargs), args.repeat)
+            t2, mesh = best_time(lambda: cls(teeth=teeth, mode="2d", **kwargs), args.repeat)
+            print(
+                f"{name:<10}{teeth:>6}{t3 * 1000:>10.1f}{t2 * 1000:>10.1f}"
+                f"{t3 / t2:>8.1f}x{str(mesh.is_watertight):>15}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare column and tree scaffolding on the example parts.
+
+Run from the repository root::
+
+    python benchmarks/scaffold_modes.py --grid 5 2
+"""
+
+import argparse
+import logging
+import time
+
+from parametric_cad import Box, combine
+from parametric_cad.cache import set_mesh_cache
+from parametric_cad.core import tm
+from parametric_cad.mechanisms.butthinge import ButtHinge
+from parametric_cad.mechanisms.motor_bracket import RightAngleMotorBracket
+from parametric_cad.scaffolding import generate_scaffolding
+
+
+def example_parts():
+    """Return ``(name, mesh)`` pairs subdivided to ~1mm triangles."""
+
+    ledge = combine(
+        [Box(20, 20, 10), Box(40, 40, 5).at(15, 5, 20), Box(2, 2, 20).at(0, 0, 10)]
+    )
+    door = combine(
+        [Box(100, 3, 40).at(0, 63, 0), ButtHinge(leaf_length=40, pin_diameter=3).at(50, 61.5, 20)]
+    )
+    sphere = tm.creation.icosphere(subdivisions=4, radius=10)
+    sphere.apply_translation([0, 0, 10])
+    parts = [
+        ("ledge", ledge),
+        ("bracket", RightAngleMotorBracket().mesh()),
+        ("door", door),
+        ("sphere", sphere),
+    ]
+    fine = []
+    for name, mesh in parts:
+        v, f = tm.remesh.subdivide_to_size(mesh.vertices, mesh.faces, 1.0)
+        fine.append((name, tm.Trimesh(v, f)))
+    return fine
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grid", type=float, nargs="+", default=[5.0, 2.0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    set_mesh_cache(None)
+
+    print(f"{'part':<9}{'grid':>6}{'mode':>9}{'volume':>10}{'tris':>8}{'ms':>9}")
+    for name, mesh in example_parts():
+        for grid in args.grid:
+            for mode in ("columns", "tree"):
+                seconds, scaff = best_time(
+                    lambda: generate_scaffolding(mesh, grid_size=grid, mode=mode), args.repeat
+                )
+                volume = abs(scaff.volume) if len(scaff.faces) else 0.0
+                print(
+                    f"{name:<9}{grid:>6g}{mode:>9}{volume:>10.1f}"
+                    f"{len(scaff.faces):>8}{seconds * 1000:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
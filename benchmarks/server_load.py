@@ -0,0 +1,116 @@
+"""Load test for the interactive design server.
+
+Starts a server in-process (or targets a running one with ``--port``)
+and drives it with two kinds of simulated users:
+
+* HTTP clients posting gear and sprocket specs drawn from a small pool,
+  so repeated specs exercise the workers' mesh cache;
+* WebSocket sessions dragging a tooth-count slider faster than the
+  debounce window, where only the final position should be built.
+
+Run from the repository root::
+
+    PYTHONPATH=. python benchmarks/server_load.py --clients 8 --requests 25 --sessions 4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+
+from parametric_cad.server import DesignClient, DesignServer, DesignService, LatencyStats
+
+
+def spec_pool(size):
+    rng = random.Random(0)
+    pool = []
+    for _ in range(size):
+        teeth = rng.randrange(12, 48, 2)
+        if rng.random() < 0.5:
+            pool.append({"class": "SpurGear", "params": {"module": rng.choice([1.0, 1.5]), "teeth": teeth}})
+        else:
+            pool.append({"class": "ChainSprocket", "params": {"teeth": teeth}})
+    return pool
+
+
+async def http_user(port, pool, requests, stats, seed):
+    rng = random.Random(seed)
+    async with DesignClient(port=port) as client:
+        for _ in range(requests):
+            spec = dict(rng.choice(pool), format=rng.choice(["stl", "glb"]))
+            start = time.perf_counter()
+            reply = await client.build(spec)
+            stats.add(time.perf_counter() - start)
+            if reply.status != 200:
+                raise RuntimeError(f"{spec} -> {reply.status} {reply.body[:200]!r}")
+
+
+async def slider_user(port, steps, interval, stats, outcomes):
+    async with DesignClient(port=port) as client:
+        socket = await client.websocket()
+        start = time.perf_counter()
+        for i in range(steps):
+            await socket.send({"id": i, "class": "SpurGear", "params": {"module": 1.0, "teeth": 12 + 2 * i}})
+            await asyncio.sleep(interval)
+        last = None
+        while last is None or last["id"] != steps - 1:
+            last, _ = await socket.receive()
+            outcomes[last["status"]] = outcomes.get(last["status"], 0) + 1
+        # time from the last slider event to the final mesh arriving
+        stats.add(time.perf_counter() - start - steps * interval)
+        await socket.close()
+
+
+def report(name, stats):
+    p = stats.percentiles()
+    print(f"{name:<10}{p['count']:>8}{p['p50']:>10.1f}{p['p90']:>10.1f}{p['p99']:>10.1f}{p['max']:>10.1f}")
+
+
+async def run(args):
+    server = None
+    port = args.port
+    if port is None:
+        service = DesignService(args.workers, debounce=args.debounce)
+        server = await DesignServer(service, port=0).start()
+        port = server.port
+    try:
+        http_stats, slider_stats, outcomes = LatencyStats(), LatencyStats(), {}
+        pool = spec_pool(args.pool)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(http_user(port, pool, args.requests, http_stats, seed) for seed in range(args.clients)),
+            *(slider_user(port, args.steps, args.interval, slider_stats, outcomes) for _ in range(args.sessions)),
+        )
+        elapsed = time.perf_counter() - start
+        print(f"{'scenario':<10}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        report("http", http_stats)
+        report("slider", slider_stats)
+        print(f"{http_stats.count / elapsed:.1f} HTTP builds/s; slider replies: {outcomes}")
+        async with DesignClient(port=port) as client:
+            print("server metrics:", json.dumps(await client.metrics(), indent=2))
+    finally:
+        if server is not None:
+            await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, help="use a running server instead of starting one")
+    parser.add_argument("-j", "--workers", type=int, default=2)
+    parser.add_argument("--debounce", type=float, default=0.05)
+    parser.add_argument("--clients", type=int, default=8, help="concurrent HTTP users")
+    parser.add_argument("--requests", type=int, default=25, help="requests per HTTP user")
+    parser.add_argument("--pool", type=int, default=16, help="distinct specs the HTTP users draw from")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent slider sessions")
+    parser.add_argument("--steps", type=int, default=20, help="slider events per session")
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between slider events")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Benchmark suite for meshing, booleans, validation and export.
+
+Run from the repository root::
+
+    PYTHONPATH=. python benchmarks/suite.py run -o baseline.json
+    PYTHONPATH=. python benchmarks/suite.py run -o new.json
+    PYTHONPATH=. python benchmarks/suite.py compare baseline.json new.json
+
+``run`` times every case (optionally filtered with ``-k``) and writes the
+best and median seconds together with the library versions.  ``compare``
+prints the ratio of each case and exits with status 1 when any case got
+slower than ``--threshold`` times its baseline.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from parametric_cad import Box, Cylinder, Sphere, combine, safe_difference
+from parametric_cad.cache import set_mesh_cache
+from parametric_cad.decimate import decimate
+from parametric_cad.model import Model
+from parametric_cad.core import tm
+from parametric_cad.export.stl_writer import write_stl
+from parametric_cad.printability import PrintabilityValidator
+from parametric_cad.repair import repair_mesh
+from parametric_cad.primitives.gear import SpurGear
+from parametric_cad.primitives.sprocket import ChainSprocket
+from parametric_cad.scaffolding import generate_scaffolding
+from parametric_cad.spatial import small_holes
+
+# name -> (setup, timed function, teardown); setup and teardown run once
+# and are not timed
+CASES: Dict[
+    str,
+    Tuple[Callable[[], object], Callable[[object], object], Optional[Callable[[object], object]]],
+] = {}
+
+
+def case(
+    name: str,
+    setup: Callable[[], object] = lambda: None,
+    teardown: Optional[Callable[[object], object]] = None,
+):
+    def register(func):
+        CASES[name] = (setup, func, teardown)
+        return func
+
+    return register
+
+
+def _ledge():
+    model = combine([Box(20, 20, 10), Box(40, 40, 5).at(15, 5, 20), Box(2, 2, 20).at(0, 0, 10)])
+    v, f = tm.remesh.subdivide_to_size(model.vertices, model.faces, 1.0)
+    return tm.Trimesh(v, f)
+
+
+def _broken_sphere(level):
+    """Icosphere with every seventh face flipped and one face missing."""
+    sphere = tm.creation.icosphere(subdivisions=level)
+    faces = sphere.faces.copy()
+    faces[::7] = faces[::7, ::-1]
+    return tm.Trimesh(sphere.vertices, faces[1:], process=False)
+
+
+for _teeth in (10, 20, 40, 80):
+    case(f"gear[teeth={_teeth}]")(lambda _, t=_teeth: SpurGear(module=1.0, teeth=t).mesh())
+    case(f"sprocket[teeth={_teeth}]")(lambda _, t=_teeth: ChainSprocket(teeth=t).mesh())
+
+for _level in (2, 3, 4, 5):
+    case(f"sphere[subdivisions={_level}]")(
+        lambda _, s=_level: Sphere(10.0, subdivisions=s).mesh()
+    )
+    case(
+        f"validate[subdivisions={_level}]",
+        lambda s=_level: (PrintabilityValidator(cache_size=0), Sphere(10.0, subdivisions=s).mesh()),
+    )(lambda ctx: ctx[0].validate_mesh(ctx[1]))
+
+# hole nesting on plates of many loose parts, one ring per part per plane
+for _side in (20, 40, 60):
+    case(
+        f"small_holes[parts={_side * _side}]",
+        lambda n=_side: combine([Box(2, 2, 2).at(3 * i, 3 * j, 1) for i in range(n) for j in range(n)]),
+    )(lambda plate: small_holes(plate, 1.0))
+
+for _sections in (16, 64, 256, 1024):
+    case(f"cylinder[sections={_sections}]")(
+        lambda _, s=_sections: Cylinder(5.0, 10.0, sections=s).mesh()
+    )
+
+for _cutters in (1, 4, 16, 64):
+    case(
+        f"safe_difference[cutters={_cutters}]",
+        lambda n=_cutters: (
+            Box(100, 100, 5).mesh(),
+            [
+                Cylinder(0.8, 12.0).at(x, y, 2.5).mesh()
+                for x, y in np.random.default_rng(0).uniform(-45, 45, (n, 2))
+            ],
+        ),
+    )(lambda ctx: safe_difference(ctx[0], ctx[1]))
+
+for _mode in ("columns", "tree"):
+    case(f"scaffolding[mode={_mode}]", _ledge)(
+        lambda mesh, m=_mode: generate_scaffolding(mesh, grid_size=2.0, mode=m)
+    )
+
+for _level in (3, 4):
+    case(f"decimate[subdivisions={_level}]", lambda s=_level: Sphere(10.0, subdivisions=s).mesh())(
+        lambda mesh: decimate(mesh, target_triangles=len(mesh.faces) // 4, measure=False)
+    )
+
+for _level in (4, 6):
+    case(f"repair[subdivisions={_level}]", lambda s=_level: _broken_sphere(s))(repair_mesh)
+
+# each run starts a fresh interpreter, so start-up time is included
+for _name, _statement in (
+    ("package", "import parametric_cad"),
+    ("first_mesh", "from parametric_cad import Box; Box(1, 1, 1).mesh()"),
+):
+    case(f"import[{_name}]")(
+        lambda _, s=_statement: subprocess.run([sys.executable, "-c", s], check=True)
+    )
+
+
+def _plate_model():
+    """Plate with a row of 16 holes whose pitch is edited between runs."""
+    model = Model(pitch=5.0)
+    model.add_feature("plate", lambda p: combine([Box(100, 40, 5), Box(100, 5, 30).at(0, 17.5, 17.5)]))
+    model.add_feature(
+        "holes", lambda p: [Cylinder(1.0, 12.0).at((i - 7.5) * p.pitch, 0, 2.5).mesh() for i in range(16)]
+    )
+    model.add_feature("part", lambda p: safe_difference(p.plate, p.holes))
+    model.mesh()
+    return model, itertools.count(1)
+
+
+case("model[edit_pitch]", _plate_model)(
+    lambda ctx: ctx[0].set(pitch=5.0 + next(ctx[1]) * 1e-3).mesh()
+)
+
+
+def _plate():
+    return combine([Box(2, 2, 2).at(3 * i, 3 * j, 1) for i in range(40) for j in range(40)])
+
+
+def _writer_target():
+    return tempfile.mkdtemp(prefix="bench_stl_"), _plate()
+
+
+# the writers alone: STLExporter would spend nearly all of each sample
+# validating the plate, which the case below times on its own
+for _binary in (False, True):
+    case(
+        f"stl_write[{'binary' if _binary else 'ascii'}]",
+        _writer_target,
+        lambda ctx: shutil.rmtree(ctx[0], ignore_errors=True),
+    )(
+        lambda ctx, b=_binary: write_stl(ctx[1], os.path.join(ctx[0], "plate.stl"), binary=b)
+    )
+
+# the validation STLExporter runs before writing the same plate
+case("validate[plate_parts=1600]", lambda: (PrintabilityValidator(cache_size=0), _plate()))(
+    lambda ctx: ctx[0].validate_mesh(ctx[1])
+)
+
+
+def run(pattern: str = "", repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, (setup, func, teardown) in CASES.items():
+        if pattern not in name:
+            continue
+        context = setup()
+        times: List[float] = []
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(context)
+                times.append(time.perf_counter() - start)
+        finally:
+            if teardown is not None:
+                teardown(context)
+        results[name] = {"best": min(times), "median": statistics.median(times)}
+        print(f"{name:<36}{min(times) * 1000:>10.2f} ms")
+    return results
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Print per-case ratios and return the names that regressed."""
+
+    regressions = []
+    print(f"{'case':<36}{'base ms':>10}{'new ms':>10}{'ratio':>8}")
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<36}{'-':>10}{new['best'] * 1000:>10.2f}{'new':>8}")
+            continue
+        ratio = new["best"] / old["best"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36}{old['best'] * 1000:>10.2f}{new['best'] * 1000:>10.2f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="time the benchmark cases")
+    run_parser.add_argument("-o", "--output", help="write results to this JSON file")
+    run_parser.add_argument("-k", "--filter", default="", help="only cases containing this text")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    compare_parser = sub.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=1.25,
+                                help="flag cases slower than this ratio (default 1.25)")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, "r", encoding="utf-8") as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) past {args.threshold:.2f}x")
+            sys.exit(1)
+        return
+
+    logging.disable(logging.WARNING)
+    set_mesh_cache(None)
+    data = {
+        "machine": platform.node(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "trimesh": tm.__version__,
+        "results": run(args.filter, args.repeat),
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,73 @@
-"""Consolidated parametric_cad package."""
-
-from .core import tm, safe_difference, combine
-from .geometry import sg, Polygon, Point, box
-from .primitives.base import Primitive
-from .primitives.box import Box
-from .primitives.cylinder import Cylinder
-from .primitives.gear import SpurGear
-from .primitives.sprocket import ChainSprocket
-from .primitives.sphere import Sphere
-from .mechanisms.butthinge import ButtHinge
-from .export.stl import STLExporter
-from .printability import PrintabilityValidator
-from .scaffolding import generate_scaffolding
+"""Consolidated parametric_cad package.
+
+Public names are imported on first access (PEP 562), so importing the
+package does not pull in trimesh, shapely or numpy until geometry is
+actually built.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+# ``tessellation`` is both a submodule and a function; import it eagerly
+# so the function, not the submodule, is bound to the package attribute.
+from .tessellation import TessellationPolicy, set_tessellation, tessellation
+
+# public name -> submodule defining it
+_LAZY = {
+    "tm": ".core",
+    "safe_difference": ".core",
+    "combine": ".core",
+    "sg": ".geometry",
+    "Polygon": ".geometry",
+    "Point": ".geometry",
+    "box": ".geometry",
+    "MeshCache": ".cache",
+    "configure_mesh_cache": ".cache",
+    "get_mesh_cache": ".cache",
+    "Primitive": ".primitives.base",
+    "Box": ".primitives.box",
+    "Cylinder": ".primitives.cylinder",
+    "SpurGear": ".primitives.gear",
+    "ChainSprocket": ".primitives.sprocket",
+    "Sphere": ".primitives.sphere",
+    "ButtHinge": ".mechanisms.butthinge",
+    "STLExporter": ".export.stl",
+    "PrintabilityValidator": ".printability",
+    "generate_scaffolding": ".scaffolding",
+    "Assembly": ".assembly",
+    "Model": ".model",
+}
+
+if TYPE_CHECKING:
+    from .core import tm, safe_difference, combine
+    from .geometry import sg, Polygon, Point, box
+    from .cache import MeshCache, configure_mesh_cache, get_mesh_cache
+    from .primitives.base import Primitive
+    from .primitives.box import Box
+    from .primitives.cylinder import Cylinder
+    from .primitives.gear import SpurGear
+    from .primitives.sprocket import ChainSprocket
+    from .primitives.sphere import Sphere
+    from .mechanisms.butthinge import ButtHinge
+    from .export.stl import STLExporter
+    from .printability import PrintabilityValidator
+    from .scaffolding import generate_scaffolding
+    from .assembly import Assembly
+    from .model import Model
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "tm",
@@ -31,4 +87,12 @@ __all__ = [
     "Polygon",
     "Point",
     "box",
+    "MeshCache",
+    "configure_mesh_cache",
+    "get_mesh_cache",
+    "TessellationPolicy",
+    "set_tessellation",
+    "tessellation",
+    "Assembly",
+    "Model",
 ]
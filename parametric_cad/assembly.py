@@ -0,0 +1,374 @@
+"""Assemblies of named, placed parts.
+
+An :class:`Assembly` is a tree of named nodes.  Each node is either a
+part (a primitive, a mechanism or a plain mesh) or another assembly, and
+carries the placement the child had when it was added plus any extra
+transform given to :meth:`Assembly.add`.  Parts with the same geometry
+(equal :meth:`~parametric_cad.transform.Placeable.cache_key`) are stored
+once per assembly and instanced, so forty identical screws keep one
+definition and forty transforms::
+
+    bracket = Assembly("bracket")
+    bracket.add("base", Box(60, 40, 3))
+    bracket.add_array("screw", Cylinder(1.5, 8), linear_transforms(4, [15, 0, 0]))
+    bracket.add("hinge", ButtHinge().at(0, 40, 3))
+
+Every part gets an axis-aligned bounding box computed from the convex
+hull of its definition and cached until the tree changes, so
+:meth:`~Assembly.bounds`, :meth:`~Assembly.clearance` and
+:meth:`~Assembly.overlaps` never build the placed meshes.  Nothing is
+flattened until :meth:`~Assembly.mesh` is called, for example by
+:class:`~parametric_cad.export.stl.STLExporter`; it places every copy of
+a definition with one :func:`~parametric_cad.patterns.instance_mesh`
+call.  :class:`~parametric_cad.export.threemf.ThreeMFExporter` accepts
+the assembly itself and writes one object per part, one shared mesh per
+definition::
+
+    ThreeMFExporter().export_meshes(bracket, "bracket")
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .cache import mesh_content_key
+from .core import tm
+from .csg import Leaf, Node, Transform, _hash
+from .csg import Union as UnionNode
+from .patterns import instance_mesh
+from .transform import IDENTITY, Placeable, Placement
+
+# Joins node names into the paths reported by queries, e.g. "door/hinge"
+SEPARATOR = "/"
+
+_versions = itertools.count(1)
+
+
+class MeshPart(Placeable):
+    """Plain mesh wrapped so it can be placed and instanced like a part."""
+
+    def __init__(self, mesh: tm.Trimesh) -> None:
+        self._mesh = mesh
+        self._key = mesh_content_key(mesh)
+
+    def base_mesh(self) -> tm.Trimesh:
+        return self._mesh.copy()
+
+    def cache_key(self) -> str:
+        return self._key
+
+
+@dataclass(frozen=True)
+class AssemblyNode:
+    """Named child of an :class:`Assembly`.
+
+    ``key`` names the shared part definition; sub-assemblies have
+    ``assembly`` set instead.
+    """
+
+    name: str
+    placement: Placement
+    key: Optional[str] = None
+    assembly: Optional["Assembly"] = None
+
+
+@dataclass(frozen=True, eq=False)
+class PlacedPart:
+    """A part instance flattened out of an assembly tree."""
+
+    path: str
+    key: str
+    part: Placeable
+    # Relative to the frame of the assembly that was queried
+    placement: Placement
+    bounds: np.ndarray = field(repr=False)
+
+
+def _as_placement(placement: Union[Placement, np.ndarray, None]) -> Placement:
+    if placement is None:
+        return IDENTITY
+    return placement if isinstance(placement, Placement) else Placement(placement)
+
+
+def _union_bounds(bounds: List[np.ndarray]) -> np.ndarray:
+    stacked = np.array(bounds)
+    return np.array([stacked[:, 0].min(axis=0), stacked[:, 1].max(axis=0)])
+
+
+def _gaps(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Per-axis gaps between boxes; negative where they overlap."""
+    return np.maximum(b[..., 0, :] - a[..., 1, :], a[..., 0, :] - b[..., 1, :])
+
+
+class Assembly(Placeable):
+    """Tree of named parts and sub-assemblies with shared definitions.
+
+    The assembly is placeable itself: ``at``/``rotate``/... move the whole
+    tree, and every query and export works in the resulting frame.
+    Parts are treated as immutable once added; their placement at that
+    moment is copied into the node.
+    """
+
+    def __init__(self, name: str = "assembly") -> None:
+        self.name = name
+        self._placement = IDENTITY
+        self._nodes: Dict[str, AssemblyNode] = {}
+        self._definitions: Dict[str, Placeable] = {}
+        self._version = next(_versions)
+        # definition key -> points whose bounds bound the placed part
+        self._support: Dict[str, np.ndarray] = {}
+        # (stamp, parts, node bounds by path), rebuilt when the tree changes
+        self._index: Optional[Tuple[tuple, List[PlacedPart], Dict[str, np.ndarray]]] = None
+
+    # -- building -----------------------------------------------------
+
+    def add(
+        self,
+        name: str,
+        part,
+        placement: Union[Placement, np.ndarray, None] = None,
+    ) -> "Assembly":
+        """Add ``part`` as child ``name``, optionally moved by ``placement``.
+
+        ``part`` may be a primitive, mechanism, :class:`trimesh.Trimesh`
+        or :class:`Assembly`.  ``placement`` is applied on top of the
+        part's own placement.
+        """
+        self._check_name(name)
+        self._nodes[name] = self._node(name, part, _as_placement(placement))
+        self._touch()
+        return self
+
+    def add_array(self, name: str, part, transforms: np.ndarray) -> "Assembly":
+        """Add one instance of ``part`` per ``(N, 4, 4)`` transform.
+
+        Instances are named ``name[0]``, ``name[1]``, ...; the transforms
+        of :func:`~parametric_cad.patterns.polar_transforms` and
+        :func:`~parametric_cad.patterns.linear_transforms` fit directly.
+        """
+        transforms = np.asarray(transforms, dtype=np.float64).reshape(-1, 4, 4)
+        names = [f"{name}[{i}]" for i in range(len(transforms))]
+        for item in names:
+            self._check_name(item)
+        template = self._node(name, part, IDENTITY)
+        for item, matrix in zip(names, transforms):
+            placement = template.placement.then(Placement(matrix))
+            self._nodes[item] = AssemblyNode(item, placement, template.key, template.assembly)
+        self._touch()
+        return self
+
+    def remove(self, name: str) -> "Assembly":
+        """Remove child ``name``; its definition goes once unused."""
+        if name not in self._nodes:
+            raise KeyError(f"No node named {name!r} in assembly {self.name!r}")
+        key = self._nodes.pop(name).key
+        if key is not None and all(n.key != key for n in self._nodes.values()):
+            del self._definitions[key]
+            self._support.pop(key, None)
+        self._touch()
+        return self
+
+    def _check_name(self, name: str) -> None:
+        if not name or SEPARATOR in name:
+            raise ValueError(f"Node names must be non-empty and not contain {SEPARATOR!r}")
+        if name in self._nodes:
+            raise ValueError(f"Assembly {self.name!r} already has a node named {name!r}")
+
+    def _node(self, name: str, part, placement: Placement) -> AssemblyNode:
+        if isinstance(part, Assembly):
+            if part is self or self in part._subassemblies():
+                raise ValueError(f"Adding {part.name!r} to {self.name!r} would create a cycle")
+            return AssemblyNode(name, part.placement.then(placement), assembly=part)
+        if isinstance(part, tm.Trimesh):
+            part = MeshPart(part)
+        elif not isinstance(part, Placeable):
+            raise TypeError(f"Object {part!r} cannot be added to an assembly")
+        key = part.cache_key()
+        self._definitions.setdefault(key, part)
+        return AssemblyNode(name, part.placement.then(placement), key=key)
+
+    def _subassemblies(self) -> Iterator["Assembly"]:
+        for node in self._nodes.values():
+            if node.assembly is not None:
+                yield node.assembly
+                yield from node.assembly._subassemblies()
+
+    def _touch(self) -> None:
+        self._version = next(_versions)
+
+    def _stamp(self) -> tuple:
+        return (self._version, *(n.assembly._stamp() for n in self._nodes.values() if n.assembly))
+
+    # -- tree access --------------------------------------------------
+
+    @property
+    def nodes(self) -> Tuple[AssemblyNode, ...]:
+        return tuple(self._nodes.values())
+
+    @property
+    def definitions(self) -> Dict[str, Placeable]:
+        """Distinct part definitions directly in this assembly, by key."""
+        return dict(self._definitions)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, path: str) -> bool:
+        try:
+            self.get(path)
+        except KeyError:
+            return False
+        return True
+
+    def get(self, path: str) -> AssemblyNode:
+        """Return the :class:`AssemblyNode` at ``path``, e.g. ``"door/hinge"``."""
+        assembly, node = self, None
+        for name in path.split(SEPARATOR):
+            if assembly is None or name not in assembly._nodes:
+                raise KeyError(f"No node {path!r} in assembly {self.name!r}")
+            node = assembly._nodes[name]
+            assembly = node.assembly
+        return node
+
+    def node(self) -> Node:
+        """Return a lazy :class:`~parametric_cad.csg.Node` of every part."""
+        return UnionNode(Transform(Leaf(p.part), p.placement.matrix) for p in self.parts())
+
+    def parts(self) -> List[PlacedPart]:
+        """Return every part instance with its placement and cached bounds."""
+        return self._indexed()[1]
+
+    def items(self) -> Iterator[Tuple[str, Placeable]]:
+        """Yield ``(path, part)`` with each part placed as in the assembly.
+
+        Parts share their definition's geometry, so exporters that keep
+        parts apart (3MF) store one mesh per definition.
+        """
+        for placed in self.parts():
+            yield placed.path, placed.part.with_placement(placed.placement)
+
+    def _indexed(self):
+        stamp = (self._placement, self._stamp())
+        if self._index is None or self._index[0] != stamp:
+            parts: List[PlacedPart] = []
+            self._collect("", self._placement, parts, self._support)
+            self._index = (stamp, parts, {})
+        return self._index
+
+    def _collect(self, prefix, placement, out, support) -> None:
+        for node in self._nodes.values():
+            path = prefix + node.name
+            placed = node.placement.then(placement)
+            if node.assembly is not None:
+                node.assembly._collect(path + SEPARATOR, placed, out, support)
+                continue
+            part = self._definitions[node.key]
+            if node.key not in support:
+                support[node.key] = _support_points(part)
+            points = placed.apply(support[node.key])
+            bounds = np.array([points.min(axis=0), points.max(axis=0)])
+            out.append(PlacedPart(path, node.key, part, placed, bounds))
+
+    # -- queries ------------------------------------------------------
+
+    def bounds(self, path: Optional[str] = None) -> np.ndarray:
+        """Return the ``(2, 3)`` bounding box of the assembly or node ``path``."""
+        _, parts, cache = self._indexed()
+        key = path or ""
+        if key not in cache:
+            if path is not None:
+                self.get(path)
+                prefix = path + SEPARATOR
+                boxes = [p.bounds for p in parts if p.path == path or p.path.startswith(prefix)]
+            else:
+                boxes = [p.bounds for p in parts]
+            cache[key] = _union_bounds(boxes) if boxes else np.zeros((2, 3))
+        return cache[key].copy()
+
+    def extents(self, path: Optional[str] = None) -> np.ndarray:
+        lo, hi = self.bounds(path)
+        return hi - lo
+
+    def clearance(self, a: str, b: str) -> float:
+        """Return the gap between the bounding boxes of nodes ``a`` and ``b``.
+
+        The boxes contain the parts, so the true clearance is at least
+        this; ``0.0`` means the boxes touch or overlap.
+        """
+        gaps = np.maximum(_gaps(self.bounds(a), self.bounds(b)), 0.0)
+        return float(np.sqrt(gaps @ gaps))
+
+    def overlaps(self, clearance: float = 0.0) -> List[Tuple[str, str]]:
+        """Return pairs of parts whose bounding boxes come within ``clearance``.
+
+        With the default ``0.0`` only boxes that overlap with positive
+        volume are reported; parts merely touching are not.  Boxes are
+        conservative, so a pair is a candidate for a closer mesh check.
+        """
+        parts = self.parts()
+        if len(parts) < 2:
+            return []
+        boxes = np.array([p.bounds for p in parts])
+        order = np.argsort(boxes[:, 0, 0], kind="stable")
+        boxes = boxes[order]
+        lows = boxes[:, 0, 0]
+        pairs = []
+        # sweep along x: only boxes starting before this one ends can meet it
+        for i in range(len(boxes) - 1):
+            stop = np.searchsorted(lows, boxes[i, 1, 0] + clearance, side="left")
+            if stop <= i + 1:
+                continue
+            near = np.all(_gaps(boxes[i], boxes[i + 1:stop]) < clearance, axis=1)
+            for j in np.flatnonzero(near) + i + 1:
+                a, b = parts[order[i]].path, parts[order[j]].path
+                pairs.append((a, b) if a < b else (b, a))
+        return sorted(pairs)
+
+    # -- meshing ------------------------------------------------------
+
+    def cache_key(self) -> str:
+        parts: List[PlacedPart] = []
+        self._collect("", IDENTITY, parts, self._support)
+        return _hash("assembly", *[(p.path, p.key) for p in parts], *[p.placement.matrix for p in parts])
+
+    def base_mesh(self) -> tm.Trimesh:
+        parts: List[PlacedPart] = []
+        self._collect("", IDENTITY, parts, self._support)
+        return _flatten(parts)
+
+    def mesh(self) -> tm.Trimesh:
+        """Flatten every part into one mesh, placed as the assembly."""
+        return _flatten(self.parts())
+
+
+def _support_points(part: Placeable) -> np.ndarray:
+    """Return the convex hull vertices of ``part``'s untransformed mesh."""
+    mesh = part.base_mesh()
+    if len(mesh.vertices) < 4:
+        return np.asarray(mesh.vertices, dtype=np.float64).reshape(-1, 3)
+    try:
+        return np.asarray(mesh.convex_hull.vertices, dtype=np.float64)
+    except Exception:
+        # flat or degenerate input: every vertex still bounds the part
+        return np.asarray(mesh.vertices, dtype=np.float64)
+
+
+def _flatten(parts: List[PlacedPart]) -> tm.Trimesh:
+    """Concatenate ``parts``, placing every copy of a definition at once."""
+    groups: Dict[str, List[PlacedPart]] = {}
+    for placed in parts:
+        groups.setdefault(placed.key, []).append(placed)
+    meshes = [
+        instance_mesh(group[0].part.base_mesh(), np.stack([p.placement.matrix for p in group]))
+        for group in groups.values()
+    ]
+    if not meshes:
+        return tm.Trimesh()
+    return tm.util.concatenate(meshes)
+
+
+__all__ = ["Assembly", "AssemblyNode", "PlacedPart", "MeshPart", "SEPARATOR"]
@@ -0,0 +1,380 @@
+"""Parallel batch build and export of many parts.
+
+A manifest lists part specifications (class name, constructor parameters
+and output name).  Parts are built and exported on a
+:class:`~concurrent.futures.ProcessPoolExecutor`; each part has its own
+timeout and retry budget so a hung OpenSCAD boolean cannot stall the
+whole run.  Manifests may be JSON or, when PyYAML is installed, YAML::
+
+    {
+      "output_dir": "output/catalog",
+      "binary": true,
+      "parts": [
+        {"class": "SpurGear", "params": {"module": 1.0, "teeth": 20},
+         "output": "gear_m1_t20"},
+        {"class": "ChainSprocket", "params": {"teeth": 14}, "output": "sprocket_14"}
+      ]
+    }
+
+Run from the command line with ``python -m parametric_cad.batch manifest.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+@dataclass
+class PartSpec:
+    """Description of one part to build and export."""
+
+    cls: str
+    output: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    at: Optional[Sequence[float]] = None
+    rotate: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PartSpec":
+        try:
+            return cls(
+                cls=data["class"],
+                output=data["output"],
+                params=dict(data.get("params", {})),
+                at=data.get("at"),
+                rotate=data.get("rotate"),
+            )
+        except KeyError as e:
+            raise ValueError(f"Part spec {data!r} is missing {e}") from None
+
+
+@dataclass
+class PartResult:
+    """Outcome of building and exporting one part."""
+
+    output: str
+    status: str = "pending"
+    attempts: int = 0
+    path: Optional[str] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+@dataclass
+class BatchReport:
+    """Results of a :func:`run_batch` call."""
+
+    results: List[PartResult]
+    seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def failed(self) -> List[PartResult]:
+        return [r for r in self.results if not r.ok]
+
+    def stage_totals(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for result in self.results:
+            for stage, seconds in result.timings.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def summary(self) -> str:
+        """Return a human readable table of the run."""
+
+        stages = list(self.stage_totals())
+        header = f"{'part':<32}{'status':<9}{'tries':>6}" + "".join(
+            f"{s + ' s':>12}" for s in stages
+        )
+        lines = [header, "-" * len(header)]
+        for r in self.results:
+            lines.append(
+                f"{r.output[:31]:<32}{r.status:<9}{r.attempts:>6}"
+                + "".join(f"{r.timings.get(s, 0.0):>12.3f}" for s in stages)
+            )
+        totals = self.stage_totals()
+        lines.append("-" * len(header))
+        lines.append(
+            f"{'total':<32}{'':<9}{'':>6}" + "".join(f"{totals[s]:>12.3f}" for s in stages)
+        )
+        ok = len(self.results) - len(self.failed)
+        lines.append(
+            f"{ok}/{len(self.results)} parts exported in {self.seconds:.2f}s "
+            f"on {self.workers} worker(s)"
+        )
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seconds": self.seconds,
+            "workers": self.workers,
+            "stage_totals": self.stage_totals(),
+            "parts": [asdict(r) for r in self.results],
+        }
+
+
+def load_manifest(path: str | Path) -> Dict[str, Any]:
+    """Load a JSON or YAML manifest into a dictionary.
+
+    A bare list of part specs is accepted as shorthand for
+    ``{"parts": [...]}``.
+    """
+
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("PyYAML is required to read YAML manifests") from None
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if isinstance(data, list):
+        data = {"parts": data}
+    data["parts"] = [
+        p if isinstance(p, PartSpec) else PartSpec.from_dict(p) for p in data.get("parts", [])
+    ]
+    return data
+
+
+def resolve_class(name: str):
+    """Return the part class called ``name``.
+
+    Plain names are looked up on :mod:`parametric_cad` and
+    :mod:`parametric_cad.mechanisms`; ``"package.module:Class"`` imports
+    the class from an arbitrary module.
+    """
+
+    if ":" in name:
+        module_name, attr = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), attr)
+    import parametric_cad
+    import parametric_cad.mechanisms
+
+    for package in (parametric_cad, parametric_cad.mechanisms):
+        if hasattr(package, name):
+            return getattr(package, name)
+    raise ValueError(f"Unknown part class {name!r}")
+
+
+def build_part(spec: PartSpec) -> Any:
+    """Instantiate and place the object described by ``spec``."""
+
+    obj = resolve_class(spec.cls)(**spec.params)
+    if spec.rotate is not None:
+        obj = obj.rotate(spec.rotate["axis"], spec.rotate["angle"])
+    if spec.at is not None:
+        obj = obj.at(*spec.at)
+    return obj
+
+
+def _export_part(
+    spec: PartSpec, output_dir: str, binary: bool, preview: bool
+) -> PartResult:
+    """Worker entry point: build and export one part.
+
+    Errors are returned in the result rather than raised so that the
+    timings of the stages that did run are still reported.
+    """
+
+    from parametric_cad.export.stl import STLExporter
+
+    result = PartResult(output=spec.output)
+    start = time.perf_counter()
+    exporter = STLExporter(output_dir=output_dir, binary=binary)
+    try:
+        obj = build_part(spec)
+        result.timings["build"] = time.perf_counter() - start
+        result.path = exporter.export_mesh(obj, spec.output, preview=preview)
+        result.status = "ok"
+    except Exception as e:
+        result.status = "failed"
+        result.error = f"{type(e).__name__}: {e}"
+    result.timings.update(exporter.last_timings)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _terminate(executor: ProcessPoolExecutor) -> None:
+    """Kill all worker processes of ``executor`` without waiting."""
+
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+    else:
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_batch(
+    parts: Iterable[PartSpec | Dict[str, Any]],
+    output_dir: str = "output",
+    *,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    retries: int = 0,
+    binary: bool = False,
+    preview: bool = False,
+) -> BatchReport:
+    """Build and export ``parts`` across a process pool.
+
+    Parameters
+    ----------
+    parts:
+        :class:`PartSpec` objects or their dictionary form.
+    output_dir:
+        Directory STL files are written to.
+    workers:
+        Number of worker processes, defaults to ``os.cpu_count()``.
+    timeout:
+        Seconds a single part may run before its worker is killed.
+    retries:
+        Additional attempts for parts that fail, time out or crash
+        their worker.
+    binary, preview:
+        Passed through to :class:`~parametric_cad.export.stl.STLExporter`.
+    """
+
+    specs = [p if isinstance(p, PartSpec) else PartSpec.from_dict(p) for p in parts]
+    workers = max(1, workers or os.cpu_count() or 1)
+    os.makedirs(output_dir, exist_ok=True)
+    results = [PartResult(output=s.output) for s in specs]
+    queue = list(range(len(specs)))
+    running: Dict[Any, tuple[int, float]] = {}
+    start = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def fail(index: int, status: str, error: str) -> None:
+        result = results[index]
+        result.status = status
+        result.error = error
+        if result.attempts <= retries:
+            logging.warning(f"Retrying {result.output} after {status}: {error}")
+            queue.append(index)
+        else:
+            logging.error(f"Giving up on {result.output}: {error}")
+
+    try:
+        while queue or running:
+            # Only keep as many parts in flight as there are workers so that
+            # a part's timeout starts when it actually begins running.
+            while queue and len(running) < workers:
+                index = queue.pop(0)
+                results[index].attempts += 1
+                future = executor.submit(_export_part, specs[index], output_dir, binary, preview)
+                running[future] = (index, time.perf_counter())
+
+            wait_for = None
+            if timeout is not None:
+                now = time.perf_counter()
+                wait_for = max(0.0, min(t0 + timeout - now for _, t0 in running.values()))
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            broken = False
+            for future in done:
+                index, _ = running.pop(future)
+                try:
+                    outcome = future.result()
+                except BrokenProcessPool:
+                    # the part may have killed its worker itself, so the
+                    # attempt counts; parts still running are refunded below
+                    broken = True
+                    fail(index, "crashed", "worker process died")
+                except Exception as e:
+                    fail(index, "failed", f"{type(e).__name__}: {e}")
+                else:
+                    outcome.attempts = results[index].attempts
+                    results[index] = outcome
+                    if not outcome.ok:
+                        fail(index, outcome.status, outcome.error)
+
+            now = time.perf_counter()
+            expired = [
+                f for f, (_, t0) in running.items() if timeout is not None and now - t0 >= timeout
+            ]
+            if expired or broken:
+                # A hung worker cannot be cancelled individually, so the pool is
+                # replaced; innocent in-flight parts are resubmitted for free.
+                _terminate(executor)
+                for future, (index, _) in list(running.items()):
+                    if future in expired:
+                        fail(index, "timeout", f"exceeded {timeout}s")
+                    else:
+                        results[index].attempts -= 1
+                        queue.insert(0, index)
+                running.clear()
+                executor = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return BatchReport(results, time.perf_counter() - start, workers)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m parametric_cad.batch",
+        description="Build and export every part listed in a manifest.",
+    )
+    parser.add_argument("manifest", help="JSON or YAML manifest of part specs")
+    parser.add_argument("-o", "--output-dir", help="override the manifest output_dir")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, help="per-part timeout in seconds")
+    parser.add_argument("--retries", type=int, help="extra attempts for failed parts")
+    parser.add_argument("--binary", action="store_true", default=None, help="write binary STL")
+    parser.add_argument("--preview", action="store_true", default=None, help="render previews")
+    parser.add_argument("--report", help="write a JSON report to this path")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(args.manifest)
+
+    def option(name, default):
+        value = getattr(args, name)
+        return manifest.get(name, default) if value is None else value
+
+    report = run_batch(
+        manifest["parts"],
+        option("output_dir", "output"),
+        workers=option("workers", None),
+        timeout=option("timeout", None),
+        retries=option("retries", 0),
+        binary=option("binary", False),
+        preview=option("preview", False),
+    )
+    print(report.summary())
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 1 if report.failed else 0
+
+
+__all__ = [
+    "PartSpec",
+    "PartResult",
+    "BatchReport",
+    "load_manifest",
+    "resolve_class",
+    "build_part",
+    "run_batch",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
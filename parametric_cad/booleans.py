@@ -0,0 +1,240 @@
+"""Pluggable boolean engines used by :func:`parametric_cad.core.safe_difference`.
+
+Engines are registered by name and receive the target mesh together
+with a list of cutter operands.  Before an engine runs, cutters whose
+bounding boxes do not overlap are concatenated into a single operand so
+that each part needs only one boolean pass (and, for OpenSCAD, one entry
+in a batched run of :mod:`parametric_cad.openscad`).  Wall time spent in
+every engine is recorded and can be inspected with :func:`engine_stats`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .core import tm
+from .tracing import annotate
+
+EngineFunc = Callable[[tm.Trimesh, List[tm.Trimesh]], tm.Trimesh]
+
+# Engines tried, in order, after the requested one fails.  ``manifold``
+# runs in-process and needs neither OpenSCAD nor Blender.
+DEFAULT_FALLBACKS = ("manifold",)
+
+# Seconds before an OpenSCAD subprocess is considered hung.
+SCAD_TIMEOUT = 120.0
+
+
+class BooleanError(RuntimeError):
+    """Raised when a boolean operation fails in strict mode."""
+
+
+@dataclass
+class EngineStats:
+    """Accumulated call counts and wall time for one engine."""
+
+    calls: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+
+
+_engines: Dict[str, EngineFunc] = {}
+_stats: Dict[str, EngineStats] = {}
+_stats_lock = threading.Lock()
+
+
+def register_engine(name: str, func: Optional[EngineFunc] = None):
+    """Register ``func`` as boolean engine ``name``.
+
+    Can be used directly or as a decorator::
+
+        @register_engine("mine")
+        def my_difference(mesh, operands):
+            ...
+    """
+
+    def decorator(f: EngineFunc) -> EngineFunc:
+        _engines[name] = f
+        return f
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def available_engines() -> List[str]:
+    """Return the names of all registered engines."""
+    return list(_engines)
+
+
+def engine_stats() -> Dict[str, EngineStats]:
+    """Return a snapshot of per-engine timings."""
+
+    with _stats_lock:
+        return {
+            name: EngineStats(s.calls, s.failures, s.seconds)
+            for name, s in _stats.items()
+        }
+
+
+def reset_engine_stats() -> None:
+    """Clear all accumulated engine timings."""
+
+    with _stats_lock:
+        _stats.clear()
+
+
+def _record(name: str, seconds: float, failed: bool) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(name, EngineStats())
+        stats.calls += 1
+        stats.seconds += seconds
+        if failed:
+            stats.failures += 1
+
+
+def _bounds_overlap(a: np.ndarray, b: np.ndarray, tol: float = 1e-9) -> bool:
+    return bool(np.all(a[0] <= b[1] + tol) and np.all(b[0] <= a[1] + tol))
+
+
+def merge_cutters(cutters: Sequence[tm.Trimesh]) -> List[tm.Trimesh]:
+    """Concatenate cutters with disjoint bounding boxes into shared operands.
+
+    The union of non-overlapping closed volumes is simply their
+    concatenation, so this reduces the operand count without a boolean.
+    Cutters that do overlap end up in different operands.
+    """
+
+    groups: List[List[int]] = []
+    group_bounds: List[List[np.ndarray]] = []
+    bounds = [np.asarray(c.bounds) for c in cutters]
+    for i in sorted(range(len(cutters)), key=lambda k: bounds[k][0, 0]):
+        for members, member_bounds in zip(groups, group_bounds):
+            if not any(_bounds_overlap(bounds[i], b) for b in member_bounds):
+                members.append(i)
+                member_bounds.append(bounds[i])
+                break
+        else:
+            groups.append([i])
+            group_bounds.append([bounds[i]])
+
+    merged = []
+    for members in groups:
+        if len(members) == 1:
+            merged.append(cutters[members[0]])
+        else:
+            merged.append(tm.util.concatenate([cutters[i] for i in members]))
+    return merged
+
+
+def difference(
+    mesh: tm.Trimesh,
+    other: tm.Trimesh | Iterable[tm.Trimesh],
+    *,
+    engine: Optional[str] = "scad",
+    fallbacks: Sequence[str] = DEFAULT_FALLBACKS,
+    strict: bool = False,
+) -> tm.Trimesh:
+    """Subtract ``other`` from ``mesh`` using the registered engines.
+
+    ``engine`` is tried first, followed by each name in ``fallbacks``.
+    If every engine fails the unmodified ``mesh`` is returned, unless
+    ``strict`` is true in which case :class:`BooleanError` is raised.
+    """
+
+    cutters = [other] if isinstance(other, tm.Trimesh) else list(other)
+    cutters = [c for c in cutters if len(c.faces)]
+    if not cutters:
+        return mesh
+    operands = merge_cutters(cutters)
+
+    order = [name for name in [engine, *fallbacks] if name]
+    attempts = list(dict.fromkeys(order))
+    errors = []
+    for name in attempts:
+        func = _engines.get(name)
+        if func is None:
+            errors.append(f"{name}: unknown engine")
+            continue
+        start = time.perf_counter()
+        try:
+            result = func(mesh, operands)
+        except Exception as e:
+            _record(name, time.perf_counter() - start, failed=True)
+            logging.debug(f"Boolean engine {name} failed: {e}")
+            errors.append(f"{name}: {e}")
+            continue
+        _record(name, time.perf_counter() - start, failed=False)
+        annotate(engine=name, cutters=len(cutters), operands=len(operands))
+        return result
+
+    message = "Boolean difference failed (" + "; ".join(errors) + ")"
+    annotate(engine=None)
+    if strict:
+        raise BooleanError(message)
+    logging.warning(message + ", returning unmodified mesh")
+    return mesh
+
+
+def find_openscad() -> Optional[str]:
+    """Return the OpenSCAD executable path if one can be located."""
+
+    for var in ("OPENSCAD_PATH", "OPENSCADPATH"):
+        path = os.environ.get(var)
+        if path and os.path.isfile(path):
+            return path
+    for candidate in ("openscad", "openscad.exe", "openscad-nightly"):
+        path = shutil.which(candidate)
+        if path:
+            return path
+    default = r"C:\Program Files\OpenSCAD\openscad.exe"
+    return default if os.path.isfile(default) else None
+
+
+@register_engine("scad")
+def scad_difference(mesh: tm.Trimesh, operands: List[tm.Trimesh]) -> tm.Trimesh:
+    """Run one OpenSCAD ``difference()`` over all operands.
+
+    Requests go through the shared
+    :class:`~parametric_cad.openscad.ScadService`, which batches them
+    with those of other threads into as few OpenSCAD runs as possible.
+    Raises :class:`BooleanError` when no OpenSCAD executable is found.
+    """
+
+    from .openscad import get_scad_service
+
+    return get_scad_service().difference(mesh, operands)
+
+
+@register_engine("manifold")
+def manifold_difference(mesh: tm.Trimesh, operands: List[tm.Trimesh]) -> tm.Trimesh:
+    """Subtract operands with the in-process manifold3d backend."""
+    return tm.boolean.difference([mesh, *operands], engine="manifold")
+
+
+@register_engine("blender")
+def blender_difference(mesh: tm.Trimesh, operands: List[tm.Trimesh]) -> tm.Trimesh:
+    """Subtract operands by shelling out to Blender through trimesh."""
+    return tm.boolean.difference([mesh, *operands], engine="blender")
+
+
+__all__ = [
+    "BooleanError",
+    "EngineStats",
+    "DEFAULT_FALLBACKS",
+    "register_engine",
+    "available_engines",
+    "engine_stats",
+    "reset_engine_stats",
+    "merge_cutters",
+    "difference",
+    "find_openscad",
+]
@@ -0,0 +1,312 @@
+"""Content-addressed mesh cache for parametric primitives.
+
+Meshes produced by :meth:`Primitive._create_mesh` depend only on the
+primitive's parameters, so identical parts (the same gear spec used
+hundreds of times in a batch) can share one mesh.  The cache has two
+tiers: an in-process LRU bounded by a memory budget and an optional
+on-disk store of ``.npz`` files shared between processes.
+
+Entries are keyed on a stable hash of the primitive's class and
+parameters plus the backend version, so upgrading :mod:`trimesh`
+invalidates old entries automatically.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from .core import tm
+from .tessellation import get_tessellation
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for a :class:`MeshCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _normalize(value: Any) -> Any:
+    """Return a JSON serializable, order-stable form of ``value``."""
+
+    if isinstance(value, (bool, int, str)) or value is None:
+        return value
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, np.generic):
+        return _normalize(value.item())
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        return {
+            "dtype": str(data.dtype),
+            "shape": list(data.shape),
+            "sha256": hashlib.sha256(data.tobytes()).hexdigest(),
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _parameters(value)
+    return repr(value)
+
+
+def _parameters(obj: Any) -> dict:
+    """Return the public construction parameters of ``obj``."""
+
+    if dataclasses.is_dataclass(obj):
+        names = [f.name for f in dataclasses.fields(obj)]
+    else:
+        names = [n for n in vars(obj) if not n.startswith("_")]
+    return {name: _normalize(getattr(obj, name)) for name in sorted(names)}
+
+
+def mesh_cache_key(obj: Any, **extra: Any) -> str:
+    """Return a stable content hash describing the geometry of ``obj``.
+
+    The key covers the class, its public parameters, any ``extra``
+    values, the whole tessellation policy in effect and the :mod:`trimesh`
+    version.  Placement (``at``/``rotate``)
+    is deliberately excluded so differently placed copies share a key.
+    """
+
+    cls = type(obj)
+    payload = {
+        "class": f"{cls.__module__}.{cls.__qualname__}",
+        "params": _parameters(obj),
+        "extra": _normalize(extra),
+        "tessellation": _normalize(get_tessellation()),
+        "backend": tm.__version__,
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def mesh_content_key(mesh: tm.Trimesh) -> str:
+    """Return a hash of the vertex and face arrays of ``mesh``."""
+
+    digest = hashlib.sha256()
+    for array in (mesh.vertices, mesh.faces):
+        data = np.ascontiguousarray(array)
+        digest.update(str(data.dtype).encode("ascii"))
+        digest.update(str(data.shape).encode("ascii"))
+        digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+def _mesh_nbytes(mesh: tm.Trimesh) -> int:
+    return int(mesh.vertices.nbytes + mesh.faces.nbytes)
+
+
+class MeshCache:
+    """Two-tier LRU cache of untransformed meshes.
+
+    Parameters
+    ----------
+    max_bytes:
+        Memory budget for the in-process tier.  Least recently used
+        entries are evicted once the stored vertex and face arrays
+        exceed it.  ``0`` disables the memory tier.
+    cache_dir:
+        Directory for the on-disk tier.  ``None`` keeps the cache purely
+        in memory.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        cache_dir: str | Path | None = None,
+    ) -> None:
+        self.max_bytes = int(max_bytes)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tm.Trimesh]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._entries:
+            return True
+        path = self._disk_path(key)
+        return path is not None and path.exists()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes currently held by the memory tier."""
+        return self._nbytes
+
+    def get(self, key: str) -> Optional[tm.Trimesh]:
+        """Return a copy of the cached mesh for ``key`` or ``None``."""
+
+        with self._lock:
+            mesh = self._entries.get(key)
+            if mesh is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return mesh.copy(include_cache=True)
+
+        mesh = self._load(key)
+        with self._lock:
+            if mesh is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self.stats.disk_hits += 1
+            self._remember(key, mesh)
+        return mesh.copy(include_cache=True)
+
+    def put(self, key: str, mesh: tm.Trimesh) -> None:
+        """Store a private copy of ``mesh`` under ``key``."""
+
+        # Keep cached normals so hits export exactly like fresh meshes
+        stored = mesh.copy(include_cache=True)
+        with self._lock:
+            self._remember(key, stored)
+        self._store(key, stored)
+
+    def get_or_create(self, key: str, factory: Callable[[], tm.Trimesh]) -> tm.Trimesh:
+        """Return the mesh for ``key``, building it with ``factory`` on a miss."""
+
+        mesh = self.get(key)
+        if mesh is not None:
+            return mesh
+        mesh = factory()
+        self.put(key, mesh)
+        return mesh
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the memory tier and, if ``disk`` is true, the disk tier."""
+
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+        if disk and self.cache_dir and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.npz"):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, mesh: tm.Trimesh) -> None:
+        size = _mesh_nbytes(mesh)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._nbytes -= _mesh_nbytes(old)
+        self._entries[key] = mesh
+        self._nbytes += size
+        while self._nbytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= _mesh_nbytes(evicted)
+            self.stats.evictions += 1
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[:2] / f"{key}.npz"
+
+    def _load(self, key: str) -> Optional[tm.Trimesh]:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                return tm.Trimesh(
+                    vertices=data["vertices"],
+                    faces=data["faces"],
+                    face_normals=data["face_normals"],
+                    process=False,
+                )
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable mesh cache entry {path}: {e}")
+            return None
+
+    def _store(self, key: str, mesh: tm.Trimesh) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so concurrent workers never
+            # observe a partially written entry.
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    vertices=mesh.vertices,
+                    faces=mesh.faces,
+                    face_normals=mesh.face_normals,
+                )
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.warning(f"Could not write mesh cache entry {path}: {e}")
+
+
+def _cache_from_environment() -> MeshCache:
+    max_mb = os.environ.get("PARAMETRIC_CAD_CACHE_MB")
+    max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+    return MeshCache(max_bytes, os.environ.get("PARAMETRIC_CAD_CACHE_DIR"))
+
+
+_mesh_cache: Optional[MeshCache] = _cache_from_environment()
+
+
+def get_mesh_cache() -> Optional[MeshCache]:
+    """Return the process-wide mesh cache, or ``None`` when disabled."""
+    return _mesh_cache
+
+
+def set_mesh_cache(cache: Optional[MeshCache]) -> Optional[MeshCache]:
+    """Install ``cache`` as the process-wide cache and return the old one.
+
+    Passing ``None`` disables caching entirely.
+    """
+
+    global _mesh_cache
+    previous = _mesh_cache
+    _mesh_cache = cache
+    return previous
+
+
+def configure_mesh_cache(
+    max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: str | Path | None = None
+) -> MeshCache:
+    """Replace the process-wide cache with a new :class:`MeshCache`."""
+
+    cache = MeshCache(max_bytes, cache_dir)
+    set_mesh_cache(cache)
+    return cache
+
+
+__all__ = [
+    "CacheStats",
+    "MeshCache",
+    "mesh_cache_key",
+    "mesh_content_key",
+    "get_mesh_cache",
+    "set_mesh_cache",
+    "configure_mesh_cache",
+]
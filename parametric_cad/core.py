@@ -4,60 +4,121 @@ This module centralizes interaction with the mesh backend so other
 parts of the package do not need to import the backend directly.
 Currently :mod:`trimesh` provides all geometry functionality, but this
 wrapper allows the backend to be swapped or mocked easily.
+
+The backend is imported on first use rather than with the package, so
+``import parametric_cad`` stays fast; see :func:`lazy_module`.
 """
 
-import trimesh as _trimesh
+from __future__ import annotations
+
+import importlib
+import sys
+import types
 from typing import Iterable, Any
 
+from .tracing import span
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        # later lookups hit the copied namespace directly
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """Return ``name`` if already imported, else a proxy importing it on use."""
+
+    return sys.modules.get(name) or _LazyModule(name)
+
 
-def safe_difference(mesh, other, *, engine="scad"):
+def safe_difference(mesh, other, *, engine="scad", strict=False, lazy=False):
     """Perform a boolean difference with graceful fallback.
 
     Parameters
     ----------
-    mesh : _trimesh.Trimesh
+    mesh : tm.Trimesh
         Base mesh to subtract from.
-    other : _trimesh.Trimesh or list
-        Mesh or list of meshes to subtract.
+    other : tm.Trimesh or list
+        Mesh or list of meshes to subtract.  Cutters with disjoint
+        bounding boxes are merged so all of them are removed in a single
+        boolean pass.
     engine : str or None, optional
-        Preferred boolean engine. ``"scad"`` is tried by default.
+        Preferred boolean engine. ``"scad"`` is tried by default before
+        falling back to the engines in
+        :data:`parametric_cad.booleans.DEFAULT_FALLBACKS`.
+    strict : bool, optional
+        Raise :class:`~parametric_cad.booleans.BooleanError` instead of
+        returning the unmodified mesh when every engine fails.
+    lazy : bool, optional
+        Return a :class:`~parametric_cad.csg.Difference` node instead of
+        evaluating immediately.  ``mesh`` and ``other`` may then also be
+        primitives or other nodes.
 
     Returns
     -------
-    _trimesh.Trimesh
+    tm.Trimesh
         Resulting mesh if the operation succeeds, otherwise the original
         ``mesh`` if all boolean attempts fail.
     """
 
-    try:
-        if engine:
-            return mesh.difference(other, engine=engine)
-        return mesh.difference(other)
-    except Exception:
-        try:
-            return mesh.difference(other)
-        except Exception:
-            return mesh
+    if lazy:
+        from .csg import Difference
+
+        cutters = [other] if not isinstance(other, (list, tuple)) else other
+        return Difference(mesh, cutters, engine=engine, strict=strict)
+
+    from .booleans import difference
+
+    with span("safe_difference") as s:
+        s.mesh(mesh, "input_")
+        result = difference(mesh, other, engine=engine, strict=strict)
+        s.mesh(result)
+    return result
 
 # Public alias so that other modules can use the backend without
 # importing ``trimesh`` themselves.
-tm = _trimesh
+tm = lazy_module("trimesh")
 
-def combine(objects: Iterable[Any]) -> _trimesh.Trimesh:
+def combine(objects: Iterable[Any], *, lazy: bool = False) -> tm.Trimesh:
     """Return a union of ``objects``.
 
     Each object may be a :class:`~trimesh.Trimesh` or have a ``mesh``
-    method returning one.
+    method returning one.  With ``lazy=True`` a
+    :class:`~parametric_cad.csg.Union` node is returned and nothing is
+    meshed until it is evaluated.
     """
-    meshes = []
-    for obj in objects:
-        if isinstance(obj, _trimesh.Trimesh):
-            meshes.append(obj)
-        elif hasattr(obj, "mesh"):
-            m = obj.mesh
-            meshes.append(m() if callable(m) else m)
-        else:
-            raise TypeError(f"Object {obj!r} cannot be converted to a mesh")
-    return _trimesh.util.concatenate(meshes)
-
-__all__ = ["tm", "safe_difference", "combine"]
+    if lazy:
+        from .csg import Union
+
+        return Union(objects)
+
+    with span("combine") as s:
+        meshes = []
+        for obj in objects:
+            if isinstance(obj, tm.Trimesh):
+                meshes.append(obj)
+            elif hasattr(obj, "mesh"):
+                m = obj.mesh
+                meshes.append(m() if callable(m) else m)
+            else:
+                raise TypeError(f"Object {obj!r} cannot be converted to a mesh")
+        result = tm.util.concatenate(meshes)
+        s.set(parts=len(meshes)).mesh(result)
+    return result
+
+def extrude(shape, height: float) -> tm.Trimesh:
+    """Extrude a 2D polygon or multipolygon along +Z to ``height``."""
+
+    parts = getattr(shape, "geoms", [shape])
+    meshes = [
+        tm.creation.extrude_polygon(part, height, engine="triangle")
+        for part in parts
+        if not part.is_empty
+    ]
+    return tm.util.concatenate(meshes)
+
+__all__ = ["tm", "lazy_module", "safe_difference", "combine", "extrude"]
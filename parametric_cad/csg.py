@@ -0,0 +1,296 @@
+"""Lazy CSG expression trees.
+
+Instead of building a mesh at every step, primitives and the core
+helpers can produce a graph of :class:`Leaf`, :class:`Transform`,
+:class:`Union` and :class:`Difference` nodes.  Nothing is meshed until
+:meth:`Node.mesh` is called (for example by an exporter) or a mesh
+property such as ``volume`` is queried on the node.
+
+During evaluation structurally identical subtrees are built once and
+reused, so eight identical mounting holes only mesh one cylinder and
+place copies of it.  Bounding boxes are propagated through the graph
+without meshing booleans, which lets :class:`Difference` skip cutters
+that cannot touch the target.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+from .cache import mesh_content_key
+from .core import safe_difference, tm
+
+
+@dataclass
+class EvaluationStats:
+    """Counters collected while evaluating a node graph."""
+
+    nodes_built: int = 0
+    nodes_reused: int = 0
+    booleans: int = 0
+    cutters_pruned: int = 0
+
+
+def _hash(*parts: Any) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(np.ascontiguousarray(part, dtype=np.float64).tobytes())
+        else:
+            digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _bounds_intersect(a: np.ndarray, b: np.ndarray) -> bool:
+    return bool(np.all(a[0] <= b[1]) and np.all(b[0] <= a[1]))
+
+
+class _Evaluator:
+    """Evaluate a graph, sharing results between identical subtrees.
+
+    Every distinct key is built once.  Results are kept only while other
+    consumers still need them; the last consumer takes ownership of the
+    mesh without a copy, which keeps peak memory low.
+    """
+
+    def __init__(self, root: "Node") -> None:
+        self.stats = EvaluationStats()
+        self._refs: Counter = Counter()
+        self._memo: dict = {}
+        self._count(root)
+
+    def _count(self, node: "Node") -> None:
+        self._refs[node.key] += 1
+        if self._refs[node.key] == 1:
+            for child in node.children:
+                self._count(child)
+
+    def evaluate(self, node: "Node") -> tm.Trimesh:
+        key = node.key
+        mesh = self._memo.get(key)
+        if mesh is None:
+            mesh = node._build(self)
+            self.stats.nodes_built += 1
+        else:
+            self.stats.nodes_reused += 1
+        self._refs[key] -= 1
+        if self._refs[key] > 0:
+            self._memo[key] = mesh
+            return mesh.copy(include_cache=True)
+        self._memo.pop(key, None)
+        return mesh
+
+
+class Node:
+    """Base class for lazily evaluated mesh expressions."""
+
+    children: Sequence["Node"] = ()
+
+    def __init__(self) -> None:
+        self._key: Optional[str] = None
+        self._bounds: Optional[np.ndarray] = None
+        self._result: Optional[tm.Trimesh] = None
+        self.stats: Optional[EvaluationStats] = None
+
+    @property
+    def key(self) -> str:
+        """Structural hash; equal keys produce identical meshes."""
+        if self._key is None:
+            self._key = self._compute_key()
+        return self._key
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """Axis-aligned bounding box, computed without running booleans."""
+        if self._bounds is None:
+            self._bounds = self._compute_bounds()
+        return self._bounds
+
+    @property
+    def extents(self) -> np.ndarray:
+        return self.bounds[1] - self.bounds[0]
+
+    def _compute_key(self) -> str:
+        raise NotImplementedError
+
+    def _compute_bounds(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def _build(self, ctx: _Evaluator) -> tm.Trimesh:
+        raise NotImplementedError
+
+    def evaluate(self) -> tm.Trimesh:
+        """Evaluate the graph once and return the shared result."""
+        if self._result is None:
+            ctx = _Evaluator(self)
+            self._result = ctx.evaluate(self)
+            self.stats = ctx.stats
+        return self._result
+
+    def mesh(self) -> tm.Trimesh:
+        """Return a copy of the evaluated mesh."""
+        return self.evaluate().copy(include_cache=True)
+
+    def node(self) -> "Node":
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        # Mesh properties (volume, is_watertight, ...) force evaluation.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.evaluate(), name)
+
+    def transformed(self, matrix: np.ndarray) -> "Node":
+        return Transform(self, matrix)
+
+    def union(self, *others: Any) -> "Node":
+        return Union([self, *others])
+
+    def difference(self, *cutters: Any, **kwargs: Any) -> "Node":
+        return Difference(self, cutters, **kwargs)
+
+
+class Leaf(Node):
+    """Untransformed geometry of a primitive or an existing mesh."""
+
+    def __init__(self, source: Any) -> None:
+        super().__init__()
+        self.source = source
+
+    def _compute_key(self) -> str:
+        if isinstance(self.source, tm.Trimesh):
+            return _hash("mesh", mesh_content_key(self.source))
+        return _hash("primitive", self.source.cache_key())
+
+    def _base(self) -> tm.Trimesh:
+        if isinstance(self.source, tm.Trimesh):
+            return self.source.copy(include_cache=True)
+        return self.source.base_mesh()
+
+    def _compute_bounds(self) -> np.ndarray:
+        if isinstance(self.source, tm.Trimesh):
+            return np.array(self.source.bounds, dtype=np.float64)
+        return np.array(self._base().bounds, dtype=np.float64)
+
+    def _build(self, ctx: _Evaluator) -> tm.Trimesh:
+        return self._base()
+
+
+class Transform(Node):
+    """Homogeneous 4x4 transform applied to a child node."""
+
+    def __init__(self, child: Any, matrix: np.ndarray) -> None:
+        super().__init__()
+        self.child = as_node(child)
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        self.children = (self.child,)
+
+    def _compute_key(self) -> str:
+        return _hash("transform", self.child.key, self.matrix)
+
+    def _compute_bounds(self) -> np.ndarray:
+        lo, hi = self.child.bounds
+        corners = np.array(
+            [[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])]
+        )
+        placed = corners @ self.matrix[:3, :3].T + self.matrix[:3, 3]
+        return np.array([placed.min(axis=0), placed.max(axis=0)])
+
+    def _build(self, ctx: _Evaluator) -> tm.Trimesh:
+        mesh = ctx.evaluate(self.child)
+        mesh.apply_transform(self.matrix)
+        return mesh
+
+
+class Union(Node):
+    """Concatenation of child nodes, matching :func:`combine`."""
+
+    def __init__(self, children: Iterable[Any]) -> None:
+        super().__init__()
+        self.children = tuple(as_node(c) for c in children)
+
+    def _compute_key(self) -> str:
+        return _hash("union", *[c.key for c in self.children])
+
+    def _compute_bounds(self) -> np.ndarray:
+        if not self.children:
+            return np.zeros((2, 3))
+        bounds = np.array([c.bounds for c in self.children])
+        return np.array([bounds[:, 0].min(axis=0), bounds[:, 1].max(axis=0)])
+
+    def _build(self, ctx: _Evaluator) -> tm.Trimesh:
+        return tm.util.concatenate([ctx.evaluate(c) for c in self.children])
+
+
+class Difference(Node):
+    """``target`` minus ``cutters`` evaluated with :func:`safe_difference`.
+
+    Cutters whose bounding boxes miss the target are pruned before any
+    boolean is attempted.
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        cutters: Iterable[Any],
+        *,
+        engine: Optional[str] = "scad",
+        strict: bool = False,
+    ) -> None:
+        super().__init__()
+        self.target = as_node(target)
+        self.cutters = tuple(as_node(c) for c in cutters)
+        self.engine = engine
+        self.strict = strict
+        self.children = (self.target, *self.cutters)
+
+    def _compute_key(self) -> str:
+        return _hash(
+            "difference", self.engine, self.target.key, *[c.key for c in self.cutters]
+        )
+
+    def _compute_bounds(self) -> np.ndarray:
+        return self.target.bounds
+
+    def _build(self, ctx: _Evaluator) -> tm.Trimesh:
+        bounds = self.target.bounds
+        active = [c for c in self.cutters if _bounds_intersect(c.bounds, bounds)]
+        ctx.stats.cutters_pruned += len(self.cutters) - len(active)
+        target = ctx.evaluate(self.target)
+        if not active:
+            return target
+        ctx.stats.booleans += 1
+        cutters = [ctx.evaluate(c) for c in active]
+        return safe_difference(target, cutters, engine=self.engine, strict=self.strict)
+
+
+def as_node(obj: Any) -> Node:
+    """Return ``obj`` as a :class:`Node` without evaluating it."""
+
+    if isinstance(obj, Node):
+        return obj
+    if isinstance(obj, tm.Trimesh):
+        return Leaf(obj)
+    if hasattr(obj, "node"):
+        return obj.node()
+    if hasattr(obj, "mesh"):
+        m = obj.mesh
+        return Leaf(m() if callable(m) else m)
+    raise TypeError(f"Object {obj!r} cannot be converted to a mesh")
+
+
+__all__ = [
+    "EvaluationStats",
+    "Node",
+    "Leaf",
+    "Transform",
+    "Union",
+    "Difference",
+    "as_node",
+]
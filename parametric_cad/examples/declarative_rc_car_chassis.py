@@ -69,8 +69,11 @@ rear_brace = (
     .at(BASE_LENGTH - BRACE_WIDTH, SIDE_THICKNESS, BASE_THICKNESS)
 )
 
-# Combine chassis components
-chassis = combine([base_plate, left_rail, right_rail, front_brace, rear_brace])
+# Combine chassis components.  ``lazy=True`` builds a CSG graph that is
+# only meshed when exported, so no intermediate meshes are created.
+chassis = combine(
+    [base_plate, left_rail, right_rail, front_brace, rear_brace], lazy=True
+)
 
 # Mounting holes near the corners of the base
 hole_positions = [
@@ -98,8 +101,8 @@ holes.extend(
     for x, y in diff_positions
 )
 
-# Subtract holes from chassis
-chassis = safe_difference(chassis, [h.mesh() for h in holes])
+# Subtract holes from chassis; the identical hole cylinders are meshed once
+chassis = safe_difference(chassis, holes, lazy=True)
 
 # Export the final chassis mesh
 exporter = STLExporter(output_dir="output/rc_car_chassis_output")
@@ -0,0 +1,354 @@
+"""Off-screen preview rendering.
+
+Previews are produced by pluggable backends.  The default ``"numpy"``
+backend is a dependency-free z-buffer rasterizer with flat shading: the
+eight camera views are projected together and rasterized in one pass
+over the stacked ``(view, face)`` arrays, so it works on headless build
+agents without OpenGL.  The ``"trimesh"`` backend keeps the previous
+pyglet renderer for machines that have a display.
+
+Images are written as PNG with :mod:`zlib`, optionally together with a
+single contact sheet of all views.  :class:`PreviewRenderer` can render
+on a background thread pool so STL export does not wait for previews.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import struct
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Camera directions relative to the mesh centroid, as used since the
+# first preview implementation
+VIEW_DIRECTIONS = np.array(
+    [
+        [1, 0, 1], [-1, 0, 1], [0, 1, 1], [0, -1, 1],
+        [1, 1, 1], [-1, -1, 1], [0, 0, 1], [0, 0, -1],
+    ],
+    dtype=np.float64,
+)
+DEFAULT_RESOLUTION = (600, 600)
+BACKGROUND = np.array([255, 255, 255], dtype=np.uint8)
+BASE_COLOR = np.array([150, 170, 200], dtype=np.float64)
+AMBIENT = 0.25
+# Upper bound on candidate pixels generated at once by the rasterizer
+FRAGMENT_BUDGET = 1 << 22
+
+Backend = Callable[..., List[np.ndarray]]
+_backends: Dict[str, Backend] = {}
+
+
+def register_backend(name: str, func: Optional[Backend] = None):
+    """Register a preview backend under ``name``.
+
+    A backend is called as ``backend(mesh, cameras, resolution)`` with
+    ``cameras`` an ``(N, 4, 4)`` array of camera-to-world transforms and
+    returns ``N`` RGB ``uint8`` images of shape ``(height, width, 3)``.
+    Can be used as a decorator.
+    """
+
+    def decorator(f: Backend) -> Backend:
+        _backends[name] = f
+        return f
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def available_backends() -> List[str]:
+    return list(_backends)
+
+
+def look_at(eye, target, up) -> np.ndarray:
+    """Return the camera-to-world transform of a camera at ``eye``."""
+
+    eye = np.array(eye, dtype=np.float64)
+    target = np.array(target, dtype=np.float64)
+    up = np.array(up, dtype=np.float64)
+    forward = target - eye
+    forward /= np.linalg.norm(forward)
+    right = np.cross(forward, up)
+    norm = np.linalg.norm(right)
+    right = right / norm if norm > 1e-6 else np.array([1.0, 0.0, 0.0])
+    true_up = np.cross(right, forward)
+    rot = np.eye(4)
+    rot[:3, :3] = np.stack([right, true_up, -forward], axis=1)
+    rot[:3, 3] = eye
+    return rot
+
+
+def view_cameras(mesh, directions: Sequence[Sequence[float]] = VIEW_DIRECTIONS) -> np.ndarray:
+    """Return the camera transforms of the standard preview views."""
+
+    centroid = mesh.centroid
+    radius = max(mesh.extents) * 1.5
+    return np.array(
+        [look_at(centroid + np.asarray(d) * radius, centroid, up=[0, 0, 1]) for d in directions]
+    )
+
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(owner, local index)`` for ``counts[i]`` items per owner."""
+
+    owner = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return owner, np.arange(counts.sum()) - starts[owner]
+
+
+def _spans(x: np.ndarray, y: np.ndarray, ymin: np.ndarray, rows: np.ndarray, width: int):
+    """Return ``(triangle, row y, first x, pixel count)`` for each scanline.
+
+    Only pixel centres inside the triangle are covered, so long thin
+    triangles cost their area rather than their bounding box.
+    """
+
+    tri, local = _expand(rows)
+    yc = ymin[tri] + local + 0.5
+    left = np.full(len(tri), np.inf)
+    right = np.full(len(tri), -np.inf)
+    for a, b in ((0, 1), (1, 2), (2, 0)):
+        ya, yb = y[tri, a], y[tri, b]
+        xa, xb = x[tri, a], x[tri, b]
+        dy = yb - ya
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (yc - ya) / dy
+        hit = (dy != 0) & (t >= 0) & (t <= 1)
+        xi = np.where(hit, xa + t * (xb - xa), np.nan)
+        left = np.fmin(left, xi)
+        right = np.fmax(right, xi)
+    first = np.clip(np.ceil(left - 0.5), 0, width)
+    last = np.clip(np.floor(right - 0.5) + 1, 0, width)
+    count = np.where(np.isfinite(left), last - first, 0).clip(min=0).astype(np.int64)
+    return tri, (yc - 0.5).astype(np.int64), np.nan_to_num(first).astype(np.int64), count
+
+
+def rasterize(
+    mesh,
+    cameras: np.ndarray,
+    resolution: Tuple[int, int] = DEFAULT_RESOLUTION,
+) -> List[np.ndarray]:
+    """Render ``mesh`` from every camera with a NumPy z-buffer.
+
+    Back faces are culled and every face is flat shaded by a light at
+    the camera.  Each view's field of view is fitted to the mesh's
+    bounding sphere.
+    """
+
+    width, height = resolution
+    cameras = np.asarray(cameras, dtype=np.float64).reshape(-1, 4, 4)
+    views = len(cameras)
+    intensity = np.ones(views * width * height)
+    if len(mesh.faces) == 0:
+        return [np.broadcast_to(BACKGROUND, (height, width, 3)).copy() for _ in range(views)]
+
+    # World to camera for all views: p_cam = R^T (p - eye)
+    rot = cameras[:, :3, :3]
+    eye = cameras[:, :3, 3]
+    cam = np.einsum("vji,vnj->vni", rot, mesh.vertices[None, :, :] - eye[:, None, :])
+    depth = -cam[:, :, 2]
+
+    center = mesh.bounds.mean(axis=0)
+    sphere = np.linalg.norm(mesh.extents) / 2.0
+    distance = np.linalg.norm(eye - center, axis=1)
+    half_angle = np.arcsin(np.clip(sphere / np.maximum(distance, 1e-12), 0.0, 0.999))
+    focal = 0.95 / np.tan(np.maximum(half_angle, 1e-6))
+    scale = 0.5 * min(width, height) * focal
+
+    safe = np.where(depth > 1e-9, depth, np.inf)
+    sx = width / 2.0 + scale[:, None] * cam[:, :, 0] / safe
+    sy = height / 2.0 - scale[:, None] * cam[:, :, 1] / safe
+    inv_depth = 1.0 / safe
+
+    faces = mesh.faces
+    normals = mesh.face_normals
+    to_eye = eye[:, None, :] - mesh.triangles_center[None, :, :]
+    to_eye /= np.linalg.norm(to_eye, axis=2, keepdims=True)
+    facing = np.einsum("fk,vfk->vf", normals, to_eye)
+    shade = AMBIENT + (1.0 - AMBIENT) * np.clip(facing, 0.0, 1.0)
+
+    in_front = np.all(depth[:, faces] > 1e-9, axis=2)
+    view_idx, face_idx = np.nonzero((facing > 0) & in_front)
+    corners = faces[face_idx]
+    x = sx[view_idx[:, None], corners]
+    y = sy[view_idx[:, None], corners]
+    w = inv_depth[view_idx[:, None], corners]
+
+    ymin = np.clip(np.floor(y.min(axis=1)), 0, height).astype(np.int64)
+    ymax = np.clip(np.ceil(y.max(axis=1)), 0, height).astype(np.int64)
+    # Inverse depth is linear in screen space: w = a x + b y + c
+    dx1, dy1, dw1 = x[:, 1] - x[:, 0], y[:, 1] - y[:, 0], w[:, 1] - w[:, 0]
+    dx2, dy2, dw2 = x[:, 2] - x[:, 0], y[:, 2] - y[:, 0], w[:, 2] - w[:, 0]
+    det = dx1 * dy2 - dx2 * dy1
+    rows = np.where(np.abs(det) > 1e-12, ymax - ymin, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plane_a = (dw1 * dy2 - dw2 * dy1) / det
+        plane_b = (dx1 * dw2 - dx2 * dw1) / det
+    plane_c = w[:, 0] - plane_a * x[:, 0] - plane_b * y[:, 0]
+
+    zbuffer = np.zeros(views * width * height)
+    tri, row, first, count = _spans(x, y, ymin, rows, width)
+    # Fragments are generated in chunks of whole scanlines to bound memory
+    cuts = np.searchsorted(np.cumsum(count), np.arange(FRAGMENT_BUDGET, count.sum(), FRAGMENT_BUDGET))
+    edges = np.unique(np.concatenate([[0], cuts, [len(count)]]))
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        span, local = _expand(count[lo:hi])
+        span += lo
+        ftri = tri[span]
+        px = first[span] + local
+        py = row[span]
+        frag_depth = plane_a[ftri] * (px + 0.5) + plane_b[ftri] * (py + 0.5) + plane_c[ftri]
+        pixel = (view_idx[ftri] * height + py) * width + px
+        np.maximum.at(zbuffer, pixel, frag_depth)
+        # Fragments matching the buffer are the nearest so far; nearer ones
+        # from later chunks overwrite them.
+        front = frag_depth >= zbuffer[pixel]
+        intensity[pixel[front]] = shade[view_idx[ftri[front]], face_idx[ftri[front]]]
+
+    covered = zbuffer > 0
+    rgb = np.empty((views * width * height, 3), dtype=np.uint8)
+    rgb[:] = BACKGROUND
+    rgb[covered] = np.clip(BASE_COLOR * intensity[covered, None], 0, 255).astype(np.uint8)
+    return list(rgb.reshape(views, height, width, 3))
+
+
+register_backend("numpy", rasterize)
+
+
+@register_backend("trimesh")
+def trimesh_backend(mesh, cameras, resolution=DEFAULT_RESOLUTION) -> List[np.ndarray]:
+    """Render with trimesh's pyglet scene; needs OpenGL and Pillow."""
+
+    from PIL import Image
+
+    scene = mesh.scene()
+    images = []
+    for camera in cameras:
+        scene.camera_transform = camera
+        png = scene.save_image(
+            resolution=resolution, visible=False, background=[255, 255, 255, 255]
+        )
+        if not png:
+            raise RuntimeError("trimesh returned no image")
+        images.append(np.asarray(Image.open(io.BytesIO(png)).convert("RGB")))
+    return images
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode an RGB ``uint8`` image as PNG using only :mod:`zlib`."""
+
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, width * 3)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def contact_sheet(images: Sequence[np.ndarray], columns: int = 4) -> np.ndarray:
+    """Tile equally sized images into one grid image."""
+
+    height, width = images[0].shape[:2]
+    rows = -(-len(images) // columns)
+    sheet = np.empty((rows * height, columns * width, 3), dtype=np.uint8)
+    sheet[:] = BACKGROUND
+    for i, image in enumerate(images):
+        r, c = divmod(i, columns)
+        sheet[r * height:(r + 1) * height, c * width:(c + 1) * width] = image
+    return sheet
+
+
+class PreviewRenderer:
+    """Render and save the standard preview views of a mesh.
+
+    Parameters
+    ----------
+    backend:
+        Name of a registered backend, ``"numpy"`` by default.
+    resolution:
+        ``(width, height)`` of each view.
+    views:
+        Write ``<name>_view<i>.png`` for every view.
+    contact_sheet:
+        Also write all views tiled into ``<name>_views.png``.
+    workers:
+        Threads used by :meth:`submit`.
+    """
+
+    def __init__(
+        self,
+        backend: str = "numpy",
+        resolution: Tuple[int, int] = DEFAULT_RESOLUTION,
+        views: bool = True,
+        contact_sheet: bool = False,
+        workers: int = 2,
+    ) -> None:
+        if backend not in _backends:
+            raise ValueError(f"Unknown preview backend {backend!r}")
+        self.backend = backend
+        self.resolution = tuple(resolution)
+        self.views = views
+        self.contact_sheet = contact_sheet
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def render(self, mesh, output_dir, base_name: str) -> List[Path]:
+        """Render ``mesh`` and return the paths of the written images."""
+
+        if mesh.vertices.shape[0] == 0:
+            logging.warning(f"Invalid mesh for preview: {base_name}")
+            return []
+        images = _backends[self.backend](mesh, view_cameras(mesh), self.resolution)
+        output_dir = Path(output_dir)
+        paths = []
+        if self.views:
+            for i, image in enumerate(images, start=1):
+                paths.append(output_dir / f"{base_name}_view{i}.png")
+                paths[-1].write_bytes(encode_png(image))
+        if self.contact_sheet:
+            paths.append(output_dir / f"{base_name}_views.png")
+            paths[-1].write_bytes(encode_png(contact_sheet(images)))
+        return paths
+
+    def submit(self, mesh, output_dir, base_name: str) -> Future:
+        """Render on the background thread pool."""
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="preview"
+            )
+        return self._executor.submit(self.render, mesh, output_dir, base_name)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+__all__ = [
+    "VIEW_DIRECTIONS",
+    "register_backend",
+    "available_backends",
+    "look_at",
+    "view_cameras",
+    "rasterize",
+    "encode_png",
+    "contact_sheet",
+    "PreviewRenderer",
+]
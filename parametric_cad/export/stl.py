@@ -1,20 +1,65 @@
 from parametric_cad.core import tm
 import os
 import logging
-import numpy as np
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 
+from parametric_cad.decimate import decimate
+from parametric_cad.export.preview import PreviewRenderer, look_at
+from parametric_cad.export.stl_writer import write_stl
 from parametric_cad.printability import PrintabilityValidator
+from parametric_cad.repair import repair_mesh
+from parametric_cad.tracing import span
 
 class STLExporter:
     """Export trimesh objects to STL with optional previews."""
 
-    def __init__(self, output_dir: str = "output", binary: bool = False) -> None:
+    def __init__(
+        self,
+        output_dir: str = "output",
+        binary: bool = False,
+        mmap: bool = False,
+        preview_backend: str = "numpy",
+        contact_sheet: bool = False,
+        preview_async: bool = False,
+        target_triangles: int | None = None,
+        max_deviation: float | None = None,
+        allow_hull: bool = False,
+    ) -> None:
         self.output_dir = output_dir
         self.binary = binary
+        # Write binary STL through a memory map instead of chunked tofile
+        self.mmap = mmap
         os.makedirs(self.output_dir, exist_ok=True)
         self.validator = PrintabilityValidator()
+        self.previewer = PreviewRenderer(backend=preview_backend, contact_sheet=contact_sheet)
+        # Render previews on a background thread; see wait_previews()
+        self.preview_async = preview_async
+        self.pending_previews = []
+        # Wall time of each stage of the most recent export, in seconds
+        self.last_timings = {}
+        # Simplify between repair and validation when either limit is set;
+        # see parametric_cad.decimate.decimate()
+        self.target_triangles = target_triangles
+        self.max_deviation = max_deviation
+        # DecimationReport of the most recent export, if it was simplified
+        self.last_decimation = None
+        # Let repair fall back to the convex hull, which fills bores and
+        # pockets; see parametric_cad.repair.repair_mesh()
+        self.allow_hull = allow_hull
+        # RepairReport of the most recent export, if it needed repair
+        self.last_repair = None
+
+    @contextmanager
+    def _stage(self, name):
+        start = time.perf_counter()
+        try:
+            with span(f"STLExporter.{name}") as s:
+                yield s
+        finally:
+            self.last_timings[name] = time.perf_counter() - start
 
     def _ensure_mesh(self, obj):
         if isinstance(obj, tm.Trimesh):
@@ -29,16 +74,35 @@ class STLExporter:
                                   preview=preview)
 
     def export_meshes(self, objs, base_filename, timestamp=False, preview=True):
-        meshes = [self._ensure_mesh(o) for o in objs]
-        combined = tm.util.concatenate(meshes)
-        if not combined.is_watertight or combined.vertices.shape[0] == 0:
-            repaired = combined.fill_holes()
-            if repaired is not False:
-                combined = repaired
-            else:
-                combined = combined.convex_hull
+        self.last_timings = {}
+        self.last_decimation = None
+        self.last_repair = None
+        with self._stage("mesh") as stage:
+            meshes = [self._ensure_mesh(o) for o in objs]
+            combined = tm.util.concatenate(meshes)
+            stage.mesh(combined)
+
+        with self._stage("repair"):
+            if not combined.is_watertight:
+                combined, self.last_repair = repair_mesh(combined, allow_hull=self.allow_hull)
+
+        if self.target_triangles is not None or self.max_deviation is not None:
+            with self._stage("decimate") as stage:
+                combined, report = decimate(
+                    combined,
+                    target_triangles=self.target_triangles,
+                    max_deviation=self.max_deviation,
+                )
+                stage.mesh(combined).set(max_error=report.max_error)
+            self.last_decimation = report
+            logging.info(
+                f"Decimated {base_filename} from {report.faces_before} to "
+                f"{report.faces_after} triangles (max error {report.max_error:.4f} mm) "
+                f"in {report.seconds:.2f}s"
+            )
 
-        errors = self.validator.validate_mesh(combined)
+        with self._stage("validate"):
+            errors = self.validator.validate_mesh(combined)
         if errors:
             raise ValueError(
                 "Printability validation failed: " + ", ".join(errors)
@@ -49,54 +113,38 @@ class STLExporter:
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{base_filename}_{ts}.stl"
         path = os.path.join(self.output_dir, filename)
-        if self.binary:
-            combined.export(path, file_type="stl")
-        else:
-            text = tm.exchange.stl.export_stl_ascii(combined)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(text)
+        with self._stage("write"):
+            if self.binary:
+                write_stl(combined, path, binary=True, mmap=self.mmap)
+            else:
+                write_stl(combined, path)
         logging.info(f"Exported STL to {path}")
 
         if preview:
+            with self._stage("preview"):
+                if self.preview_async:
+                    future = self.previewer.submit(combined, self.output_dir, base_filename)
+                    self.pending_previews.append((base_filename, future))
+                else:
+                    try:
+                        self._render_preview_multiangle(combined, Path(self.output_dir), base_filename)
+                    except Exception as e:
+                        logging.error(f"Could not generate preview for {base_filename}: {e}")
+        return path
+
+    def wait_previews(self):
+        """Wait for background previews and return the written image paths."""
+        paths = []
+        pending, self.pending_previews = self.pending_previews, []
+        for base_filename, future in pending:
             try:
-                self._render_preview_multiangle(combined, Path(self.output_dir), base_filename)
+                paths.extend(future.result())
             except Exception as e:
                 logging.error(f"Could not generate preview for {base_filename}: {e}")
-        return path
+        return paths
 
     def _render_preview_multiangle(self, mesh, output_dir: Path, base_name: str):
-        if not mesh.is_watertight or mesh.vertices.shape[0] == 0:
-            logging.warning(f"Invalid mesh for preview: {base_name}")
-            return
-
-        scene = mesh.scene()
-        centroid = mesh.centroid
-        radius = max(mesh.extents) * 1.5
-        angles = [
-            [1, 0, 1], [-1, 0, 1], [0, 1, 1], [0, -1, 1],
-            [1, 1, 1], [-1, -1, 1], [0, 0, 1], [0, 0, -1]
-        ]
-        for i, direction in enumerate(angles, start=1):
-            eye = centroid + np.array(direction) * radius
-            scene.camera_transform = self._look_at(eye, centroid, up=[0, 0, 1])
-            img = scene.save_image(resolution=(600, 600), visible=False,
-                                   background=[255, 255, 255, 255])
-            if img:
-                preview_path = output_dir / f"{base_name}_view{i}.png"
-                with open(preview_path, "wb") as f:
-                    f.write(img)
+        return self.previewer.render(mesh, output_dir, base_name)
 
     def _look_at(self, eye, target, up):
-        eye = np.array(eye)
-        target = np.array(target)
-        up = np.array(up)
-        forward = target - eye
-        forward /= np.linalg.norm(forward)
-        right = np.cross(forward, up)
-        norm = np.linalg.norm(right)
-        right = right / norm if norm > 1e-6 else np.array([1, 0, 0])
-        true_up = np.cross(right, forward)
-        rot = np.eye(4)
-        rot[:3, :3] = np.stack([right, true_up, -forward], axis=1)
-        rot[:3, 3] = eye
-        return rot
+        return look_at(eye, target, up)
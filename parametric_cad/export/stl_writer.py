@@ -0,0 +1,155 @@
+"""Streaming STL writers.
+
+:func:`trimesh.exchange.stl.export_stl_ascii` builds the whole file as a
+single string and :func:`~trimesh.exchange.stl.export_stl` a single
+``bytes`` object, which costs hundreds of megabytes for million-triangle
+meshes.  The writers here produce byte-for-byte identical output but
+format and write the face arrays a chunk at a time, so memory use stays
+bounded by the chunk size.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+from parametric_cad.core import tm
+
+# Record layout of a binary STL facet, identical to trimesh's
+STL_DTYPE = np.dtype(
+    [("normals", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")]
+)
+HEADER_SIZE = 84
+DEFAULT_CHUNK_FACES = 65536
+
+_FACET = "\n".join(
+    [
+        "facet normal {} {} {}",
+        "outer loop",
+        "vertex {} {} {}\nvertex {} {} {}\nvertex {} {} {}",
+        "endloop",
+        "endfacet",
+        "",
+    ]
+)
+
+
+def _solid_name(mesh: tm.Trimesh) -> str:
+    name = mesh.metadata.get("name", "")
+    if not isinstance(name, str) or len(name) > 80 or "\n" in name:
+        return ""
+    return name
+
+
+def _chunks(count: int, size: int) -> Iterator[slice]:
+    for start in range(0, count, size):
+        yield slice(start, min(start + size, count))
+
+
+def _has_fileno(f) -> bool:
+    try:
+        f.fileno()
+    except (AttributeError, OSError, ValueError):
+        return False
+    return True
+
+
+@contextmanager
+def _open(target, mode: str):
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, mode) as f:
+            yield f
+    else:
+        yield target
+
+
+def write_stl_ascii(mesh: tm.Trimesh, target, chunk_faces: int = DEFAULT_CHUNK_FACES) -> None:
+    """Write ``mesh`` as ASCII STL to a path or binary file object."""
+
+    faces = mesh.faces
+    normals = mesh.face_normals
+    vertices = mesh.vertices
+    with _open(target, "wb") as f:
+        f.write(f"solid {_solid_name(mesh)}\n".encode("utf-8"))
+        for chunk in _chunks(len(faces), chunk_faces):
+            count = chunk.stop - chunk.start
+            blob = np.empty((count, 4, 3))
+            blob[:, 0, :] = normals[chunk]
+            blob[:, 1:, :] = vertices[faces[chunk]]
+            f.write((_FACET * count).format(*blob.reshape(-1)).encode("utf-8"))
+        f.write(b"\nendsolid\n")
+
+
+def _pack(mesh: tm.Trimesh, chunk: slice, out: np.ndarray) -> None:
+    out["normals"] = mesh.face_normals[chunk]
+    out["vertices"] = mesh.vertices[mesh.faces[chunk]]
+    out["attributes"] = 0
+
+
+def _header(count: int) -> bytes:
+    return bytes(80) + np.uint32(count).astype("<u4").tobytes()
+
+
+def write_stl_binary(
+    mesh: tm.Trimesh,
+    target,
+    chunk_faces: int = DEFAULT_CHUNK_FACES,
+    mmap: bool = False,
+) -> None:
+    """Write ``mesh`` as binary STL.
+
+    Parameters
+    ----------
+    mesh:
+        Mesh to write.
+    target:
+        Path or binary file object.
+    chunk_faces:
+        Number of facets packed per write.
+    mmap:
+        Fill the file through a memory map instead of ``tofile`` calls.
+        Requires ``target`` to be a path.
+    """
+
+    count = len(mesh.faces)
+    if mmap:
+        if not isinstance(target, (str, os.PathLike)):
+            raise TypeError("mmap writing requires a file path")
+        with open(target, "wb") as f:
+            f.write(_header(count))
+            f.truncate(HEADER_SIZE + count * STL_DTYPE.itemsize)
+        if count:
+            records = np.memmap(target, dtype=STL_DTYPE, mode="r+", offset=HEADER_SIZE, shape=(count,))
+            for chunk in _chunks(count, chunk_faces):
+                _pack(mesh, chunk, records[chunk])
+            records.flush()
+            del records
+        return
+
+    buffer = np.zeros(min(count, chunk_faces), dtype=STL_DTYPE)
+    with _open(target, "wb") as f:
+        f.write(_header(count))
+        real_file = _has_fileno(f)
+        for chunk in _chunks(count, chunk_faces):
+            packed = buffer[: chunk.stop - chunk.start]
+            _pack(mesh, chunk, packed)
+            if real_file:
+                f.flush()
+                packed.tofile(f)
+            else:
+                f.write(packed.tobytes())
+
+
+def write_stl(mesh: tm.Trimesh, target, binary: bool = False, **kwargs) -> None:
+    """Write ``mesh`` as binary or ASCII STL using the streaming writers."""
+
+    if binary:
+        write_stl_binary(mesh, target, **kwargs)
+    else:
+        write_stl_ascii(mesh, target, **kwargs)
+
+
+__all__ = ["STL_DTYPE", "write_stl", "write_stl_ascii", "write_stl_binary"]
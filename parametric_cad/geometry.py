@@ -2,14 +2,18 @@
 
 This indirection allows the project to avoid depending on shapely
 throughout the codebase. If needed, the backend can be swapped out
-by modifying this module alone.
+by modifying this module alone.  Shapely is imported on first use.
 """
 
-import shapely.geometry as _geometry
+import numpy as np
+
+from .core import lazy_module
+from .tessellation import segments as _segments
 
 # Public alias so other modules can import geometry functionality
 # without referencing :mod:`shapely` directly.
-sg = _geometry
+sg = lazy_module("shapely.geometry")
+_ops = lazy_module("shapely.ops")
 
 # Convenience factory functions wrapping ``shapely.geometry``
 
@@ -35,4 +39,37 @@ def box(minx, miny, maxx, maxy, ccw=True):
     return sg.box(minx, miny, maxx, maxy, ccw=ccw)
 
 
-__all__ = ["sg", "Polygon", "Point", "box"]
+def circle(x, y, radius, segments=None):
+    """Return a regular ``segments``-gon approximating a circle.
+
+    ``segments`` defaults to the count chosen by the current
+    :mod:`~parametric_cad.tessellation` policy for ``radius``.
+    """
+
+    if segments is None:
+        segments = _segments(radius)
+    angles = np.linspace(0.0, 2 * np.pi, segments, endpoint=False)
+    return sg.Polygon(
+        np.column_stack((x + radius * np.cos(angles), y + radius * np.sin(angles)))
+    )
+
+
+def polar_copies(polygon, count, angle=2 * np.pi):
+    """Return ``count`` copies of ``polygon`` rotated about the origin."""
+
+    coords = np.asarray(polygon.exterior.coords)
+    theta = np.arange(count) * (angle / count)
+    cos = np.cos(theta)[:, None]
+    sin = np.sin(theta)[:, None]
+    xs = coords[:, 0] * cos - coords[:, 1] * sin
+    ys = coords[:, 0] * sin + coords[:, 1] * cos
+    return [sg.Polygon(np.column_stack((x, y))) for x, y in zip(xs, ys)]
+
+
+def unary_union(geometries):
+    """Return the union of ``geometries`` as computed by :mod:`shapely.ops`."""
+
+    return _ops.unary_union(geometries)
+
+
+__all__ = ["sg", "Polygon", "Point", "box", "circle", "polar_copies", "unary_union"]
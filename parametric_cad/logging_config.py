@@ -1,12 +1,31 @@
+import atexit
 import logging
 from typing import Optional
 
+from parametric_cad import tracing
+
 
 def setup_logging(
     filename: Optional[str] = None,
     level: int = logging.INFO,
     format: str = "%(asctime)s - %(levelname)s - %(message)s",
-) -> None:
-    """Configure basic logging for examples and utilities."""
+    trace: bool | str = False,
+) -> Optional[tracing.Tracer]:
+    """Configure basic logging for examples and utilities.
+
+    ``trace`` turns on :mod:`parametric_cad.tracing` and returns the
+    tracer.  When it is a path, a Chrome trace is written there and the
+    span summary is logged when the process exits.
+    """
     logging.basicConfig(filename=filename, level=level, format=format)
+    if not trace:
+        return None
+    tracer = tracing.enable()
+    if isinstance(trace, str):
+        atexit.register(_dump_trace, tracer, trace)
+    return tracer
+
 
+def _dump_trace(tracer: tracing.Tracer, path: str) -> None:
+    tracer.write_chrome_trace(path)
+    logging.info("Trace written to %s\n%s", path, tracer.summary())
@@ -0,0 +1,24 @@
+"""Mechanism assemblies, imported on first access."""
+
+import importlib
+
+_LAZY = {
+    "ButtHinge": ".butthinge",
+    "RightAngleMotorBracket": ".motor_bracket",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = list(_LAZY)
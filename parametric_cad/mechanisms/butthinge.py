@@ -1,8 +1,10 @@
 from parametric_cad.core import tm
 import numpy as np
-from parametric_cad.export.stl import STLExporter
+from parametric_cad.patterns import linear_array
+from parametric_cad.tessellation import segments
+from parametric_cad.transform import Placeable
 
-class ButtHinge:
+class ButtHinge(Placeable):
     def __init__(self, leaf_length=50.0, leaf_width=25.0, leaf_thickness=2.0, knuckles=5, pin_diameter=3.0):
         """
         Initialize a parametric 3D butt hinge.
@@ -20,7 +22,7 @@ class ButtHinge:
         self.knuckles = max(3, int(knuckles))  # Minimum 3 knuckles for stability
         self.pin_diameter = float(pin_diameter)
         self._mesh = self._create_hinge()
-        self.exporter = STLExporter()
+        self._exporter = None
 
     def _create_hinge(self):
         """Create a trimesh object representing the butt hinge."""
@@ -42,34 +44,39 @@ class ButtHinge:
         leaf2.apply_translation([0, self.leaf_width + self.pin_diameter, 0])
 
         # Create knuckles (cylinders) along the hinge axis
-        knuckle_meshes = []
         knuckle_spacing = self.leaf_length / (self.knuckles + 1)
-        for i in range(self.knuckles):
-            z_pos = knuckle_spacing * (i + 1)
-            knuckle = tm.creation.cylinder(
-                radius=self.pin_diameter / 2,
-                height=self.leaf_thickness + 0.1,  # Slight overlap for union
-                sections=16
-            )
-            knuckle.apply_translation([self.leaf_length, self.leaf_width / 2, z_pos])
-            knuckle_meshes.append(knuckle)
+        knuckle = tm.creation.cylinder(
+            radius=self.pin_diameter / 2,
+            height=self.leaf_thickness + 0.1,  # Slight overlap for union
+            sections=segments(self.pin_diameter / 2)
+        )
+        knuckle.apply_translation([self.leaf_length, self.leaf_width / 2, knuckle_spacing])
+        knuckles = linear_array(knuckle, self.knuckles, [0, 0, knuckle_spacing])
 
         # Combine leaves and knuckles
-        hinge = tm.util.concatenate([leaf1, leaf2] + knuckle_meshes)
+        hinge = tm.util.concatenate([leaf1, leaf2, knuckles])
         return hinge
 
-    def mesh(self):
-        """Return the hinge mesh."""
-        return self._mesh
+    def base_mesh(self):
+        """Return a copy of the unplaced hinge mesh; copies of the hinge share it."""
+        return self._mesh.copy()
 
-    def at(self, x, y, z):
-        """Translate hinge to a position."""
-        self._mesh.apply_translation([x, y, z])
-        return self
+    @property
+    def exporter(self):
+        """STLExporter used by :meth:`export`, created on first use."""
+        if self._exporter is None:
+            from parametric_cad.export.stl import STLExporter
+
+            self._exporter = STLExporter()
+        return self._exporter
+
+    @exporter.setter
+    def exporter(self, exporter):
+        self._exporter = exporter
 
     def export(self, filename):
         """Export the hinge mesh using STLExporter."""
-        self.exporter.export_mesh(self._mesh, filename)
+        self.exporter.export_mesh(self.mesh(), filename)
 
 if __name__ == "__main__":
     # Example usage
@@ -1,8 +1,10 @@
 import numpy as np
 from math import pi
 from parametric_cad.core import tm, safe_difference
+from parametric_cad.tessellation import segments
+from parametric_cad.transform import Placeable
 
-class RightAngleMotorBracket:
+class RightAngleMotorBracket(Placeable):
     """Simple right angle bracket for a 540/550 size motor."""
 
     def __init__(
@@ -60,7 +62,7 @@ class RightAngleMotorBracket:
             cyl = tm.creation.cylinder(
                 radius=self.motor_hole_diameter / 2,
                 height=self.thickness + 0.2,
-                sections=32,
+                sections=segments(self.motor_hole_diameter / 2),
             )
             rot = tm.transformations.rotation_matrix(pi / 2, [1, 0, 0])
             cyl.apply_transform(rot)
@@ -71,7 +73,7 @@ class RightAngleMotorBracket:
         shaft = tm.creation.cylinder(
             radius=self.shaft_clearance_diameter / 2,
             height=self.thickness + 0.2,
-            sections=32,
+            sections=segments(self.shaft_clearance_diameter / 2),
         )
         shaft.apply_transform(tm.transformations.rotation_matrix(pi / 2, [1, 0, 0]))
         shaft.apply_translation([self.base_length / 2, hole_y, hole_z])
@@ -80,9 +82,6 @@ class RightAngleMotorBracket:
         bracket = safe_difference(bracket, holes)
         return bracket
 
-    def mesh(self) -> tm.Trimesh:
+    def base_mesh(self) -> tm.Trimesh:
+        """Return a copy of the unplaced bracket; copies of the bracket share it."""
         return self._mesh.copy()
-
-    def at(self, x: float, y: float, z: float) -> "RightAngleMotorBracket":
-        self._mesh.apply_translation([x, y, z])
-        return self
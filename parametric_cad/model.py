@@ -0,0 +1,290 @@
+"""Parametric models that rebuild only what a parameter change affects.
+
+A :class:`Model` holds named parameters and *features*: functions that
+build something (a primitive, a placed copy, a boolean result, a 2D
+outline, a number) from parameters and other features.  A feature reads
+its inputs from the context it is called with, and every read is
+recorded::
+
+    model = Model(length=50.0, thickness=3.0, hole_spacing=25.0)
+
+    @model.feature
+    def plate(p):
+        return Box(p.length, 40.0, p.thickness).mesh()
+
+    @model.feature
+    def holes(p):
+        return [Cylinder(1.6, 4.0).at(x, 20.0, 0.0).mesh()
+                for x in (p.length / 2 - p.hole_spacing / 2, p.length / 2 + p.hole_spacing / 2)]
+
+    @model.feature
+    def bracket(p):
+        return safe_difference(p.plate, p.holes)
+
+    model.mesh()                 # builds plate, holes and bracket
+    model.set(hole_spacing=30)
+    model.mesh()                 # rebuilds holes and bracket; plate is reused
+
+Each feature keeps a few results, each stored with the inputs it read
+in order (parameter values and upstream results, identified by hash).
+A result is reused when every input still matches, so moving a slider
+back to an earlier value is a cache hit too.  Only features whose inputs
+actually changed run again; :attr:`Model.rebuilt` lists them.  The
+current tessellation policy is an input of every feature.
+
+Features must not modify the values they read.  Meshes and placeable
+parts handed to a feature are copies, so placing a part read from
+another feature is safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cache import _normalize
+from .core import combine, tm
+from .tessellation import get_tessellation
+from .tracing import span
+from .transform import Placeable
+
+# Results kept per feature; a few let sliders move back and forth
+DEFAULT_MEMO_SIZE = 4
+
+Feature = Callable[["FeatureContext"], Any]
+
+
+def _token(*parts: Any) -> str:
+    blob = json.dumps([_normalize(p) for p in parts], separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _Result:
+    # (kind, name, token) of every input in the order it was read
+    inputs: List[Tuple[str, str, str]]
+    token: str
+    value: Any
+
+
+def _hand_out(value: Any) -> Any:
+    """Copy mutable geometry so a consumer cannot alter a memoized result."""
+    if isinstance(value, tm.Trimesh):
+        return value.copy(include_cache=True)
+    if isinstance(value, Placeable):
+        return value.copy()
+    if isinstance(value, list):
+        return [_hand_out(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_hand_out(v) for v in value)
+    return value
+
+
+class FeatureContext:
+    """Read access to parameters and features, recording every read.
+
+    Inputs are available as attributes (``p.thickness``) or items
+    (``p["thickness"]``).
+    """
+
+    def __init__(self, model: "Model", inputs: List[Tuple[str, str, str]]) -> None:
+        self._model = model
+        self._inputs = inputs
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._model._read(name, self._inputs)
+        except KeyError:
+            raise AttributeError(f"Model has no parameter or feature {name!r}") from None
+
+    def __getitem__(self, name: str) -> Any:
+        return self._model._read(name, self._inputs)
+
+
+class Model:
+    """Named parameters and memoized feature functions.
+
+    Parameters
+    ----------
+    name:
+        Used in trace spans and messages.
+    memo_size:
+        Results kept per feature.
+    **parameters:
+        Initial parameter values.
+    """
+
+    def __init__(self, name: str = "model", *, memo_size: int = DEFAULT_MEMO_SIZE, **parameters: Any) -> None:
+        if memo_size < 1:
+            raise ValueError("memo_size must be at least 1")
+        self.name = name
+        self.memo_size = memo_size
+        self._parameters: Dict[str, Any] = dict(parameters)
+        self._features: Dict[str, Feature] = {}
+        # bumped when a feature is redefined so old results no longer match
+        self._revisions: Dict[str, int] = {}
+        self._memo: Dict[str, List[_Result]] = {}
+        # results verified since the last change, by feature name
+        self._current: Dict[str, _Result] = {}
+        self._environment: Optional[str] = None
+        self._building: List[str] = []
+        self._lock = threading.RLock()
+        # Features that ran during the most recent evaluation, in order
+        self.rebuilt: List[str] = []
+
+    # -- definition ---------------------------------------------------
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return dict(self._parameters)
+
+    @property
+    def features(self) -> Tuple[str, ...]:
+        return tuple(self._features)
+
+    def set(self, **values: Any) -> "Model":
+        """Change parameter values; features rebuild lazily on next use."""
+        unknown = sorted(set(values) - set(self._parameters))
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(unknown)}")
+        with self._lock:
+            self._parameters.update(values)
+            self._current.clear()
+        return self
+
+    def add_parameter(self, name: str, value: Any) -> "Model":
+        if name in self._features:
+            raise ValueError(f"{name!r} is already a feature")
+        with self._lock:
+            self._parameters[name] = value
+            self._current.clear()
+        return self
+
+    def add_feature(self, name: str, func: Feature) -> "Model":
+        """Define or replace feature ``name`` computed by ``func(context)``."""
+        if name in self._parameters:
+            raise ValueError(f"{name!r} is already a parameter")
+        with self._lock:
+            self._features[name] = func
+            self._revisions[name] = self._revisions.get(name, 0) + 1
+            self._memo.pop(name, None)
+            self._current.clear()
+        return self
+
+    def feature(self, func: Optional[Feature] = None, *, name: Optional[str] = None):
+        """Decorator form of :meth:`add_feature`, named after the function."""
+
+        def register(f: Feature) -> Feature:
+            self.add_feature(name or f.__name__, f)
+            return f
+
+        return register(func) if func is not None else register
+
+    # -- evaluation ---------------------------------------------------
+
+    def evaluate(self, name: Optional[str] = None) -> Any:
+        """Return the value of feature ``name`` (default: the last defined)."""
+        with self._lock:
+            name = self._output(name)
+            environment = _token(get_tessellation())
+            if environment != self._environment:
+                self._environment = environment
+                self._current.clear()
+            self.rebuilt = []
+            return _hand_out(self._ensure(name).value)
+
+    def mesh(self, name: Optional[str] = None) -> tm.Trimesh:
+        """Return feature ``name`` as a single mesh."""
+        value = self.evaluate(name)
+        if isinstance(value, tm.Trimesh):
+            return value
+        if isinstance(value, (list, tuple)):
+            return combine(value)
+        if hasattr(value, "mesh"):
+            m = value.mesh
+            return m() if callable(m) else m
+        raise TypeError(f"Feature {self._output(name)!r} did not produce geometry")
+
+    def __getitem__(self, name: str) -> Any:
+        return self.evaluate(name)
+
+    def inputs(self, name: str) -> Tuple[str, ...]:
+        """Return the parameters and features ``name`` read when last built."""
+        with self._lock:
+            results = self._memo.get(name)
+            if not results:
+                return ()
+            names = (n for kind, n, _ in results[0].inputs if kind != "environment")
+            return tuple(dict.fromkeys(names))
+
+    def _output(self, name: Optional[str]) -> str:
+        if name is None:
+            if not self._features:
+                raise ValueError(f"Model {self.name!r} has no features")
+            return next(reversed(self._features))
+        if name not in self._features:
+            raise KeyError(f"Model {self.name!r} has no feature {name!r}")
+        return name
+
+    def _read(self, name: str, inputs: List[Tuple[str, str, str]]) -> Any:
+        if name in self._parameters:
+            inputs.append(("parameter", name, _token(self._parameters[name])))
+            return self._parameters[name]
+        if name in self._features:
+            result = self._ensure(name)
+            inputs.append(("feature", name, result.token))
+            return _hand_out(result.value)
+        raise KeyError(name)
+
+    def _input_token(self, kind: str, name: str) -> Optional[str]:
+        if kind == "environment":
+            return self._environment
+        if kind == "parameter":
+            if name not in self._parameters:
+                return None
+            return _token(self._parameters[name])
+        if name not in self._features:
+            return None
+        return self._ensure(name).token
+
+    def _ensure(self, name: str) -> _Result:
+        result = self._current.get(name)
+        if result is not None:
+            return result
+        if name in self._building:
+            cycle = " -> ".join(self._building[self._building.index(name):] + [name])
+            raise ValueError(f"Feature cycle: {cycle}")
+        self._building.append(name)
+        try:
+            results = self._memo.setdefault(name, [])
+            for i, candidate in enumerate(results):
+                # inputs are checked in the order they were read, so a
+                # branch taken on an earlier input is verified first
+                if all(self._input_token(k, n) == t for k, n, t in candidate.inputs):
+                    results.insert(0, results.pop(i))
+                    result = candidate
+                    break
+            else:
+                result = self._build(name)
+                results.insert(0, result)
+                del results[self.memo_size:]
+        finally:
+            self._building.pop()
+        self._current[name] = result
+        return result
+
+    def _build(self, name: str) -> _Result:
+        inputs = [("environment", "tessellation", self._environment)]
+        with span(f"Model.{name}", model=self.name):
+            value = self._features[name](FeatureContext(self, inputs))
+        self.rebuilt.append(name)
+        token = _token(name, self._revisions[name], inputs)
+        return _Result(inputs, token, value)
+
+
+__all__ = ["Model", "FeatureContext", "DEFAULT_MEMO_SIZE"]
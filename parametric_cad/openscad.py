@@ -0,0 +1,332 @@
+"""Batched OpenSCAD boolean service.
+
+Starting OpenSCAD costs far more than most of the booleans it runs, so
+:class:`ScadService` collects pending ``difference``/``union`` requests
+from every thread and evaluates each batch with a single OpenSCAD
+invocation.  The requests of a batch are placed side by side on a grid
+in one generated ``.scad`` program, exported as one binary STL and cut
+apart again by cell.  Operands go in as binary STL as well.
+
+At most ``max_processes`` OpenSCAD processes run at once.  An invocation
+that exceeds ``timeout`` is killed; when a batch fails its requests are
+retried one per process, so a request that hangs or crashes OpenSCAD
+only fails itself::
+
+    service = ScadService(max_processes=2)
+    futures = [service.submit("difference", [plate, *holes]) for plate in plates]
+    results = [f.result() for f in futures]
+
+The ``scad`` boolean engine routes through the shared service returned by
+:func:`get_scad_service`; :func:`configure_scad_service` replaces it.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import math
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .booleans import SCAD_TIMEOUT, BooleanError, find_openscad
+from .core import tm
+from .export.stl_writer import write_stl_binary
+from .tracing import span
+
+SCAD_OPERATIONS = ("difference", "union")
+
+# Empty space between neighbouring requests of a batch, in mm
+CELL_MARGIN = 1.0
+
+
+@dataclass
+class _Request:
+    op: str
+    meshes: List[tm.Trimesh]
+    future: Future = field(default_factory=Future)
+
+    def bounds(self) -> np.ndarray:
+        """Bounds the result is guaranteed to lie within."""
+        # a difference never grows past its target
+        parts = self.meshes[:1] if self.op == "difference" else self.meshes
+        stacked = np.array([m.bounds for m in parts])
+        return np.array([stacked[:, 0].min(axis=0), stacked[:, 1].max(axis=0)])
+
+
+def _layout(requests: Sequence[_Request]):
+    """Return per-request offsets on a square grid and the cell size."""
+
+    bounds = [r.bounds() for r in requests]
+    cell = max(float(np.max(b[1] - b[0])) for b in bounds) * 1.1 + CELL_MARGIN
+    columns = math.ceil(math.sqrt(len(requests)))
+    offsets = []
+    for i, b in enumerate(bounds):
+        origin = np.array([i % columns, i // columns, 0.0]) * cell
+        offsets.append(origin - b[0])
+    return offsets, cell, columns
+
+
+def batch_program(requests: Sequence[_Request], offsets: Sequence[np.ndarray]) -> str:
+    """Return the OpenSCAD program evaluating every request of a batch."""
+
+    lines = []
+    for i, (request, offset) in enumerate(zip(requests, offsets)):
+        x, y, z = (repr(float(v)) for v in offset)
+        lines.append(f"// request {i}")
+        lines.append(f"translate([{x}, {y}, {z}]) {request.op}() {{")
+        for j in range(len(request.meshes)):
+            lines.append(f'  import("r{i}_{j}.stl");')
+        lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def split_cells(
+    mesh: tm.Trimesh, offsets: Sequence[np.ndarray], cell: float, columns: int
+) -> List[tm.Trimesh]:
+    """Cut a batch result back into one mesh per request."""
+
+    if len(mesh.faces):
+        ij = np.floor(mesh.triangles_center[:, :2] / cell).astype(np.int64)
+        owner = ij[:, 1] * columns + ij[:, 0]
+    else:
+        owner = np.zeros(0, dtype=np.int64)
+    parts = []
+    for i, offset in enumerate(offsets):
+        part = tm.Trimesh(mesh.vertices, mesh.faces[owner == i], process=False)
+        part.remove_unreferenced_vertices()
+        part.apply_translation(-offset)
+        parts.append(part)
+    return parts
+
+
+class ScadService:
+    """Run OpenSCAD booleans in batches on a bounded pool of processes.
+
+    Parameters
+    ----------
+    binary:
+        OpenSCAD executable, located with
+        :func:`~parametric_cad.booleans.find_openscad` by default.
+    max_processes:
+        Upper bound on concurrently running OpenSCAD processes.
+    batch_size:
+        Most requests evaluated by one invocation.
+    batch_window:
+        Seconds to wait for more requests once the first one arrives
+        while a process slot is free.  Requests arriving while every
+        slot is busy join the next batch anyway.
+    timeout:
+        Seconds before an OpenSCAD process is considered hung and killed.
+    """
+
+    def __init__(
+        self,
+        binary: Optional[str] = None,
+        *,
+        max_processes: int = 2,
+        batch_size: int = 16,
+        batch_window: float = 0.005,
+        timeout: float = SCAD_TIMEOUT,
+    ) -> None:
+        if max_processes < 1 or batch_size < 1:
+            raise ValueError("max_processes and batch_size must be at least 1")
+        self.binary = binary or find_openscad()
+        if self.binary is None:
+            raise BooleanError("OpenSCAD executable not found")
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.timeout = timeout
+        # Invocations, batched requests and retried requests so far
+        self.invocations = 0
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._slots = threading.Semaphore(max_processes)
+        self._pool = ThreadPoolExecutor(max_workers=max_processes, thread_name_prefix="openscad")
+        self._closed = False
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="openscad-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, op: str, meshes: Sequence[tm.Trimesh]) -> Future:
+        """Queue ``op`` over ``meshes`` and return a future of the result.
+
+        For ``"difference"`` the first mesh is the target and the rest
+        are subtracted from it.
+        """
+
+        if op not in SCAD_OPERATIONS:
+            raise ValueError(f"Unknown OpenSCAD operation {op!r}; expected one of {SCAD_OPERATIONS}")
+        if not meshes:
+            raise ValueError("at least one mesh is required")
+        if self._closed:
+            raise BooleanError("OpenSCAD service is closed")
+        request = _Request(op, list(meshes))
+        self._queue.put(request)
+        return request.future
+
+    def difference(self, mesh: tm.Trimesh, operands: Sequence[tm.Trimesh]) -> tm.Trimesh:
+        return self.submit("difference", [mesh, *operands]).result()
+
+    def union(self, meshes: Sequence[tm.Trimesh]) -> tm.Trimesh:
+        return self.submit("union", meshes).result()
+
+    def close(self) -> None:
+        """Finish queued requests and stop the dispatcher and pool."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "ScadService":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _dispatch(self) -> None:
+        while True:
+            # wait for a free process first so that requests queue up
+            # into the next batch while every process is busy
+            self._slots.acquire()
+            first = self._queue.get()
+            if first is None:
+                self._slots.release()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.batch_window
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    request = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+            self._pool.submit(self._run_batch, batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: List[_Request], dispatched: bool = True) -> None:
+        try:
+            try:
+                results = self._invoke(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0].future.set_exception(
+                        e if isinstance(e, BooleanError) else BooleanError(str(e))
+                    )
+                    return
+                logging.debug(f"OpenSCAD batch of {len(batch)} failed ({e}); retrying singly")
+                with self._lock:
+                    self.retries += len(batch)
+                # the pool still bounds the processes; retries skip the
+                # dispatcher's slots so a full pool cannot deadlock
+                for request in batch:
+                    try:
+                        self._pool.submit(self._run_batch, [request], False)
+                    except RuntimeError:
+                        # pool shutting down: finish the retry here
+                        self._run_batch([request], False)
+                return
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+        finally:
+            if dispatched:
+                self._slots.release()
+
+    def _invoke(self, batch: List[_Request]) -> List[tm.Trimesh]:
+        with self._lock:
+            self.invocations += 1
+            self.requests += len(batch)
+        offsets, cell, columns = _layout(batch)
+        with span("ScadService.invoke", requests=len(batch)), tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            for i, request in enumerate(batch):
+                for j, mesh in enumerate(request.meshes):
+                    write_stl_binary(mesh, tmp_path / f"r{i}_{j}.stl")
+            program = tmp_path / "batch.scad"
+            program.write_text(batch_program(batch, offsets))
+            out = tmp_path / "result.stl"
+            try:
+                subprocess.run(
+                    [self.binary, "-o", str(out), "--export-format", "binstl", str(program)],
+                    check=True,
+                    capture_output=True,
+                    timeout=self.timeout,
+                    cwd=tmp,
+                )
+            except subprocess.TimeoutExpired as e:
+                raise BooleanError(f"OpenSCAD timed out after {self.timeout:g}s") from e
+            except subprocess.CalledProcessError as e:
+                stderr = e.stderr.decode("utf-8", "replace").strip().splitlines()
+                detail = stderr[-1] if stderr else f"exit status {e.returncode}"
+                raise BooleanError(f"OpenSCAD failed: {detail}") from e
+            mesh = tm.load(out, file_type="stl", force="mesh")
+        return split_cells(mesh, offsets, cell, columns)
+
+
+_service: Optional[ScadService] = None
+_service_lock = threading.Lock()
+
+
+def get_scad_service() -> ScadService:
+    """Return the shared service, starting it on first use."""
+
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ScadService()
+        return _service
+
+
+def configure_scad_service(**kwargs) -> ScadService:
+    """Replace the shared service with one built from ``kwargs``."""
+
+    global _service
+    service = ScadService(**kwargs)
+    with _service_lock:
+        previous, _service = _service, service
+    if previous is not None:
+        previous.close()
+    return service
+
+
+def shutdown_scad_service() -> None:
+    """Stop the shared service; the next boolean starts a new one."""
+
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.close()
+
+
+atexit.register(shutdown_scad_service)
+
+
+__all__ = [
+    "SCAD_OPERATIONS",
+    "ScadService",
+    "batch_program",
+    "split_cells",
+    "get_scad_service",
+    "configure_scad_service",
+    "shutdown_scad_service",
+]
@@ -0,0 +1,120 @@
+"""Vectorized instancing of a template mesh.
+
+Repeating features such as gear teeth, sprocket pockets or hinge
+knuckles are generated from one template mesh and a stacked ``(N, 4, 4)``
+array of transforms.  All copies are produced with a single NumPy
+broadcast over the template vertex buffer, and the face indices of every
+copy are offset in one step, instead of copying and transforming a mesh
+per instance in Python.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from .core import tm
+
+
+def polar_transforms(
+    count: int,
+    axis: Sequence[float] = (0.0, 0.0, 1.0),
+    center: Sequence[float] = (0.0, 0.0, 0.0),
+    angle: float = 2 * np.pi,
+) -> np.ndarray:
+    """Return ``count`` rotations about ``axis`` through ``center``.
+
+    Instances are spread evenly over ``angle`` radians; for a full turn
+    the last instance does not coincide with the first.  A ``count`` of
+    zero gives an empty ``(0, 4, 4)`` array, like :func:`linear_transforms`.
+    """
+
+    axis = np.asarray(axis, dtype=np.float64)
+    axis = axis / np.linalg.norm(axis)
+    center = np.asarray(center, dtype=np.float64)
+    full_turn = np.isclose(angle, 2 * np.pi)
+    steps = max(count if full_turn or count < 2 else count - 1, 1)
+    theta = np.arange(count) * (angle / steps)
+
+    # Rodrigues' rotation formula for every angle at once
+    x, y, z = axis
+    k = np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]])
+    sin = np.sin(theta)[:, None, None]
+    cos = np.cos(theta)[:, None, None]
+    rot = np.eye(3) + sin * k + (1.0 - cos) * (k @ k)
+
+    transforms = np.tile(np.eye(4), (count, 1, 1))
+    transforms[:, :3, :3] = rot
+    transforms[:, :3, 3] = center - rot @ center
+    return transforms
+
+
+def linear_transforms(count: int, step: Sequence[float]) -> np.ndarray:
+    """Return ``count`` translations spaced by the vector ``step``."""
+
+    transforms = np.tile(np.eye(4), (count, 1, 1))
+    transforms[:, :3, 3] = np.arange(count)[:, None] * np.asarray(step, dtype=np.float64)
+    return transforms
+
+
+def instance_mesh(mesh: tm.Trimesh, transforms: np.ndarray) -> tm.Trimesh:
+    """Return one mesh containing ``mesh`` placed at every transform.
+
+    Parameters
+    ----------
+    mesh:
+        Template mesh.  It is not modified.
+    transforms:
+        ``(N, 4, 4)`` array of homogeneous transforms.  Reflections are
+        allowed; the winding of mirrored copies is flipped so normals
+        keep pointing outwards.
+    """
+
+    transforms = np.asarray(transforms, dtype=np.float64).reshape(-1, 4, 4)
+    count = len(transforms)
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    if count == 0 or len(vertices) == 0:
+        return tm.Trimesh()
+
+    linear = transforms[:, :3, :3]
+    placed = np.matmul(vertices, linear.transpose(0, 2, 1))
+    placed += transforms[:, None, :3, 3]
+
+    offsets = np.arange(count, dtype=np.int64) * len(vertices)
+    stacked = np.broadcast_to(faces, (count,) + faces.shape) + offsets[:, None, None]
+    mirrored = np.linalg.det(linear) < 0
+    if np.any(mirrored):
+        stacked[mirrored] = stacked[mirrored][:, :, ::-1]
+
+    return tm.Trimesh(
+        vertices=placed.reshape(-1, 3),
+        faces=stacked.reshape(-1, 3),
+        process=False,
+    )
+
+
+def polar_array(
+    mesh: tm.Trimesh,
+    count: int,
+    axis: Sequence[float] = (0.0, 0.0, 1.0),
+    center: Sequence[float] = (0.0, 0.0, 0.0),
+    angle: float = 2 * np.pi,
+) -> tm.Trimesh:
+    """Repeat ``mesh`` ``count`` times around ``axis``."""
+    return instance_mesh(mesh, polar_transforms(count, axis, center, angle))
+
+
+def linear_array(mesh: tm.Trimesh, count: int, step: Sequence[float]) -> tm.Trimesh:
+    """Repeat ``mesh`` ``count`` times along the vector ``step``."""
+    return instance_mesh(mesh, linear_transforms(count, step))
+
+
+__all__ = [
+    "polar_transforms",
+    "linear_transforms",
+    "instance_mesh",
+    "polar_array",
+    "linear_array",
+]
@@ -0,0 +1,28 @@
+"""Parametric primitives, imported on first access."""
+
+import importlib
+
+_LAZY = {
+    "Primitive": ".base",
+    "Box": ".box",
+    "Cylinder": ".cylinder",
+    "Sphere": ".sphere",
+    "SpurGear": ".gear",
+    "ChainSprocket": ".sprocket",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = list(_LAZY)
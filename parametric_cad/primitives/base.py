@@ -1,34 +1,36 @@
-from typing import Optional, Sequence, Self
-
+from parametric_cad.cache import get_mesh_cache
 from parametric_cad.core import tm
+from parametric_cad.tracing import traced
+from parametric_cad.transform import IDENTITY, Placeable
 
 
-class Primitive:
-    """Base class for simple parametric primitives."""
-
-    def __init__(self) -> None:
-        self._position = (0.0, 0.0, 0.0)
-        self._rotation: Optional[tuple[Sequence[float], float]] = None
+class Primitive(Placeable):
+    """Base class for simple parametric primitives.
 
-    def at(self, x: float, y: float, z: float) -> Self:
-        """Translate the primitive to ``(x, y, z)``."""
-        self._position = (x, y, z)
-        return self
+    Placement (``at``, ``rotate``, ``scale``, ``mirror``, ...) comes from
+    :class:`~parametric_cad.transform.Placeable`; copies made with
+    :meth:`~parametric_cad.transform.Placeable.copy` share one cached base
+    mesh and differ only by their transform.
+    """
 
-    def rotate(self, axis: Sequence[float], angle: float) -> Self:
-        """Rotate the primitive around ``axis`` by ``angle`` radians."""
-        self._rotation = (axis, angle)
-        return self
+    def __init__(self) -> None:
+        self._placement = IDENTITY
 
     def _create_mesh(self) -> tm.Trimesh:
         """Return the untransformed mesh for this primitive."""
         raise NotImplementedError
 
+    def base_mesh(self) -> tm.Trimesh:
+        """Return a fresh copy of the untransformed mesh.
+
+        The mesh is served from the process-wide
+        :class:`~parametric_cad.cache.MeshCache` when one is configured.
+        """
+        cache = get_mesh_cache()
+        if cache is None:
+            return self._create_mesh()
+        return cache.get_or_create(self.cache_key(), self._create_mesh)
+
+    @traced(method=True)
     def mesh(self) -> tm.Trimesh:
-        mesh = self._create_mesh()
-        if self._rotation is not None:
-            axis, angle = self._rotation
-            rot = tm.transformations.rotation_matrix(angle, axis)
-            mesh.apply_transform(rot)
-        mesh.apply_translation(self._position)
-        return mesh
+        return self._placement.apply_to(self.base_mesh())
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from parametric_cad.core import tm
+from parametric_cad.tracing import traced
 from .base import Primitive
 
 
@@ -15,5 +16,6 @@ class Box(Primitive):
     def __post_init__(self) -> None:
         super().__init__()
 
+    @traced(method=True)
     def _create_mesh(self) -> tm.Trimesh:
         return tm.creation.box(extents=(self.width, self.depth, self.height))
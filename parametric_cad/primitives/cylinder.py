@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from parametric_cad.core import tm
+from parametric_cad.tessellation import segments
+from parametric_cad.tracing import traced
 from .base import Primitive
 
 
@@ -10,14 +13,16 @@ class Cylinder(Primitive):
 
     radius: float
     height: float
-    sections: int = 32
+    # None picks the count from the tessellation policy
+    sections: Optional[int] = None
 
     def __post_init__(self) -> None:
         super().__init__()
 
+    @traced(method=True)
     def _create_mesh(self) -> tm.Trimesh:
         return tm.creation.cylinder(
             radius=self.radius,
             height=self.height,
-            sections=self.sections,
+            sections=self.sections or segments(self.radius),
         )
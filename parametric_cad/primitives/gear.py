@@ -4,11 +4,25 @@ from typing import List
 
 import numpy as np
 
-from parametric_cad.core import safe_difference, tm
-from parametric_cad.geometry import Polygon
+from parametric_cad.core import extrude, safe_difference, tm
+from parametric_cad.geometry import Polygon, circle, polar_copies, unary_union
+from parametric_cad.patterns import polar_array
+from parametric_cad.tessellation import get_tessellation, segments
+from parametric_cad.tracing import traced
 from .base import Primitive
 
+MESH_MODES = ("2d", "3d")
+
+
 class SpurGear(Primitive):
+    """Involute spur gear.
+
+    ``mode="2d"`` (the default) builds the complete outline, bore and
+    lightening holes in 2D and extrudes it once, which is exact and needs
+    no boolean engine.  ``mode="3d"`` keeps the original pipeline that
+    extrudes one tooth, patterns it and subtracts 3D cutters.
+    """
+
     def __init__(
         self,
         module: float,
@@ -18,8 +32,11 @@ class SpurGear(Primitive):
         hole_count: int = 0,
         hole_diameter: float = 2.0,
         hole_radius: float | None = None,
+        mode: str = "2d",
     ) -> None:
         super().__init__()
+        if mode not in MESH_MODES:
+            raise ValueError(f"Unknown gear mesh mode {mode!r}, expected one of {MESH_MODES}")
         self.module = module
         self.teeth = teeth
         self.width = width
@@ -27,6 +44,7 @@ class SpurGear(Primitive):
         self.hole_count = hole_count
         self.hole_diameter = hole_diameter
         self.hole_radius = hole_radius or (self.pitch_diameter / 2 + module * 1.5)
+        self.mode = mode
         logging.debug(
             "Initialized SpurGear: module=%s, teeth=%s, width=%s, bore=%s, holes=%s",
             module,
@@ -53,7 +71,11 @@ class SpurGear(Primitive):
     def dedendum(self) -> float:
         return 1.25 * self.module
 
-    def involute_profile(self, base_radius: float, outer_radius: float, steps: int = 10) -> np.ndarray:
+    def involute_profile(
+        self, base_radius: float, outer_radius: float, steps: int | None = None
+    ) -> np.ndarray:
+        if steps is None:
+            steps = get_tessellation().involute_steps(base_radius, outer_radius)
         theta = np.linspace(0, np.arccos(base_radius / outer_radius), steps)
         x = base_radius * (np.cos(theta) + theta * np.tan(theta))
         y = base_radius * (np.sin(theta) - theta * np.tan(theta))
@@ -70,9 +92,9 @@ class SpurGear(Primitive):
         mirrored[:, 1] *= -1
 
         arc: List[List[float]] = []
-        arc_steps = 10
         start_angle = np.arctan2(mirrored[-1, 1], mirrored[-1, 0])
         end_angle = -start_angle
+        arc_steps = segments(root_radius, end_angle - start_angle)
         for i in range(arc_steps + 1):
             angle = start_angle + (end_angle - start_angle) * i / arc_steps
             x = root_radius * cos(angle)
@@ -85,53 +107,172 @@ class SpurGear(Primitive):
         logging.debug("Created tooth profile with %d points", len(profile))
         return profile
 
-    def _create_mesh(self) -> tm.Trimesh:
-        tooth_profile = self.create_tooth()
-        polygon = Polygon(tooth_profile)
+    def involute_tooth(self, steps: int | None = None):
+        """Return a closed involute tooth polygon centred on the +X axis.
+
+        Both flanks follow the involute of the base circle from the root
+        (or base circle, whichever is larger) to the tip.  The tooth
+        extends slightly inside the root circle so that it fuses cleanly
+        with the hub when unioned.  ``steps`` defaults to the count the
+        tessellation policy needs for the flank's curvature.
+        """
+        flank, flank_offset = self._flank(steps)
+        inner = self.pitch_diameter / 2 - self.dedendum - 0.25 * self.module
+        upper = np.vstack(
+            [[inner * cos(flank_offset), inner * sin(flank_offset)], flank]
+        )
+        tip = self._tip(flank)[::-1]
+        lower = upper[::-1] * [1.0, -1.0]
+        return Polygon(np.vstack([upper, tip, lower]))
+
+    def _flank(self, steps: int | None = None):
+        """Return the upper flank from the root circle to the tip.
+
+        Also returns the flank's angular offset at the base circle.  Below
+        the base circle the flank runs radially down to the root, unless
+        that step is within the tessellation tolerance.
+        """
+        pitch_radius = self.pitch_diameter / 2
+        base_radius = self.base_diameter / 2
+        outer_radius = pitch_radius + self.addendum
+        root_radius = pitch_radius - self.dedendum
+        pressure_angle = 20 * pi / 180
+        if steps is None:
+            steps = get_tessellation().involute_steps(base_radius, outer_radius)
+
+        def inv(radius):
+            alpha = np.arccos(np.clip(base_radius / radius, -1.0, 1.0))
+            return np.tan(alpha) - alpha
+
+        # Half the tooth thickness at the pitch circle plus the involute
+        # roll angle gives the angular offset of each flank's start.
+        flank_offset = pi / (2 * self.teeth) + tan(pressure_angle) - pressure_angle
+        radii = np.linspace(max(base_radius, root_radius), outer_radius, steps)
+        angles = flank_offset - inv(radii)
+        keep = angles >= 0
+        radii, angles = radii[keep], angles[keep]
+        flank = np.column_stack((radii * np.cos(angles), radii * np.sin(angles)))
+        if base_radius - root_radius > get_tessellation().tolerance:
+            root = [[root_radius * cos(flank_offset), root_radius * sin(flank_offset)]]
+            flank = np.vstack([root, flank])
+        return flank, flank_offset
+
+    def _tip(self, flank: np.ndarray) -> np.ndarray:
+        """Return the tip arc between the flanks, counter-clockwise."""
+        outer_radius = self.pitch_diameter / 2 + self.addendum
+        tip_half = np.arctan2(flank[-1, 1], flank[-1, 0])
+        angles = np.linspace(-tip_half, tip_half, segments(outer_radius, 2 * tip_half) + 1)[1:-1]
+        return outer_radius * np.column_stack((np.cos(angles), np.sin(angles)))
+
+    def tooth_polygon(self):
+        """Return the legacy tooth profile as a valid polygon."""
+        polygon = Polygon(self.create_tooth())
         if not polygon.is_valid:
             polygon = polygon.buffer(0)
             logging.warning("Tooth polygon was invalid, repaired with buffer")
+        return polygon
 
-        tooth_mesh = tm.creation.extrude_polygon(polygon, self.width, engine="triangle")
-        logging.debug("Extruded tooth mesh with %d vertices", len(tooth_mesh.vertices))
+    def body(self):
+        """Return the 2D hub and teeth; depends only on module and teeth.
 
-        all_teeth = []
-        for i in range(self.teeth):
-            angle = 2 * pi * i / self.teeth
-            rot = tm.transformations.rotation_matrix(angle, [0, 0, 1])
-            rotated_tooth = tooth_mesh.copy().apply_transform(rot)
-            all_teeth.append(rotated_tooth)
-            logging.debug("Added tooth %d/%d", i + 1, self.teeth)
+        The outline is traced directly, tooth flank to root arc to the next
+        flank, so no union is needed and no slivers appear where a hub
+        polygon would cross the flanks.
+        """
+        root_radius = self.pitch_diameter / 2 - self.dedendum
+        flank, _ = self._flank()
+        gap = 2 * pi / self.teeth
+        start = np.arctan2(flank[0, 1], flank[0, 0])
+        arc = np.linspace(start, gap - start, segments(root_radius, gap - 2 * start) + 1)[1:-1]
+        unit = np.vstack(
+            [
+                flank * [1.0, -1.0],
+                self._tip(flank),
+                flank[::-1],
+                root_radius * np.column_stack((np.cos(arc), np.sin(arc))),
+            ]
+        )
+        theta = np.arange(self.teeth)[:, None] * gap
+        xs = unit[:, 0] * np.cos(theta) - unit[:, 1] * np.sin(theta)
+        ys = unit[:, 0] * np.sin(theta) + unit[:, 1] * np.cos(theta)
+        body = Polygon(np.column_stack((xs.ravel(), ys.ravel())))
+        if not body.is_valid:
+            # very fine teeth can overlap at the root; fall back to a union
+            teeth = polar_copies(self.involute_tooth(), self.teeth)
+            body = unary_union([circle(0, 0, root_radius), *teeth])
+        return body
+
+    def cutters(self):
+        """Return the 2D union of the bore and lightening holes."""
+        cutters = [circle(0, 0, self.bore_diameter / 2)]
+        for i in range(self.hole_count):
+            angle = 2 * pi * i / self.hole_count
+            cutters.append(
+                circle(
+                    cos(angle) * self.hole_radius,
+                    sin(angle) * self.hole_radius,
+                    self.hole_diameter / 2,
+                )
+            )
+        return unary_union(cutters)
+
+    def outline(self):
+        """Return the 2D gear outline including bore and lightening holes."""
+        return self.body().difference(self.cutters())
+
+    @traced(method=True)
+    def _create_mesh(self) -> tm.Trimesh:
+        if self.mode == "3d":
+            return self._create_mesh_3d()
 
-        gear_body = tm.util.concatenate(all_teeth)
+        gear = extrude(self.outline(), self.width)
+        logging.debug(
+            "Extruded gear outline with %d teeth into mesh with %d vertices",
+            self.teeth,
+            len(gear.vertices),
+        )
+        if not gear.is_watertight:
+            logging.warning("Final gear mesh is not watertight")
+        return gear
+
+    def _create_mesh_3d(self) -> tm.Trimesh:
+        polygon = self.tooth_polygon()
+        tooth_mesh = extrude(polygon, self.width)
+        logging.debug("Extruded tooth mesh with %d vertices", len(tooth_mesh.vertices))
+
+        gear_body = polar_array(tooth_mesh, self.teeth)
         logging.debug(
             "Combined %d teeth into gear body with %d vertices",
             self.teeth,
             len(gear_body.vertices),
         )
 
-        bore = tm.creation.cylinder(radius=self.bore_diameter / 2, height=self.width + 0.1)
+        bore = tm.creation.cylinder(
+            radius=self.bore_diameter / 2,
+            height=self.width + 0.1,
+            sections=segments(self.bore_diameter / 2),
+        )
         bore.apply_translation([0, 0, self.width / 2])
-        gear = safe_difference(gear_body, bore)
-        logging.debug("Subtracted bore, resulting mesh has %d vertices", len(gear.vertices))
+        cutters = [bore]
 
         if self.hole_count > 0:
-            hole_cylinders = []
-            for i in range(self.hole_count):
-                angle = 2 * pi * i / self.hole_count
-                x = cos(angle) * self.hole_radius
-                y = sin(angle) * self.hole_radius
-                hole = tm.creation.cylinder(radius=self.hole_diameter / 2, height=self.width + 0.1)
-                hole.apply_translation([x, y, self.width / 2])
-                if not hole.is_volume:
-                    hole = hole.convex_hull
-                hole_cylinders.append(hole)
-            gear = safe_difference(gear, hole_cylinders)
-            logging.debug(
-                "Subtracted %d holes, resulting mesh has %d vertices",
-                self.hole_count,
-                len(gear.vertices),
+            hole = tm.creation.cylinder(
+                radius=self.hole_diameter / 2,
+                height=self.width + 0.1,
+                sections=segments(self.hole_diameter / 2),
             )
+            hole.apply_translation([self.hole_radius, 0, self.width / 2])
+            if not hole.is_volume:
+                hole = hole.convex_hull
+            cutters.append(polar_array(hole, self.hole_count))
+
+        # Bore and lightening holes are removed in a single boolean pass
+        gear = safe_difference(gear_body, cutters)
+        logging.debug(
+            "Subtracted bore and %d holes, resulting mesh has %d vertices",
+            self.hole_count,
+            len(gear.vertices),
+        )
 
         if not gear.is_watertight:
             logging.warning("Final gear mesh is not watertight")
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from parametric_cad.core import tm
+from parametric_cad.tessellation import get_tessellation
+from parametric_cad.tracing import traced
 from .base import Primitive
 
 
@@ -9,13 +12,19 @@ class Sphere(Primitive):
     """Icosphere primitive."""
 
     radius: float
-    subdivisions: int = 3
+    # None picks the level from the tessellation policy
+    subdivisions: Optional[int] = None
 
     def __post_init__(self) -> None:
         super().__init__()
 
+    @traced(method=True)
     def _create_mesh(self) -> tm.Trimesh:
         return tm.creation.icosphere(
-            subdivisions=self.subdivisions,
+            subdivisions=(
+                self.subdivisions
+                if self.subdivisions is not None
+                else get_tessellation().subdivisions(self.radius)
+            ),
             radius=self.radius,
         )
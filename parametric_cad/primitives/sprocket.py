@@ -1,11 +1,25 @@
-from math import cos, pi, sin
+from math import asin, pi, sin
 
-from parametric_cad.core import safe_difference, tm
+import numpy as np
+
+from parametric_cad.core import extrude, safe_difference, tm
+from parametric_cad.geometry import Polygon, circle, polar_copies, unary_union
+from parametric_cad.patterns import polar_array
+from parametric_cad.repair import repair_mesh
+from parametric_cad.tessellation import segments
+from parametric_cad.tracing import traced
 from .base import Primitive
+from .gear import MESH_MODES
 
 
 class ChainSprocket(Primitive):
-    """Simple chain sprocket for roller chain."""
+    """Simple chain sprocket for roller chain.
+
+    ``mode="2d"`` (the default) cuts the bore and roller seats from the
+    disc outline in 2D and extrudes once.  The seats open through the rim
+    so that no pocket merely touches the outer edge.  ``mode="3d"`` keeps
+    the original boolean pipeline.
+    """
 
     def __init__(
         self,
@@ -15,14 +29,18 @@ class ChainSprocket(Primitive):
         thickness: float = 5.0,
         bore_diameter: float = 10.0,
         clearance: float = 0.5,
+        mode: str = "2d",
     ) -> None:
         super().__init__()
+        if mode not in MESH_MODES:
+            raise ValueError(f"Unknown sprocket mesh mode {mode!r}, expected one of {MESH_MODES}")
         self.pitch = float(pitch)
         self.roller_diameter = float(roller_diameter)
         self.teeth = int(teeth)
         self.thickness = float(thickness)
         self.bore_diameter = float(bore_diameter)
         self.clearance = float(clearance)
+        self.mode = mode
 
     @property
     def pitch_radius(self) -> float:
@@ -32,39 +50,82 @@ class ChainSprocket(Primitive):
     def pitch_diameter(self) -> float:
         return self.pitch_radius * 2
 
+    @property
+    def outer_radius(self) -> float:
+        return self.pitch_radius + self.roller_diameter / 2 + self.clearance
+
+    def disc(self):
+        """Return the 2D blank the seats and bore are cut from.
+
+        Each tip arc is sampled from one seat wall to the next, so the
+        seats cut exactly through polygon vertices instead of leaving
+        slivers wherever a wall happens to fall between two of them.
+        """
+        pocket_radius = self.roller_diameter / 2 + self.clearance
+        wall = asin(min(pocket_radius / self.outer_radius, 1.0))
+        span = 2 * pi / self.teeth - 2 * wall
+        if span <= 0:
+            return circle(0, 0, self.outer_radius)
+        tip = np.linspace(wall, wall + span, segments(self.outer_radius, span) + 1)
+        angles = (np.arange(self.teeth)[:, None] * (2 * pi / self.teeth) + tip).ravel()
+        return Polygon(self.outer_radius * np.column_stack((np.cos(angles), np.sin(angles))))
+
+    def seats(self):
+        """Return the 2D union of all roller seats."""
+        pocket_radius = self.roller_diameter / 2 + self.clearance
+        # half circle towards the centre, opened out through the rim
+        arc = np.linspace(pi / 2, 3 * pi / 2, segments(pocket_radius, pi) + 1)
+        outer = self.outer_radius + pocket_radius
+        seat = Polygon(
+            np.vstack(
+                [
+                    np.column_stack(
+                        (self.pitch_radius + pocket_radius * np.cos(arc), pocket_radius * np.sin(arc))
+                    ),
+                    [[outer, -pocket_radius], [outer, pocket_radius]],
+                ]
+            )
+        )
+        return unary_union(polar_copies(seat, self.teeth))
+
+    def bore(self):
+        return circle(0, 0, self.bore_diameter / 2)
+
+    def outline(self):
+        """Return the 2D sprocket outline with bore and roller seats removed."""
+        return self.disc().difference(unary_union([self.seats(), self.bore()]))
+
+    @traced(method=True)
     def _create_mesh(self) -> tm.Trimesh:
+        if self.mode == "2d":
+            return extrude(self.outline(), self.thickness)
+
         # Base disc sized so pockets can be subtracted
-        outer_radius = self.pitch_radius + self.roller_diameter / 2 + self.clearance
         disc = tm.creation.cylinder(
-            radius=outer_radius,
+            radius=self.outer_radius,
             height=self.thickness,
-            sections=self.teeth * 4,
+            sections=segments(self.outer_radius),
         )
         disc.apply_translation([0, 0, self.thickness / 2])
 
-        bore = tm.creation.cylinder(radius=self.bore_diameter / 2, height=self.thickness + 0.1)
+        bore = tm.creation.cylinder(
+            radius=self.bore_diameter / 2,
+            height=self.thickness + 0.1,
+            sections=segments(self.bore_diameter / 2),
+        )
         bore.apply_translation([0, 0, self.thickness / 2])
-        sprocket = safe_difference(disc, bore)
 
         pocket_radius = self.roller_diameter / 2 + self.clearance
-        pockets = []
-        for i in range(self.teeth):
-            angle = 2 * pi * i / self.teeth
-            x = cos(angle) * self.pitch_radius
-            y = sin(angle) * self.pitch_radius
-            pocket = tm.creation.cylinder(
-                radius=pocket_radius,
-                height=self.thickness + 0.1,
-                sections=16,
-            )
-            pocket.apply_translation([x, y, self.thickness / 2])
-            pockets.append(pocket)
+        pocket = tm.creation.cylinder(
+            radius=pocket_radius,
+            height=self.thickness + 0.1,
+            sections=segments(pocket_radius),
+        )
+        pocket.apply_translation([self.pitch_radius, 0, self.thickness / 2])
+        pockets = polar_array(pocket, self.teeth)
 
-        sprocket = safe_difference(sprocket, pockets)
+        # Bore and pockets are removed in a single boolean pass
+        sprocket = safe_difference(disc, [bore, pockets])
         if not sprocket.is_watertight:
-            repaired = sprocket.fill_holes()
-            if repaired is not False:
-                sprocket = repaired
-            else:
-                sprocket = sprocket.convex_hull
+            sprocket, _ = repair_mesh(sprocket)
         return sprocket
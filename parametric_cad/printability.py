@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
+from . import spatial
+from .cache import mesh_content_key
 from .core import tm
+from .tracing import span
 import numpy as np
 
 
@@ -12,40 +21,39 @@ def _default_rules_path() -> Path:
     return Path(__file__).resolve().parent.parent / "bambu_printability_rules.json"
 
 
-class PrintabilityValidator:
-    """Validate meshes against Bambu Labs printability guidelines."""
+@dataclass(frozen=True)
+class Check:
+    """A single compiled printability rule.
 
-    def __init__(self, rules_file: str | Path | None = None) -> None:
-        path = Path(rules_file) if rules_file else _default_rules_path()
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        self.rules = data.get("rules", {})
-        self.rules_file = path
+    ``func`` returns a list of error messages for a mesh, or a tuple of
+    the messages and the offending face indices.  ``cost`` only orders
+    the checks; cheap checks run first so fail-fast validation can stop
+    before the expensive ones.
+    """
+
+    name: str
+    cost: int
+    func: Callable[[tm.Trimesh], List[str] | Tuple[List[str], np.ndarray]]
 
-    def validate_mesh(self, mesh: tm.Trimesh) -> List[str]:
-        r = self.rules
-        errors: List[str] = []
+    def __call__(self, mesh: tm.Trimesh) -> Tuple[List[str], np.ndarray]:
+        result = self.func(mesh)
+        if isinstance(result, tuple):
+            return result
+        return result, np.zeros(0, dtype=np.int64)
 
-        if r.get("manifold_geometry_required") and not mesh.is_watertight:
-            errors.append("Mesh is not watertight")
 
-        if r.get("no_open_edges") and mesh.euler_number < 2:
-            errors.append("Mesh has open edges")
+def _triangle_count(max_tris):
+    def check(mesh):
+        if mesh.faces.shape[0] > max_tris:
+            return [f"Triangle count {mesh.faces.shape[0]} exceeds maximum of {max_tris}"]
+        return []
 
-        if r.get("no_intersecting_geometry"):
-            try:
-                if mesh.is_self_intersecting:
-                    errors.append("Mesh has self intersections")
-            except Exception:
-                pass
+    return check
 
-        max_tris = r.get("maximum_file_triangle_count")
-        if max_tris and mesh.faces.shape[0] > max_tris:
-            errors.append(
-                f"Triangle count {mesh.faces.shape[0]} exceeds maximum of {max_tris}"
-            )
 
-        max_size = r.get("max_model_size_mm", {})
+def _model_size(max_size):
+    def check(mesh):
+        errors = []
         extents = mesh.extents
         for axis, idx in zip(["X", "Y", "Z"], range(3)):
             max_dim = max_size.get(axis)
@@ -53,37 +61,262 @@ class PrintabilityValidator:
                 errors.append(
                     f"{axis} dimension {extents[idx]:.2f}mm exceeds max of {max_dim}mm"
                 )
+        return errors
 
-        min_feat = r.get("minimum_feature_size_mm")
-        if min_feat:
-            try:
-                min_len = float(min(mesh.edges_unique_length))
-                if min_len < min_feat:
-                    errors.append(
-                        f"Minimum feature size {min_len:.2f}mm below {min_feat}mm"
-                    )
-            except Exception:
-                pass
-
-        max_angle = r.get("overhang_max_angle_deg")
-        if max_angle is not None:
-            normals = mesh.face_normals
-            min_z = mesh.bounds[0, 2]
-            downward = (normals[:, 2] < 0) & (
-                mesh.triangles_center[:, 2] > min_z + 1e-6
-            )
-            if np.any(downward):
-                angles = np.degrees(
-                    np.arccos(np.clip(normals[downward, 2], -1.0, 1.0))
-                )
-                if angles.size > 0 and angles.max() > max_angle:
-                    errors.append("Overhang angle exceeds maximum")
+    return check
+
+
+def _watertight(mesh):
+    return [] if mesh.is_watertight else ["Mesh is not watertight"]
+
+
+def _open_edges(mesh):
+    # Edges used by a single face.  The Euler number cannot be used here:
+    # closed parts with through holes (gears, brackets) have genus > 0.
+    boundary = tm.grouping.group_rows(mesh.edges_sorted, require_count=1)
+    return ["Mesh has open edges"] if len(boundary) else []
+
+
+def _self_intersection(mesh):
+    pairs = spatial.self_intersections(mesh)
+    if len(pairs):
+        return [f"Mesh has self intersections ({len(pairs)} face pairs)"], np.unique(pairs)
+    return []
+
+
+def _wall_thickness(minimum):
+    def check(mesh):
+        faces, thickness = spatial.thin_walls(mesh, minimum)
+        if len(faces):
+            return [
+                f"Wall thickness {thickness.min():.2f}mm below {minimum}mm "
+                f"({len(faces)} faces)"
+            ], faces
+        return []
+
+    return check
+
+
+def _hole_diameter(minimum):
+    def check(mesh):
+        holes = spatial.small_holes(mesh, minimum)
+        if holes:
+            smallest = min(d for d, _ in holes)
+            faces = np.unique(np.concatenate([f for _, f in holes]))
+            return [f"Hole diameter {smallest:.2f}mm below {minimum}mm"], faces
+        return []
+
+    return check
+
+
+def _bridge_length(maximum):
+    def check(mesh):
+        bridges = spatial.long_bridges(mesh, maximum)
+        if bridges:
+            longest = max(span for span, _ in bridges)
+            faces = np.unique(np.concatenate([f for _, f in bridges]))
+            return [f"Bridge length {longest:.2f}mm exceeds {maximum}mm"], faces
+        return []
+
+    return check
+
+
+def _feature_size(min_feat):
+    def check(mesh):
+        try:
+            min_len = float(min(mesh.edges_unique_length))
+        except Exception:
+            return []
+        if min_len < min_feat:
+            return [f"Minimum feature size {min_len:.2f}mm below {min_feat}mm"]
+        return []
+
+    return check
+
+
+def _overhang(max_angle):
+    def check(mesh):
+        normals = mesh.face_normals
+        min_z = mesh.bounds[0, 2]
+        downward = (normals[:, 2] < 0) & (mesh.triangles_center[:, 2] > min_z + 1e-6)
+        if np.any(downward):
+            angles = np.degrees(np.arccos(np.clip(normals[downward, 2], -1.0, 1.0)))
+            if angles.size > 0 and angles.max() > max_angle:
+                return ["Overhang angle exceeds maximum"]
+        return []
 
+    return check
+
+
+def compile_rules(rules: Dict) -> Tuple[Check, ...]:
+    """Turn a rules dictionary into checks ordered cheapest first."""
+
+    r = rules
+    checks: List[Check] = []
+    max_tris = r.get("maximum_file_triangle_count")
+    if max_tris:
+        checks.append(Check("triangle_count", 0, _triangle_count(max_tris)))
+    max_size = r.get("max_model_size_mm", {})
+    if any(max_size.values()):
+        checks.append(Check("model_size", 1, _model_size(max_size)))
+    if r.get("manifold_geometry_required"):
+        checks.append(Check("watertight", 2, _watertight))
+    if r.get("no_open_edges"):
+        checks.append(Check("open_edges", 3, _open_edges))
+    max_angle = r.get("overhang_max_angle_deg")
+    if max_angle is not None:
+        checks.append(Check("overhang", 4, _overhang(max_angle)))
+    min_feat = r.get("minimum_feature_size_mm")
+    if min_feat:
+        checks.append(Check("feature_size", 5, _feature_size(min_feat)))
+    max_bridge = r.get("bridge_max_length_mm")
+    if max_bridge:
+        checks.append(Check("bridge_length", 6, _bridge_length(max_bridge)))
+    min_hole = r.get("minimum_hole_diameter_mm")
+    if min_hole:
+        checks.append(Check("hole_diameter", 7, _hole_diameter(min_hole)))
+    min_wall = r.get("minimum_wall_thickness_mm")
+    if min_wall:
+        checks.append(Check("wall_thickness", 8, _wall_thickness(min_wall)))
+    if r.get("no_intersecting_geometry"):
+        checks.append(Check("self_intersection", 9, _self_intersection))
+    return tuple(sorted(checks, key=lambda c: c.cost))
+
+
+@lru_cache(maxsize=16)
+def _load_rules(path: str, mtime_ns: int) -> Tuple[Dict, Tuple[Check, ...]]:
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f).get("rules", {})
+    return rules, compile_rules(rules)
+
+
+def load_rules(path: str | Path) -> Tuple[Dict, Tuple[Check, ...]]:
+    """Return the rules and compiled checks of ``path``.
+
+    Files are parsed once and re-read only when their mtime changes.
+    """
+
+    path = Path(path)
+    return _load_rules(str(path), path.stat().st_mtime_ns)
+
+
+class PrintabilityValidator:
+    """Validate meshes against Bambu Labs printability guidelines.
+
+    Parameters
+    ----------
+    rules_file:
+        Rules JSON, defaults to ``bambu_printability_rules.json``.
+    fail_fast:
+        Stop at the first failing check instead of reporting all errors.
+    workers:
+        Run checks concurrently on this many threads.
+    cache_size:
+        Number of results remembered by mesh content hash, 0 to disable.
+    """
+
+    def __init__(
+        self,
+        rules_file: str | Path | None = None,
+        fail_fast: bool = False,
+        workers: int = 1,
+        cache_size: int = 128,
+    ) -> None:
+        path = Path(rules_file) if rules_file else _default_rules_path()
+        self.rules, self.checks = load_rules(path)
+        self.rules_file = path
+        self.fail_fast = fail_fast
+        self.workers = workers
+        self.cache_size = cache_size
+        self._results: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Seconds spent in each check by the most recent and all calls
+        self.last_timings: Dict[str, float] = {}
+        # Offending face indices per failed check of the most recent call
+        self.last_faces: Dict[str, np.ndarray] = {}
+        self.total_timings: Dict[str, float] = {}
+
+    def validate_mesh(self, mesh: tm.Trimesh, fail_fast: Optional[bool] = None) -> List[str]:
+        with span("PrintabilityValidator.validate_mesh") as s:
+            s.mesh(mesh)
+            errors = self._validate(mesh, fail_fast)
+            s.set(errors=len(errors), cached=not self.last_timings)
         return errors
 
+    def _validate(self, mesh: tm.Trimesh, fail_fast: Optional[bool]) -> List[str]:
+        fail_fast = self.fail_fast if fail_fast is None else fail_fast
+        key = None
+        if self.cache_size:
+            key = (mesh_content_key(mesh), fail_fast)
+            with self._lock:
+                if key in self._results:
+                    self._results.move_to_end(key)
+                    errors, self.last_faces = self._results[key]
+                    self.last_timings = {}
+                    return list(errors)
+
+        if self.workers > 1 and len(self.checks) > 1:
+            results = self._run_threaded(mesh, fail_fast)
+        else:
+            results = self._run_serial(mesh, fail_fast)
+        errors = [e for check in self.checks for e in results.get(check.name, ([], None))[0]]
+        self.last_faces = {
+            name: faces for name, (_, faces) in results.items() if len(faces)
+        }
+
+        if key is not None:
+            with self._lock:
+                self._results[key] = (tuple(errors), self.last_faces)
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+        return errors
+
+    def _timed(self, check: Check, mesh: tm.Trimesh):
+        start = time.perf_counter()
+        with span(f"check.{check.name}") as s:
+            result = check(mesh)
+            s.set(failed=bool(result[0]))
+        return result, time.perf_counter() - start
+
+    def _record(self, timings: Dict[str, float]) -> None:
+        self.last_timings = timings
+        for name, seconds in timings.items():
+            self.total_timings[name] = self.total_timings.get(name, 0.0) + seconds
+
+    def _run_serial(self, mesh, fail_fast: bool) -> Dict[str, tuple]:
+        results: Dict[str, tuple] = {}
+        timings: Dict[str, float] = {}
+        for check in self.checks:
+            results[check.name], timings[check.name] = self._timed(check, mesh)
+            if fail_fast and results[check.name][0]:
+                break
+        self._record(timings)
+        return results
+
+    def _run_threaded(self, mesh, fail_fast: bool) -> Dict[str, tuple]:
+        results: Dict[str, tuple] = {}
+        timings: Dict[str, float] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._timed, c, mesh): c for c in self.checks}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    check = pending.pop(future)
+                    results[check.name], timings[check.name] = future.result()
+                if fail_fast and any(errors for errors, _ in results.values()):
+                    for future in pending:
+                        future.cancel()
+                    break
+        self._record(timings)
+        return results
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._results.clear()
+
     def validate_file(self, file_path: str | Path) -> List[str]:
         mesh = tm.load(file_path)
         return self.validate_mesh(mesh)
 
 
-__all__ = ["PrintabilityValidator"]
+__all__ = ["Check", "compile_rules", "load_rules", "PrintabilityValidator"]
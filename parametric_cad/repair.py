@@ -0,0 +1,398 @@
+"""Watertight repair for meshes headed to the printer.
+
+:func:`repair_mesh` runs a fixed sequence of steps, each working on the
+whole face array at once:
+
+``merge``       weld vertices closer than ``tolerance``
+``degenerate``  drop faces with repeated vertices or no area
+``duplicate``   drop faces using the same three vertices as another
+``winding``     make neighbouring faces agree on their orientation
+``stitch``      close boundary loops with triangle fans
+``normals``     turn every closed shell outwards
+``remesh``      voxel remesh, only if the mesh is still open
+
+The time spent in each step and what it changed are returned in a
+:class:`RepairReport`.  A convex hull is never substituted for the part
+unless ``allow_hull`` is set, because it silently removes bores and
+pockets.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .core import lazy_module, tm
+from .tracing import traced
+
+# scipy is only needed once a mesh actually has to be repaired
+sparse = lazy_module("scipy.sparse")
+csgraph = lazy_module("scipy.sparse.csgraph")
+
+# Faces smaller than this many square mm count as degenerate
+MIN_FACE_AREA = 1e-12
+
+
+@dataclass
+class RepairReport:
+    """What :func:`repair_mesh` did, with seconds per step in ``steps``."""
+
+    steps: Dict[str, float] = field(default_factory=dict)
+    merged_vertices: int = 0
+    degenerate_faces: int = 0
+    duplicate_faces: int = 0
+    flipped_faces: int = 0
+    holes_filled: int = 0
+    remeshed: bool = False
+    hull: bool = False
+    watertight: bool = False
+
+
+@contextmanager
+def _step(report: RepairReport, name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        report.steps[name] = time.perf_counter() - start
+
+
+def merge_vertices(
+    vertices: np.ndarray, faces: np.ndarray, tolerance: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Weld vertices that round to the same ``tolerance`` grid point."""
+
+    keys = np.round(vertices / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    return vertices[first], inverse.reshape(-1)[faces]
+
+
+def degenerate_faces(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Return a mask of faces with repeated vertices or no area."""
+
+    repeated = (
+        (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 0] == faces[:, 2])
+    )
+    tris = vertices[faces]
+    area = np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1) / 2
+    return repeated | (area < MIN_FACE_AREA)
+
+
+def duplicate_faces(faces: np.ndarray) -> np.ndarray:
+    """Return a mask of faces repeating an earlier face's vertices."""
+
+    ordered = np.sort(faces, axis=1)
+    order = np.lexsort(ordered.T[::-1])
+    rows = ordered[order]
+    repeat = np.r_[False, np.all(rows[1:] == rows[:-1], axis=1)]
+    duplicate = np.zeros(len(faces), dtype=bool)
+    duplicate[order[repeat]] = True
+    return duplicate
+
+
+def _edge_keys(faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the directed edges of ``faces`` and one integer key per edge."""
+
+    directed = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    low = directed.min(axis=1)
+    high = directed.max(axis=1)
+    return directed, low * (int(faces.max()) + 1) + high
+
+
+def _edge_pairs(faces: np.ndarray):
+    """Return faces sharing each manifold edge and whether they disagree.
+
+    Two faces agree when they traverse their shared edge in opposite
+    directions.
+    """
+
+    directed, keys = _edge_keys(faces)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+    first = starts[counts == 2]
+    pairs = np.column_stack([order[first], order[first + 1]])
+    same_direction = directed[pairs[:, 0], 0] == directed[pairs[:, 1], 0]
+    return pairs // 3, same_direction
+
+
+def consistent_winding(faces: np.ndarray) -> np.ndarray:
+    """Return a mask of faces to flip so every shell is wound consistently.
+
+    A breadth first tree is grown over the face adjacency of every
+    shell; a face must flip when the number of disagreeing edges on its
+    path to the root is odd.  The parities are accumulated by pointer
+    jumping, so the work is a handful of array passes.
+    """
+
+    count = len(faces)
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+    pairs, disagree = _edge_pairs(faces)
+    weight = np.ones(2 * len(pairs), dtype=np.int8)
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    _, labels = csgraph.connected_components(
+        sparse.coo_matrix((weight, (rows, cols)), shape=(count, count)), directed=False
+    )
+    # a virtual root joined to one face of every shell
+    root = count
+    _, firsts = np.unique(labels, return_index=True)
+    rows = np.concatenate([rows, np.full(len(firsts), root), firsts])
+    cols = np.concatenate([cols, firsts, np.full(len(firsts), root)])
+    weight = np.ones(len(rows), dtype=np.int8)
+    graph = sparse.coo_matrix((weight, (rows, cols)), shape=(count + 1, count + 1)).tocsr()
+    _, parent = csgraph.breadth_first_order(graph, root, directed=False)
+
+    # parity of the tree edge from every face to its parent
+    parity = np.zeros(count + 1, dtype=np.int8)
+    child = np.flatnonzero(parent[:count] != root)
+    a, b = parent[child], child
+    key = np.minimum(a, b) * (count + 1) + np.maximum(a, b)
+    pair_key = pairs.min(axis=1) * (count + 1) + pairs.max(axis=1)
+    by_key = np.argsort(pair_key)
+    found = by_key[np.searchsorted(pair_key, key, sorter=by_key)]
+    parity[child] = disagree[found]
+    ancestor = np.append(parent[:count], root)
+    ancestor[ancestor < 0] = root
+    while np.any(ancestor[:count] != root):
+        parity = parity ^ parity[ancestor]
+        ancestor = ancestor[ancestor]
+    flip = parity[:count].astype(bool)
+    # flip the smaller side of every shell; orientation is settled later
+    shell_size = np.bincount(labels)
+    flip ^= (np.bincount(labels, flip) * 2 > shell_size)[labels]
+    return flip
+
+
+def boundary_loops(faces: np.ndarray) -> List[List[int]]:
+    """Return the closed loops of edges used by only one face.
+
+    Each loop follows the direction of its faces' edges.
+    """
+
+    directed, keys = _edge_keys(faces)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    open_edges = directed[counts[inverse] == 1]
+    outgoing: Dict[int, List[int]] = {}
+    for a, b in open_edges.tolist():
+        outgoing.setdefault(a, []).append(b)
+
+    loops = []
+    while outgoing:
+        start = next(iter(outgoing))
+        loop = [start]
+        current = start
+        while True:
+            targets = outgoing.get(current)
+            if not targets:
+                loop = None
+                break
+            nxt = targets.pop()
+            if not targets:
+                del outgoing[current]
+            if nxt == start:
+                break
+            loop.append(nxt)
+            current = nxt
+        if loop is not None and len(loop) >= 3:
+            loops.append(loop)
+    return loops
+
+
+def stitch_loops(
+    vertices: np.ndarray, faces: np.ndarray, loops: List[List[int]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Close every loop with a fan around its centroid."""
+
+    new_vertices = [vertices]
+    new_faces = [faces]
+    next_index = len(vertices)
+    for loop in loops:
+        ring = np.asarray(loop)
+        if len(ring) == 3:
+            new_faces.append(ring[::-1][None, :])
+            continue
+        new_vertices.append(vertices[ring].mean(axis=0)[None, :])
+        # patch faces run each boundary edge backwards
+        fan = np.column_stack([np.roll(ring, -1), ring, np.full(len(ring), next_index)])
+        new_faces.append(fan)
+        next_index += 1
+    return np.concatenate(new_vertices), np.concatenate(new_faces)
+
+
+def outward_shells(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Return a mask of faces in shells whose signed volume is negative."""
+
+    if len(faces) == 0:
+        return np.zeros(0, dtype=bool)
+    pairs, _ = _edge_pairs(faces)
+    graph = sparse.coo_matrix(
+        (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(len(faces), len(faces)),
+    )
+    _, labels = csgraph.connected_components(graph, directed=False)
+    tris = vertices[faces]
+    signed = np.einsum("ij,ij->i", tris[:, 0], np.cross(tris[:, 1], tris[:, 2]))
+    volume = np.bincount(labels, signed)
+    return volume[labels] < 0
+
+
+def voxel_remesh(mesh: tm.Trimesh, pitch: Optional[float] = None) -> tm.Trimesh:
+    """Rebuild ``mesh`` as the closed surface of its filled voxels.
+
+    ``pitch`` defaults to a hundredth of the largest extent.  Cells
+    touching only along an edge are bridged so every edge of the result
+    is shared by exactly two faces.
+    """
+
+    if pitch is None:
+        pitch = float(np.max(mesh.extents)) / 100.0
+    grid = mesh.voxelized(pitch).fill()
+    filled = np.pad(grid.matrix.astype(bool), 1)
+
+    # bridge cells that meet only along an edge
+    for _ in range(16):
+        changed = False
+        for axes in ((0, 1), (1, 2), (0, 2)):
+            view = np.moveaxis(filled, axes, (0, 1))
+            a, b = view[:-1, :-1], view[1:, :-1]
+            c, d = view[:-1, 1:], view[1:, 1:]
+            first = a & d & ~b & ~c
+            second = b & c & ~a & ~d
+            if first.any() or second.any():
+                b |= first
+                c |= first
+                a |= second
+                d |= second
+                changed = True
+        if not changed:
+            break
+
+    shape = np.array(filled.shape) + 1
+    corners = np.array([[0, 0], [1, 0], [1, 1], [0, 1]])
+    quads = []
+    for axis in range(3):
+        # cells either side of every lattice plane normal to ``axis``
+        moved = np.moveaxis(filled, axis, 0)
+        face = moved[1:] != moved[:-1]
+        outward = moved[:-1][face]
+        index = np.argwhere(face)
+        index[:, 0] += 1
+        points = np.repeat(index[:, None, :], 4, axis=1)
+        points[:, :, 1:] += corners
+        # the corners wind around +axis when (axis, rest) is a cyclic order
+        order = [axis] + [i for i in range(3) if i != axis]
+        if axis == 1:
+            points = points[:, ::-1]
+        points = np.where(outward[:, None, None], points, points[:, ::-1])
+        xyz = np.empty_like(points)
+        xyz[:, :, order] = points
+        quads.append(xyz)
+    quads = np.concatenate(quads)
+    flat = np.ravel_multi_index(quads.reshape(-1, 3).T, shape)
+    ids, inverse = np.unique(flat, return_inverse=True)
+    lattice = np.column_stack(np.unravel_index(ids, shape)).astype(np.float64)
+    quad_index = inverse.reshape(-1, 4)
+    faces = np.concatenate([quad_index[:, [0, 1, 2]], quad_index[:, [0, 2, 3]]])
+    # lattice point i is the low corner of padded cell i, centre of grid cell i - 1
+    vertices = tm.transformations.transform_points(lattice - 1.5, grid.transform)
+    return tm.Trimesh(vertices, faces, process=False)
+
+
+@traced()
+def repair_mesh(
+    mesh: tm.Trimesh,
+    *,
+    tolerance: float = 1e-6,
+    remesh: bool = True,
+    voxel_pitch: Optional[float] = None,
+    allow_hull: bool = False,
+) -> Tuple[tm.Trimesh, RepairReport]:
+    """Return a repaired copy of ``mesh`` and a :class:`RepairReport`.
+
+    Parameters
+    ----------
+    mesh:
+        Mesh to repair; it is not modified.
+    tolerance:
+        Vertices closer than this (mm) are welded together.
+    remesh:
+        Voxel remesh the part when the other steps leave it open.
+    voxel_pitch:
+        Voxel size of the remesh, see :func:`voxel_remesh`.
+    allow_hull:
+        As the very last resort return the convex hull.  Off by default
+        because the hull silently fills bores and pockets.
+    """
+
+    report = RepairReport()
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    if len(faces) == 0:
+        return mesh.copy(), report
+
+    with _step(report, "merge"):
+        before = len(vertices)
+        vertices, faces = merge_vertices(vertices, faces, tolerance)
+        report.merged_vertices = before - len(vertices)
+    with _step(report, "degenerate"):
+        bad = degenerate_faces(vertices, faces)
+        faces = faces[~bad]
+        report.degenerate_faces = int(bad.sum())
+    with _step(report, "duplicate"):
+        bad = duplicate_faces(faces)
+        faces = faces[~bad]
+        report.duplicate_faces = int(bad.sum())
+    with _step(report, "winding"):
+        flip = consistent_winding(faces)
+        faces[flip] = faces[flip][:, ::-1]
+        report.flipped_faces = int(flip.sum())
+    with _step(report, "stitch"):
+        loops = boundary_loops(faces)
+        if loops:
+            vertices, faces = stitch_loops(vertices, faces, loops)
+        report.holes_filled = len(loops)
+    with _step(report, "normals"):
+        flip = outward_shells(vertices, faces)
+        faces[flip] = faces[flip][:, ::-1]
+        report.flipped_faces += int(flip.sum())
+
+    result = tm.Trimesh(vertices, faces, process=False)
+    result.remove_unreferenced_vertices()
+    report.watertight = bool(result.is_watertight)
+
+    if not report.watertight and remesh and len(result.faces):
+        with _step(report, "remesh"):
+            remeshed = voxel_remesh(mesh, voxel_pitch)
+        if remeshed.is_watertight:
+            result, report.remeshed, report.watertight = remeshed, True, True
+
+    if not report.watertight and allow_hull:
+        with _step(report, "hull"):
+            result = mesh.convex_hull
+        report.hull, report.watertight = True, bool(result.is_watertight)
+
+    if not report.watertight:
+        logging.warning("Mesh repair could not make the mesh watertight")
+    return result, report
+
+
+__all__ = [
+    "RepairReport",
+    "repair_mesh",
+    "merge_vertices",
+    "degenerate_faces",
+    "duplicate_faces",
+    "consistent_winding",
+    "boundary_loops",
+    "stitch_loops",
+    "outward_shells",
+    "voxel_remesh",
+]
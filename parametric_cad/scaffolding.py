@@ -1,10 +1,183 @@
 from __future__ import annotations
 
+from typing import Tuple
+
 import numpy as np
 
 from .core import tm
+from .patterns import instance_mesh
+from .spatial import triangle_index
+from .tracing import traced
+
+SCAFFOLD_MODES = ("columns", "tree")
+
+
+def overhang_points(mesh: tm.Trimesh, max_angle_deg: float = 45.0) -> np.ndarray:
+    """Return the centres of faces overhanging more than ``max_angle_deg``."""
+
+    normals = mesh.face_normals
+    centers = mesh.triangles_center
+    min_z = float(mesh.bounds[0, 2])
+    angles = np.degrees(np.arccos(np.clip(normals[:, 2], -1.0, 1.0)))
+    overhang = (angles > 90.0 + max_angle_deg) & (centers[:, 2] > min_z + 1e-6)
+    return centers[overhang]
+
+
+def cluster_points(
+    pts: np.ndarray, grid_size: float, snap_to_grid: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Group ``pts`` into XY grid cells and return one support per cell.
+
+    The highest point of every occupied cell is found in one
+    ``np.maximum.at`` reduction over integer cell keys; its XY position
+    and Z are returned.  With ``snap_to_grid`` the XY position is the
+    cell centre instead, as in earlier releases; a centre can lie beside
+    the overhang it is meant to support.
+    ``grid_size`` of ``0`` keeps every point as its own cell.
+    """
+
+    if grid_size <= 0:
+        return pts[:, :2], pts[:, 2]
+    cells = np.round(pts[:, :2] / grid_size)
+    ij = cells.astype(np.int64)
+    ij -= ij.min(axis=0)
+    keys = ij[:, 0] * (ij[:, 1].max() + 1) + ij[:, 1]
+    _, inverse = np.unique(keys, return_inverse=True)
+    top_z = np.full(inverse.max() + 1, -np.inf)
+    np.maximum.at(top_z, inverse, pts[:, 2])
+    xy = np.empty((len(top_z), 2))
+    if snap_to_grid:
+        xy[inverse] = cells * grid_size
+        return xy, top_z
+    # position of (one of) the highest points in each cell
+    highest = np.nonzero(pts[:, 2] == top_z[inverse])[0]
+    cell_of, first = np.unique(inverse[highest], return_index=True)
+    xy[cell_of] = pts[highest[first], :2]
+    return xy, top_z
+
+
+def support_floor(mesh: tm.Trimesh, xy: np.ndarray, top_z: np.ndarray) -> np.ndarray:
+    """Return the Z each support column should stand on.
+
+    A ray is cast straight down from every column top.  Columns land on
+    the first upward facing surface they meet; columns that reach the
+    bed, or start inside material, go down to the bottom of the mesh.
+    """
+
+    min_z = float(mesh.bounds[0, 2])
+    origins = np.column_stack([xy, top_z - 1e-6])
+    directions = np.tile([0.0, 0.0, -1.0], (len(xy), 1))
+    distance, face = triangle_index(mesh).raycast(origins, directions)
+    floor = np.full(len(xy), min_z)
+    landed = (face >= 0) & (mesh.face_normals[np.maximum(face, 0), 2] > 0)
+    floor[landed] = origins[landed, 2] - distance[landed]
+    return floor
+
+
+def segment_transforms(
+    start: np.ndarray, end: np.ndarray, radius: np.ndarray
+) -> np.ndarray:
+    """Return transforms mapping a unit cylinder onto segments.
+
+    The template is a radius 1 cylinder from ``z=0`` to ``z=1``; each
+    transform rotates its axis onto ``end - start``, scales it to the
+    segment length and ``radius`` and moves its base to ``start``.
+    """
 
+    vec = end - start
+    length = np.linalg.norm(vec, axis=1)
+    d = vec / np.maximum(length, 1e-12)[:, None]
+    # Rodrigues rotation taking +Z onto d
+    x, y, z = d[:, 0], d[:, 1], d[:, 2]
+    k = np.zeros((len(d), 3, 3))
+    k[:, 0, 2], k[:, 1, 2] = x, y
+    k[:, 2, 0], k[:, 2, 1] = -x, -y
+    scale = np.where(z > -1 + 1e-9, 1.0 / (1.0 + np.maximum(z, -1 + 1e-9)), 0.0)
+    rot = np.eye(3) + k + (k @ k) * scale[:, None, None]
+    rot[z <= -1 + 1e-9] = np.diag([1.0, -1.0, -1.0])
 
+    transforms = np.tile(np.eye(4), (len(d), 1, 1))
+    transforms[:, :3, :3] = rot * np.stack([radius, radius, length], axis=1)[:, None, :]
+    transforms[:, :3, 3] = start
+    return transforms
+
+
+def _tree_segments(
+    mesh: tm.Trimesh,
+    xy: np.ndarray,
+    top_z: np.ndarray,
+    branch_angle_deg: float,
+    trunk_spacing: float,
+    to_surface: bool,
+    support_radius: float,
+    trunk_radius: float,
+):
+    """Lay out branches, trunks and columns for the tree support mode.
+
+    Contacts are grouped on a ``trunk_spacing`` grid; each trunk stands at
+    the mean position of its contacts and rises to the lowest point its
+    branches can reach without exceeding ``branch_angle_deg`` from
+    vertical.  A group keeps plain columns when its trunk would end below
+    the floor or would use more material than the columns.
+
+    Returns ``(start, end, radius)`` arrays for the branches, the trunks
+    and the columns.
+    """
+
+    min_z = float(mesh.bounds[0, 2])
+    tan = np.tan(np.radians(branch_angle_deg))
+    ij = np.round(xy / trunk_spacing).astype(np.int64)
+    ij -= ij.min(axis=0)
+    keys = ij[:, 0] * (ij[:, 1].max() + 1) + ij[:, 1]
+    _, trunk_of = np.unique(keys, return_inverse=True)
+    count = np.bincount(trunk_of)
+    trunk_xy = np.column_stack(
+        [np.bincount(trunk_of, xy[:, i]) / count for i in range(2)]
+    )
+    # trunks keep the cross-section of the branches they carry, up to the limit
+    radius = np.minimum(support_radius * np.sqrt(count), trunk_radius)
+
+    reach = np.linalg.norm(xy - trunk_xy[trunk_of], axis=1)
+    junction = top_z - reach / tan
+    trunk_top = np.full(len(count), np.inf)
+    np.minimum.at(trunk_top, trunk_of, junction)
+    if to_surface:
+        floor = support_floor(mesh, trunk_xy, trunk_top)
+        column_floor = support_floor(mesh, xy, top_z)
+    else:
+        floor = np.full(len(count), min_z)
+        column_floor = np.full(len(xy), min_z)
+
+    # material per group, in units of pi * length * radius^2
+    branch_length = np.hypot(reach, top_z - trunk_top[trunk_of])
+    tree_cost = (trunk_top - floor) * radius**2 + np.bincount(
+        trunk_of, branch_length * support_radius**2, len(count)
+    )
+    column_cost = np.bincount(trunk_of, (top_z - column_floor) * support_radius**2, len(count))
+    tree = (trunk_top > floor) & (tree_cost < column_cost)
+
+    branched = tree[trunk_of] & (branch_length > 1e-9)
+    t = trunk_of[branched]
+    branches = (
+        np.column_stack([trunk_xy[t], trunk_top[t]]),
+        np.column_stack([xy[branched], top_z[branched]]),
+        np.full(len(t), support_radius),
+    )
+    trunks = (
+        np.column_stack([trunk_xy[tree], floor[tree]]),
+        np.column_stack([trunk_xy[tree], trunk_top[tree]]),
+        radius[tree],
+    )
+    loose = ~tree[trunk_of]
+    columns = (
+        np.column_stack([xy[loose], column_floor[loose]]),
+        np.column_stack([xy[loose], top_z[loose]]),
+        np.full(int(loose.sum()), support_radius),
+    )
+    return branches, trunks, columns
+
+
+@traced()
 def generate_scaffolding(
     mesh: tm.Trimesh,
     *,
@@ -12,6 +185,13 @@ def generate_scaffolding(
     support_radius: float = 0.5,
     grid_size: float = 5.0,
     sections: int = 8,
+    to_surface: bool = True,
+    mode: str = "columns",
+    branch_angle_deg: float | None = None,
+    trunk_spacing: float | None = None,
+    trunk_radius: float | None = None,
+    max_triangles: int | None = None,
+    snap_to_grid: bool = False,
 ) -> tm.Trimesh:
     """Return support scaffolding for downward overhangs of ``mesh``.
 
@@ -27,42 +207,91 @@ def generate_scaffolding(
         Grid spacing for clustering support columns. ``0`` disables clustering.
     sections:
         Number of cylinder sections used to generate the columns.
+    to_surface:
+        Stop columns at the first surface below the overhang instead of
+        always extending them to the bottom of the mesh.
+    mode:
+        ``"columns"`` for one vertical column per contact or ``"tree"``
+        to join nearby contacts onto shared trunks with angled branches.
+    branch_angle_deg:
+        Tree mode: maximum branch angle from vertical, defaults to
+        ``max_angle_deg`` so branches themselves print without support.
+    trunk_spacing:
+        Tree mode: grid spacing used to gather contacts onto one trunk,
+        defaults to three times ``grid_size``.
+    trunk_radius:
+        Tree mode: largest trunk radius, defaults to twice
+        ``support_radius``.  Trunks grow with the number of branches
+        they carry up to this limit.
+    max_triangles:
+        Upper bound on the triangle count of the result.  Every column,
+        branch and trunk is one cylinder of ``4 * sections`` triangles;
+        the clustering grid is coarsened until the supports fit.
+    snap_to_grid:
+        Place each support at the centre of its ``grid_size`` cell, the
+        behaviour of earlier releases, instead of under the highest
+        overhang point of the cell.
     """
-    normals = mesh.face_normals
-    centers = mesh.triangles_center
-    min_z = float(mesh.bounds[0, 2])
-
-    angles = np.degrees(np.arccos(np.clip(normals[:, 2], -1.0, 1.0)))
-    overhang = (angles > 90.0 + max_angle_deg) & (centers[:, 2] > min_z + 1e-6)
-    if not np.any(overhang):
+    if mode not in SCAFFOLD_MODES:
+        raise ValueError(f"Unknown scaffolding mode {mode!r}; expected one of {SCAFFOLD_MODES}")
+    angle = branch_angle_deg if branch_angle_deg is not None else max_angle_deg
+    if angle > max_angle_deg:
+        raise ValueError("branch_angle_deg must not exceed max_angle_deg")
+    pts = overhang_points(mesh, max_angle_deg)
+    if not len(pts):
         return tm.Trimesh()
 
-    pts = centers[overhang]
-    if grid_size > 0:
-        xy = np.round(pts[:, :2] / grid_size) * grid_size
-        unique_xy, inverse = np.unique(xy, axis=0, return_inverse=True)
-        top_z = np.zeros(len(unique_xy))
-        for i in range(len(unique_xy)):
-            top_z[i] = pts[inverse == i][:, 2].max()
-    else:
-        unique_xy = pts[:, :2]
-        top_z = pts[:, 2]
-
-    supports = []
-    for (x, y), z in zip(unique_xy, top_z):
-        height = z - min_z
-        if height <= 0:
-            continue
-        cyl = tm.creation.cylinder(
-            radius=support_radius, height=height, sections=sections
+    per_support = 4 * sections
+    # a tree needs at most a branch per contact plus a trunk per contact
+    per_contact = per_support * (2 if mode == "tree" else 1)
+    if max_triangles is not None and max_triangles < per_contact:
+        raise ValueError(f"max_triangles must be at least {per_contact}")
+    xy, top_z = cluster_points(pts, grid_size, snap_to_grid)
+    if max_triangles is not None:
+        span = float(np.ptp(pts[:, :2], axis=0).max())
+        step = grid_size if grid_size > 0 else max(span / 64.0, 1e-6)
+        while len(xy) * per_contact > max_triangles:
+            step *= 1.5
+            xy, top_z = cluster_points(pts, step, snap_to_grid)
+        grid_size = max(grid_size, step)
+    # One unit cylinder from z=0 to z=1 instanced for every support
+    template = tm.creation.cylinder(radius=1.0, height=1.0, sections=sections)
+    template.apply_translation([0, 0, 0.5])
+
+    if mode == "tree":
+        spacing = trunk_spacing if trunk_spacing is not None else 3.0 * (grid_size or 5.0)
+        limit = trunk_radius if trunk_radius is not None else 2.0 * support_radius
+        segments = _tree_segments(
+            mesh, xy, top_z, angle, spacing, to_surface, support_radius, limit
         )
-        cyl.apply_translation([0, 0, height / 2])
-        cyl.apply_translation([x, y, min_z])
-        supports.append(cyl)
+        transforms = np.concatenate([segment_transforms(*part) for part in segments])
+        keep = np.abs(np.linalg.det(transforms[:, :3, :3])) > 1e-12
+        if not np.any(keep):
+            return tm.Trimesh()
+        return instance_mesh(template, transforms[keep])
 
-    if not supports:
+    if to_surface:
+        floor = support_floor(mesh, xy, top_z)
+    else:
+        floor = np.full(len(xy), float(mesh.bounds[0, 2]))
+    height = top_z - floor
+    keep = height > 0
+    if not np.any(keep):
         return tm.Trimesh()
-    return tm.util.concatenate(supports)
+
+    transforms = np.tile(np.eye(4), (int(keep.sum()), 1, 1))
+    transforms[:, 0, 0] = transforms[:, 1, 1] = support_radius
+    transforms[:, 2, 2] = height[keep]
+    transforms[:, :2, 3] = xy[keep]
+    transforms[:, 2, 3] = floor[keep]
+    return instance_mesh(template, transforms)
 
 
-__all__ = ["generate_scaffolding"]
+__all__ = [
+    "SCAFFOLD_MODES",
+    "generate_scaffolding",
+    "overhang_points",
+    "cluster_points",
+    "support_floor",
+    "segment_transforms",
+]
@@ -0,0 +1,901 @@
+"""Interactive design server: part specs in, STL or GLB bytes out.
+
+A long-running local service for configurators and editors that rebuild
+a part every time a slider moves.  Geometry runs on a
+:class:`~concurrent.futures.ProcessPoolExecutor` whose workers are warmed
+up on start (backends imported, a gear and a sprocket built and encoded)
+and keep their :class:`~parametric_cad.cache.MeshCache` and the shared
+gear/sprocket pieces of :mod:`parametric_cad.sweep` between requests.
+The event loop itself never touches NumPy or trimesh.
+
+Run it with ``python -m parametric_cad.server --port 8765 --workers 2``.
+
+HTTP endpoints:
+
+``POST /build``
+    Body is a part spec, the same fields as a batch manifest entry plus
+    the output format::
+
+        {"class": "SpurGear", "params": {"module": 1.0, "teeth": 24},
+         "format": "stl", "session": "editor-1"}
+
+    Returns the binary STL (``model/stl``) or GLB (``model/gltf-binary``)
+    bytes.  The ``ETag`` identifies the spec, so a client that already
+    holds the mesh gets ``304`` from ``If-None-Match`` without a build.
+``GET /metrics``
+    JSON counters and end-to-end and worker latency percentiles.
+``GET /health``
+    ``{"status": "ok"}``.
+
+``GET /ws`` upgrades to a WebSocket that acts as one session.  Each text
+message is a JSON spec (``"id"`` is echoed back); each reply is a JSON
+text message with ``"status"`` -- ``ok`` (followed by one binary message
+holding the mesh), ``unchanged`` (the last mesh sent on this socket is
+still current), ``superseded`` or ``error``.
+
+Requests of one session are debounced: a build starts only after
+``debounce`` seconds without a newer request, and a newer request
+supersedes any older one still waiting or building.  A superseded build
+still queued on the pool is cancelled; one already running on a worker
+finishes there but its result is dropped.  Identical specs in flight at
+the same time share one build.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import struct
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Slider events closer together than this collapse into one build
+DEFAULT_DEBOUNCE = 0.05
+# Latency samples kept for the percentiles on /metrics
+METRICS_WINDOW = 10000
+# Largest request body or WebSocket message accepted, in bytes
+MAX_MESSAGE = 1024 * 1024
+
+FORMATS = {"stl": "model/stl", "glb": "model/gltf-binary"}
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_REASONS = {
+    101: "Switching Protocols",
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class Superseded(Exception):
+    """Raised to a caller whose request was replaced by a newer one."""
+
+
+# -- jobs -------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Job:
+    """One build request: a part spec and the output format."""
+
+    cls: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    format: str = "stl"
+    at: Optional[Tuple[float, float, float]] = None
+    rotate: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        if not isinstance(data, dict):
+            raise ValueError("Part spec must be a JSON object")
+        name = data.get("class")
+        if not isinstance(name, str) or not name:
+            raise ValueError("Part spec is missing 'class'")
+        if ":" in name:
+            # "module:Class" would let a client import arbitrary modules
+            raise ValueError("Only parametric_cad part classes can be built")
+        params = data.get("params", {})
+        if not isinstance(params, dict):
+            raise ValueError("'params' must be an object")
+        fmt = data.get("format", "stl")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+        at = data.get("at")
+        if at is not None:
+            if not isinstance(at, (list, tuple)) or len(at) != 3:
+                raise ValueError("'at' must be [x, y, z]")
+            at = tuple(float(v) for v in at)
+        rotate = data.get("rotate")
+        if rotate is not None and (not isinstance(rotate, dict) or {"axis", "angle"} - set(rotate)):
+            raise ValueError("'rotate' must have 'axis' and 'angle'")
+        return cls(name, dict(params), fmt, at, rotate)
+
+    @property
+    def key(self) -> str:
+        """Content hash of the request; equal specs build equal bytes."""
+        blob = json.dumps(
+            [self.cls, self.params, self.format, self.at, self.rotate],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.key[:32]}"'
+
+
+# -- worker side --------------------------------------------------------------
+
+# Built once per worker so the first real request finds everything imported,
+# the gltf exporter loaded and the piece caches populated.
+_WARMUP = (
+    Job("SpurGear", {"module": 1.0, "teeth": 12}, "stl"),
+    Job("ChainSprocket", {"teeth": 12}, "glb"),
+)
+
+
+def _warm_worker(cache_bytes: Optional[int]) -> None:
+    """Process pool initializer."""
+
+    from .cache import configure_mesh_cache
+
+    if cache_bytes is not None:
+        configure_mesh_cache(cache_bytes)
+    for job in _WARMUP:
+        _render(job)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _part_mesh(part: Any):
+    """Mesh ``part``, serving the untransformed mesh from the mesh cache.
+
+    Misses go through :func:`parametric_cad.sweep.build_mesh`, so a gear
+    whose bore changed reuses the hub and teeth of the previous one.
+    """
+
+    from .cache import get_mesh_cache
+    from .primitives.base import Primitive
+    from .sweep import build_mesh
+    from .transform import IDENTITY
+
+    cache = get_mesh_cache()
+    if cache is None or not isinstance(part, Primitive):
+        return build_mesh(part)
+    base = cache.get_or_create(part.cache_key(), lambda: build_mesh(part.with_placement(IDENTITY)))
+    return part.placement.apply_to(base)
+
+
+def _encode(mesh: Any, fmt: str) -> bytes:
+    if fmt == "glb":
+        return mesh.export(file_type="glb")
+    from .export.stl_writer import write_stl_binary
+
+    buffer = io.BytesIO()
+    write_stl_binary(mesh, buffer)
+    return buffer.getvalue()
+
+
+def _render(job: Job) -> Tuple[bytes, float]:
+    """Worker entry point: return the encoded mesh and the seconds spent."""
+
+    from .batch import PartSpec, build_part, resolve_class
+    from .transform import Placeable
+
+    part_class = resolve_class(job.cls)
+    # resolve_class returns any package attribute; exporters and the like
+    # have side effects on construction
+    if not (isinstance(part_class, type) and issubclass(part_class, Placeable)):
+        raise ValueError(f"{job.cls!r} is not a part class")
+    start = time.perf_counter()
+    spec = PartSpec(job.cls, "", dict(job.params), job.at, job.rotate)
+    payload = _encode(_part_mesh(build_part(spec)), job.format)
+    return payload, time.perf_counter() - start
+
+
+# -- metrics ------------------------------------------------------------------
+
+
+class LatencyStats:
+    """Sliding window of latencies with nearest-rank percentiles."""
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        self.count = 0
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self._samples.append(seconds)
+
+    def percentiles(self, quantiles: Sequence[float] = (50, 90, 99)) -> Dict[str, float]:
+        """Return ``{"count", "p50", ..., "max"}`` in milliseconds."""
+        values = sorted(self._samples)
+        report: Dict[str, float] = {"count": self.count}
+        for q in quantiles:
+            if values:
+                rank = max(1, math.ceil(q / 100.0 * len(values)))
+                report[f"p{q:g}"] = round(values[rank - 1] * 1000.0, 3)
+            else:
+                report[f"p{q:g}"] = None
+        report["max"] = round(values[-1] * 1000.0, 3) if values else None
+        return report
+
+
+@dataclass
+class _InFlight:
+    job: Future
+    future: asyncio.Future
+    # the pool the job ran on; only its failure may restart the current one
+    executor: ProcessPoolExecutor
+    waiters: int = 0
+
+
+# -- scheduling ---------------------------------------------------------------
+
+
+class DesignService:
+    """Debounced, cancellable builds on a warm process pool.
+
+    Parameters
+    ----------
+    workers:
+        Worker processes, defaults to ``os.cpu_count()``.
+    debounce:
+        Seconds a session request waits for a newer one before building.
+    cache_bytes:
+        Memory budget of each worker's mesh cache; ``None`` keeps the
+        default (``PARAMETRIC_CAD_CACHE_MB`` or 256 MiB).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        *,
+        debounce: float = DEFAULT_DEBOUNCE,
+        cache_bytes: Optional[int] = None,
+    ) -> None:
+        if debounce < 0:
+            raise ValueError("debounce must not be negative")
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.debounce = debounce
+        self.cache_bytes = cache_bytes
+        self.latency = LatencyStats()
+        self.build_time = LatencyStats()
+        self.counters = {
+            "requests": 0,
+            "ok": 0,
+            "errors": 0,
+            "superseded": 0,
+            "cancelled": 0,
+            "abandoned": 0,
+            "coalesced": 0,
+            "not_modified": 0,
+        }
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, _InFlight] = {}
+        # session -> future resolved when the session's current request is superseded
+        self._sessions: Dict[str, asyncio.Future] = {}
+        self._started = time.monotonic()
+
+    async def start(self) -> None:
+        """Start the pool and wait until every worker is warm."""
+        if self._executor is not None:
+            return
+        self._executor = self._new_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers))
+        )
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_warm_worker, initargs=(self.cache_bytes,)
+        )
+
+    async def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, lambda: executor.shutdown(wait=True, cancel_futures=True))
+
+    async def build(self, job: Job, session: Optional[str] = None) -> bytes:
+        """Return the encoded mesh for ``job``.
+
+        Raises :class:`Superseded` when a newer request for the same
+        ``session`` arrives before this one is done.
+        """
+
+        start = time.perf_counter()
+        self.counters["requests"] += 1
+        superseded = self._claim(session)
+        try:
+            if superseded is not None and self.debounce > 0:
+                await asyncio.wait([superseded], timeout=self.debounce)
+                if superseded.done():
+                    raise Superseded
+            payload = await self._run(job, superseded)
+        except Superseded:
+            self.counters["superseded"] += 1
+            raise
+        except Exception:
+            self.counters["errors"] += 1
+            raise
+        finally:
+            if session is not None and self._sessions.get(session) is superseded:
+                del self._sessions[session]
+        self.counters["ok"] += 1
+        self.latency.add(time.perf_counter() - start)
+        return payload
+
+    def cancel(self, session: str) -> None:
+        """Supersede whatever ``session`` has waiting or building."""
+        current = self._sessions.pop(session, None)
+        if current is not None and not current.done():
+            current.set_result(None)
+
+    def not_modified(self) -> None:
+        """Count a request answered from the client's copy."""
+        self.counters["requests"] += 1
+        self.counters["not_modified"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "uptime_s": round(time.monotonic() - self._started, 3),
+            "workers": self.workers,
+            "debounce_ms": self.debounce * 1000.0,
+            "in_flight": len(self._inflight),
+            "sessions": len(self._sessions),
+            **self.counters,
+            "latency_ms": self.latency.percentiles(),
+            "build_ms": self.build_time.percentiles(),
+        }
+
+    def _claim(self, session: Optional[str]) -> Optional[asyncio.Future]:
+        if session is None:
+            return None
+        self.cancel(session)
+        current = asyncio.get_running_loop().create_future()
+        self._sessions[session] = current
+        return current
+
+    async def _run(self, job: Job, superseded: Optional[asyncio.Future]) -> bytes:
+        if self._executor is None:
+            raise RuntimeError("DesignService.start() has not been called")
+        key = job.key
+        entry = self._inflight.get(key)
+        if entry is None:
+            submitted = self._executor.submit(_render, job)
+            future = asyncio.wrap_future(submitted)
+            entry = self._inflight[key] = _InFlight(submitted, future, self._executor)
+            future.add_done_callback(lambda f: self._finished(key, entry))
+        else:
+            self.counters["coalesced"] += 1
+        entry.waiters += 1
+        try:
+            pending = [entry.future] if superseded is None else [entry.future, superseded]
+            await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if not entry.future.done():
+                raise Superseded
+            payload, _ = entry.future.result()
+            return payload
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.future.done():
+                # Only a job no worker has picked up yet can be cancelled; a
+                # running one finishes and stays joinable until it does.
+                if entry.job.cancel():
+                    self.counters["cancelled"] += 1
+                else:
+                    self.counters["abandoned"] += 1
+
+    def _finished(self, key: str, entry: _InFlight) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+        future = entry.future
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self.build_time.add(future.result()[1])
+        elif isinstance(error, BrokenProcessPool) and entry.executor is self._executor:
+            # a crashed worker breaks the whole pool; later requests get a
+            # new one.  Every job of the broken pool fails, but only the
+            # first to report restarts it.
+            logging.error("Design server worker died; restarting the pool")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+
+
+# -- HTTP and WebSocket plumbing ----------------------------------------------
+
+
+@dataclass
+class _Request:
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes = b""
+
+
+class _ProtocolError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Read a start line and headers; ``None`` at a clean end of stream."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise _ProtocolError(400, "truncated request") from None
+    except asyncio.LimitOverrunError:
+        raise _ProtocolError(413, "headers too large") from None
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[_Request]:
+    head = await _read_head(reader)
+    if head is None:
+        return None
+    start_line, headers = head
+    try:
+        method, target, _ = start_line.split(" ", 2)
+    except ValueError:
+        raise _ProtocolError(400, f"bad request line {start_line!r}") from None
+    try:
+        length = int(headers.get("content-length") or 0)
+        if length < 0:
+            raise ValueError(length)
+    except ValueError:
+        raise _ProtocolError(400, "bad Content-Length") from None
+    if length > MAX_MESSAGE:
+        raise _ProtocolError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return _Request(method.upper(), urlsplit(target).path, headers, body)
+
+
+def _response(status: int, body: bytes = b"", content_type: str = "application/json", **headers: str) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+    if status != 101:
+        lines.append(f"Content-Length: {len(body)}")
+        if body:
+            lines.append(f"Content-Type: {content_type}")
+    lines.extend(f"{name.replace('_', '-')}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _json(data: Any) -> bytes:
+    return json.dumps(data).encode("utf-8")
+
+
+def _accept_key(key: str) -> str:
+    digest = hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+_TEXT, _BINARY, _CLOSE, _PING, _PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+
+def _mask(payload: bytes, mask: bytes) -> bytes:
+    n = len(payload)
+    if not n:
+        return payload
+    key = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+
+
+def _frame(opcode: int, payload: bytes, mask: bool = False) -> bytes:
+    """Encode one final WebSocket frame; clients must set ``mask``."""
+    n = len(payload)
+    bit = 0x80 if mask else 0
+    if n < 126:
+        head = struct.pack("!BB", 0x80 | opcode, bit | n)
+    elif n < 1 << 16:
+        head = struct.pack("!BBH", 0x80 | opcode, bit | 126, n)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, bit | 127, n)
+    if mask:
+        key = os.urandom(4)
+        return head + key + _mask(payload, key)
+    return head + payload
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[bool, int, bytes]:
+    b1, b2 = await reader.readexactly(2)
+    n = b2 & 0x7F
+    if n == 126:
+        (n,) = struct.unpack("!H", await reader.readexactly(2))
+    elif n == 127:
+        (n,) = struct.unpack("!Q", await reader.readexactly(8))
+    if n > MAX_MESSAGE:
+        raise _ProtocolError(413, "message too large")
+    key = await reader.readexactly(4) if b2 & 0x80 else None
+    payload = await reader.readexactly(n)
+    return bool(b1 & 0x80), b1 & 0x0F, _mask(payload, key) if key else payload
+
+
+async def _read_message(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, mask: bool = False
+) -> Tuple[int, bytes]:
+    """Return the next data message, answering pings on the way."""
+    opcode, parts = None, []
+    while True:
+        fin, op, payload = await _read_frame(reader)
+        if op == _PING:
+            writer.write(_frame(_PONG, payload, mask=mask))
+            continue
+        if op == _PONG:
+            continue
+        if op == _CLOSE:
+            return _CLOSE, payload
+        if op != 0:
+            opcode, parts = op, []
+        parts.append(payload)
+        if sum(map(len, parts)) > MAX_MESSAGE:
+            raise _ProtocolError(413, "message too large")
+        if fin and opcode is not None:
+            return opcode, b"".join(parts)
+
+
+class DesignServer:
+    """HTTP and WebSocket front end of a :class:`DesignService`."""
+
+    def __init__(
+        self,
+        service: Optional[DesignService] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+    ) -> None:
+        self.service = service or DesignService()
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._connections: set = set()
+        self._sockets = 0
+
+    async def start(self) -> "DesignServer":
+        """Warm the workers and start listening; ``port=0`` picks a free port."""
+        await self.service.start()
+        self._server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"Design server listening on http://{self.host}:{self.port}")
+        return self
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self.service.close()
+
+    async def __aenter__(self) -> "DesignServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except _ProtocolError as e:
+                    writer.write(_response(e.status, _json({"error": str(e)}), Connection="close"))
+                    break
+                if request is None:
+                    break
+                if request.headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(request, reader, writer)
+                    break
+                writer.write(await self._route(request))
+                await writer.drain()
+                if request.headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _route(self, request: _Request) -> bytes:
+        if request.path == "/health":
+            return _response(200, _json({"status": "ok"}))
+        if request.path == "/metrics":
+            return _response(200, _json(self.service.metrics()))
+        if request.path != "/build":
+            return _response(404, _json({"error": f"no such endpoint {request.path}"}))
+        if request.method != "POST":
+            return _response(405, _json({"error": "use POST"}), Allow="POST")
+        try:
+            data = json.loads(request.body or b"null")
+            job = Job.from_dict(data)
+        except ValueError as e:
+            return _response(400, _json({"error": str(e)}))
+        if request.headers.get("if-none-match") == job.etag:
+            self.service.not_modified()
+            return _response(304, ETag=job.etag)
+        session = data.get("session") or request.headers.get("x-session")
+        try:
+            payload = await self.service.build(job, session)
+        except Superseded:
+            return _response(409, _json({"status": "superseded"}))
+        except (ValueError, TypeError, KeyError) as e:
+            return _response(400, _json({"error": f"{type(e).__name__}: {e}"}))
+        except Exception as e:
+            logging.exception(f"Build of {job.cls} failed")
+            return _response(500, _json({"error": f"{type(e).__name__}: {e}"}))
+        return _response(200, payload, FORMATS[job.format], ETag=job.etag)
+
+    async def _websocket(self, request: _Request, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        key = request.headers.get("sec-websocket-key")
+        if request.path != "/ws" or not key:
+            writer.write(_response(400, _json({"error": "WebSocket upgrades go to /ws"}), Connection="close"))
+            return
+        writer.write(
+            _response(101, Upgrade="websocket", Connection="Upgrade", Sec_WebSocket_Accept=_accept_key(key))
+        )
+        self._sockets += 1
+        session = f"ws-{self._sockets}"
+        state = {"etag": None}
+        send_lock = asyncio.Lock()
+        tasks: set = set()
+
+        async def send(header: Dict[str, Any], payload: Optional[bytes] = None) -> None:
+            async with send_lock:
+                writer.write(_frame(_TEXT, _json(header)))
+                if payload is not None:
+                    writer.write(_frame(_BINARY, payload))
+                await writer.drain()
+
+        async def handle(message: bytes) -> None:
+            data: Any = None
+            try:
+                data = json.loads(message)
+                job = Job.from_dict(data)
+            except ValueError as e:
+                await send({"id": data.get("id") if isinstance(data, dict) else None, "status": "error", "error": str(e)})
+                return
+            reply: Dict[str, Any] = {"id": data.get("id"), "format": job.format, "etag": job.etag}
+            if state["etag"] == job.etag:
+                # back to the mesh the client already shows
+                self.service.cancel(session)
+                self.service.not_modified()
+                await send({**reply, "status": "unchanged"})
+                return
+            start = time.perf_counter()
+            try:
+                payload = await self.service.build(job, session)
+            except Superseded:
+                await send({**reply, "status": "superseded"})
+                return
+            except Exception as e:
+                await send({**reply, "status": "error", "error": f"{type(e).__name__}: {e}"})
+                return
+            reply["ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+            if state["etag"] == job.etag:
+                await send({**reply, "status": "unchanged"})
+                return
+            state["etag"] = job.etag
+            await send({**reply, "status": "ok", "bytes": len(payload)}, payload)
+
+        try:
+            while True:
+                try:
+                    opcode, message = await _read_message(reader, writer)
+                except _ProtocolError:
+                    writer.write(_frame(_CLOSE, struct.pack("!H", 1009)))
+                    break
+                if opcode == _CLOSE:
+                    writer.write(_frame(_CLOSE, message[:2]))
+                    break
+                if opcode != _TEXT:
+                    await send({"status": "error", "error": "send specs as text messages"})
+                    continue
+                task = asyncio.ensure_future(handle(message))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            self.service.cancel(session)
+            for task in list(tasks):
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# -- stand-in client ------------------------------------------------------------
+
+
+@dataclass
+class Reply:
+    """HTTP response received by :class:`DesignClient`."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class DesignClient:
+    """Minimal asyncio client for a running design server.
+
+    Holds one keep-alive HTTP connection; concurrent calls on the same
+    client are serialized, so use one client per simulated user.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self.host = host
+        self.port = port
+        self._stream: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._lock = asyncio.Lock()
+
+    async def request(self, method: str, path: str, body: bytes = b"", **headers: str) -> Reply:
+        async with self._lock:
+            for attempt in (0, 1):
+                if self._stream is None:
+                    self._stream = await asyncio.open_connection(self.host, self.port)
+                reader, writer = self._stream
+                head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+                head.extend(f"{name.replace('_', '-')}: {value}" for name, value in headers.items())
+                try:
+                    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+                    await writer.drain()
+                    start_line, response_headers = await _read_head(reader) or ("", {})
+                except (ConnectionError, _ProtocolError):
+                    start_line = ""
+                if not start_line:
+                    # the server closed an idle keep-alive connection; reconnect once
+                    await self.close()
+                    if attempt:
+                        raise ConnectionError("design server closed the connection")
+                    continue
+                status = int(start_line.split(" ", 2)[1])
+                length = int(response_headers.get("content-length", "0"))
+                return Reply(status, response_headers, await reader.readexactly(length) if length else b"")
+
+    async def build(self, spec: Dict[str, Any], *, etag: Optional[str] = None) -> Reply:
+        headers = {"If_None_Match": etag} if etag else {}
+        return await self.request("POST", "/build", _json(spec), Content_Type="application/json", **headers)
+
+    async def metrics(self) -> Dict[str, Any]:
+        return (await self.request("GET", "/metrics")).json()
+
+    async def websocket(self) -> "DesignSocket":
+        """Open a WebSocket session on its own connection."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        writer.write(
+            (
+                f"GET /ws HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nUpgrade: websocket\r\n"
+                f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+        start_line, headers = await _read_head(reader) or ("", {})
+        if " 101 " not in f"{start_line} " or headers.get("sec-websocket-accept") != _accept_key(key):
+            writer.close()
+            raise ConnectionError(f"WebSocket upgrade refused: {start_line!r}")
+        return DesignSocket(reader, writer)
+
+    async def close(self) -> None:
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream[1].close()
+
+    async def __aenter__(self) -> "DesignClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+class DesignSocket:
+    """Client end of a ``/ws`` session."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    async def send(self, spec: Dict[str, Any]) -> None:
+        self._writer.write(_frame(_TEXT, _json(spec), mask=True))
+        await self._writer.drain()
+
+    async def receive(self) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """Return the next reply and, for ``"ok"`` replies, the mesh bytes."""
+        opcode, message = await _read_message(self._reader, self._writer, mask=True)
+        if opcode == _CLOSE:
+            raise ConnectionError("design server closed the WebSocket")
+        header = json.loads(message)
+        if header.get("status") != "ok":
+            return header, None
+        _, payload = await _read_message(self._reader, self._writer, mask=True)
+        return header, payload
+
+    async def close(self) -> None:
+        try:
+            self._writer.write(_frame(_CLOSE, struct.pack("!H", 1000), mask=True))
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+        self._writer.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m parametric_cad.server",
+        description="Serve STL/GLB meshes of part specs over HTTP and WebSocket.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE, help="seconds (default: %(default)s)")
+    parser.add_argument("--cache-mb", type=float, help="mesh cache budget per worker")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    cache_bytes = None if args.cache_mb is None else int(args.cache_mb * 1024 * 1024)
+    service = DesignService(args.workers, debounce=args.debounce, cache_bytes=cache_bytes)
+    server = DesignServer(service, args.host, args.port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+__all__ = [
+    "DesignService",
+    "DesignServer",
+    "DesignClient",
+    "DesignSocket",
+    "Job",
+    "LatencyStats",
+    "Reply",
+    "Superseded",
+    "FORMATS",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,605 @@
+"""Uniform-grid triangle index and the geometric checks built on it.
+
+:class:`TriangleIndex` buckets every triangle into the cells of a
+uniform grid its bounding box overlaps.  The index is built once per
+mesh (see :func:`triangle_index`) and shared by
+
+* :func:`self_intersections` -- candidate pairs come from shared cells
+  and are confirmed with an exact segment/triangle test,
+* :func:`wall_thickness` -- rays cast inwards from face centroids walk
+  the grid cell by cell and stop at the first hit,
+
+so both scale with the number of triangles rather than its square.
+:func:`small_holes` and :func:`long_bridges` work on planar sections
+and downward faces respectively.  All checks report the offending face
+indices.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .core import lazy_module, tm
+from .geometry import Polygon, unary_union
+
+# vectorized predicates and the STRtree are not wrapped by .geometry;
+# shapely is still only imported once a section is analysed
+shapely = lazy_module("shapely")
+
+# Barycentric / parametric tolerance of the exact tests
+EPS = 1e-9
+# Upper bound on candidate pairs or ray/triangle tests evaluated at once
+CHUNK = 1 << 21
+
+_CACHE_KEY = "parametric_cad_triangle_index"
+_build_lock = threading.Lock()
+
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(owner, local index)`` for ``counts[i]`` items per owner."""
+
+    owner = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return owner, np.arange(len(owner)) - starts[owner]
+
+
+def _segment_hits(p0, p1, tri) -> np.ndarray:
+    """True where segment ``p0 -> p1`` crosses triangle ``tri``.
+
+    Moller-Trumbore.  The segment's end points and segments lying in the
+    triangle's plane do not count, so faces that merely touch (shared
+    edges of unwelded meshes, parts resting on each other) are not
+    reported; crossing through the triangle's boundary does count.
+    """
+
+    d = p1 - p0
+    e1 = tri[:, 1] - tri[:, 0]
+    e2 = tri[:, 2] - tri[:, 0]
+    h = np.cross(d, e2)
+    a = np.einsum("ij,ij->i", e1, h)
+    scale = np.linalg.norm(d, axis=1) * np.linalg.norm(e1, axis=1) * np.linalg.norm(e2, axis=1)
+    ok = np.abs(a) > 1e-12 * np.maximum(scale, 1e-300)
+    f = np.divide(1.0, a, out=np.zeros_like(a), where=ok)
+    s = p0 - tri[:, 0]
+    u = f * np.einsum("ij,ij->i", s, h)
+    q = np.cross(s, e1)
+    v = f * np.einsum("ij,ij->i", d, q)
+    t = f * np.einsum("ij,ij->i", e2, q)
+    return ok & (u >= -EPS) & (v >= -EPS) & (u + v <= 1 + EPS) & (t > EPS) & (t < 1 - EPS)
+
+
+def _ray_hits(origins, directions, tri) -> np.ndarray:
+    """Distance along each ray to its triangle, ``inf`` on a miss."""
+
+    e1 = tri[:, 1] - tri[:, 0]
+    e2 = tri[:, 2] - tri[:, 0]
+    h = np.cross(directions, e2)
+    a = np.einsum("ij,ij->i", e1, h)
+    ok = np.abs(a) > 1e-12
+    f = np.divide(1.0, a, out=np.zeros_like(a), where=ok)
+    s = origins - tri[:, 0]
+    u = f * np.einsum("ij,ij->i", s, h)
+    q = np.cross(s, e1)
+    v = f * np.einsum("ij,ij->i", directions, q)
+    t = f * np.einsum("ij,ij->i", e2, q)
+    hit = ok & (u >= -EPS) & (v >= -EPS) & (u + v <= 1 + EPS) & (t > 0)
+    return np.where(hit, t, np.inf)
+
+
+def _segment_distances(px, py, pz, ax, ay, az, bx, by, bz) -> np.ndarray:
+    ux, uy, uz = bx - ax, by - ay, bz - az
+    wx, wy, wz = px - ax, py - ay, pz - az
+    length = ux * ux + uy * uy + uz * uz
+    t = wx * ux + wy * uy + wz * uz
+    np.divide(t, length, out=t, where=length > 0)
+    np.clip(t, 0.0, 1.0, out=t)
+    wx -= ux * t
+    wy -= uy * t
+    wz -= uz * t
+    return wx * wx + wy * wy + wz * wz
+
+
+def point_triangle_distances(points: np.ndarray, tri: np.ndarray) -> np.ndarray:
+    """Distance from each point to the matching triangle of ``tri``.
+
+    A point projecting inside its triangle is as far as the triangle's
+    plane; any other point is nearest to one of the three edges.  Worked
+    on one coordinate array at a time, which is several times faster
+    than ``(n, 3)`` arithmetic for the millions of pairs a query tests.
+    """
+
+    px, py, pz = (np.ascontiguousarray(points[:, k]) for k in range(3))
+    ax, ay, az = (np.ascontiguousarray(tri[:, 0, k]) for k in range(3))
+    bx, by, bz = (np.ascontiguousarray(tri[:, 1, k]) for k in range(3))
+    cx, cy, cz = (np.ascontiguousarray(tri[:, 2, k]) for k in range(3))
+    e1x, e1y, e1z = bx - ax, by - ay, bz - az
+    e2x, e2y, e2z = cx - ax, cy - ay, cz - az
+    nx = e1y * e2z - e1z * e2y
+    ny = e1z * e2x - e1x * e2z
+    nz = e1x * e2y - e1y * e2x
+    area2 = nx * nx + ny * ny + nz * nz
+
+    def side(ux, uy, uz, qx, qy, qz):
+        # sign of ((u x q) . n): which side of the edge u the point q lies
+        return (uy * qz - uz * qy) * nx + (uz * qx - ux * qz) * ny + (ux * qy - uy * qx) * nz
+
+    inside = (
+        (side(e1x, e1y, e1z, px - ax, py - ay, pz - az) >= 0)
+        & (side(cx - bx, cy - by, cz - bz, px - bx, py - by, pz - bz) >= 0)
+        & (side(-e2x, -e2y, -e2z, px - cx, py - cy, pz - cz) >= 0)
+        & (area2 > 0)
+    )
+    squared = np.minimum(
+        np.minimum(
+            _segment_distances(px, py, pz, ax, ay, az, bx, by, bz),
+            _segment_distances(px, py, pz, bx, by, bz, cx, cy, cz),
+        ),
+        _segment_distances(px, py, pz, cx, cy, cz, ax, ay, az),
+    )
+    if np.any(inside):
+        height = (px - ax) * nx + (py - ay) * ny + (pz - az) * nz
+        squared[inside] = (height * height)[inside] / area2[inside]
+    return np.sqrt(squared)
+
+
+class TriangleIndex:
+    """Uniform grid over the triangles of a mesh.
+
+    Parameters
+    ----------
+    vertices, faces:
+        Mesh arrays.
+    cell_size:
+        Grid spacing, by default twice the median triangle size so that
+        a cell holds a handful of triangles.
+    """
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray, cell_size: Optional[float] = None) -> None:
+        self.faces = np.asarray(faces, dtype=np.int64)
+        self.triangles = np.asarray(vertices, dtype=np.float64)[self.faces]
+        t = self.triangles
+        lo = np.minimum(np.minimum(t[:, 0], t[:, 1]), t[:, 2])
+        hi = np.maximum(np.maximum(t[:, 0], t[:, 1]), t[:, 2])
+        if len(self.faces):
+            bounds = np.array([lo.min(axis=0), hi.max(axis=0)])
+        else:
+            bounds = np.zeros((2, 3))
+        span = np.maximum(bounds[1] - bounds[0], 1e-9)
+        if cell_size is None:
+            typical = float(np.median((hi - lo).max(axis=1))) if len(self.faces) else 1.0
+            # keep the linear cell keys well inside int64
+            cell_size = max(2.0 * typical, float(span.max()) / 2e5, 1e-9)
+        self.cell_size = float(cell_size)
+        self.origin = bounds[0] - 1e-9 * span
+        self.shape = np.maximum(np.ceil((span + 2e-9 * span) / self.cell_size), 1).astype(np.int64)
+
+        i0 = self._cell(lo)
+        i1 = self._cell(hi)
+        extent = i1 - i0 + 1
+        counts = extent[:, 0] * extent[:, 1] * extent[:, 2]
+        if np.all(counts == 1):
+            owner, cells = np.arange(len(counts)), i0
+        else:
+            owner, local = _expand(counts)
+            ex, ey = extent[owner, 0], extent[owner, 1]
+            cells = i0[owner] + np.stack([local % ex, (local // ex) % ey, local // (ex * ey)], axis=1)
+        keys = self._key(cells)
+        order = np.argsort(keys)
+        keys = keys[order]
+        self.cell_triangles = owner[order].astype(np.int32)
+        self.starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else keys
+        self.cells = keys[self.starts]
+        self.ends = np.append(self.starts[1:], len(keys))
+        # Bit k is set where a reference sits in its triangle's first cell
+        # along axis k; used to emit each pair from one cell only.
+        first = (cells[order] == i0[self.cell_triangles]).astype(np.uint8)
+        self.first_bits = first[:, 0] | (first[:, 1] << 1) | (first[:, 2] << 2)
+        # Per-axis box bounds rounded outwards to float32 for a cheaper
+        # overlap test
+        self.box_lo = np.nextafter(lo.T.astype(np.float32), np.float32(-np.inf))
+        self.box_hi = np.nextafter(hi.T.astype(np.float32), np.float32(np.inf))
+
+    def _cell(self, p: np.ndarray) -> np.ndarray:
+        idx = np.floor((p - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(idx, 0, self.shape - 1)
+
+    def _key(self, cells: np.ndarray) -> np.ndarray:
+        return cells[:, 0] + self.shape[0] * (cells[:, 1] + self.shape[1] * cells[:, 2])
+
+    def candidate_pairs(self, chunk: int = CHUNK) -> Iterator[np.ndarray]:
+        """Yield ``(k, 2)`` arrays of triangle pairs with overlapping boxes.
+
+        Pairs are generated cell by cell, about ``chunk`` at a time.  A
+        pair is only emitted by the cell holding the lower corner of the
+        two boxes' overlap, so pairs sharing several cells appear once.
+        """
+
+        sizes = self.ends - self.starts
+        per_cell = sizes * (sizes - 1) // 2
+        total = int(per_cell.sum())
+        cuts = np.searchsorted(np.cumsum(per_cell), np.arange(chunk, total, chunk))
+        edges = np.unique(np.concatenate([[0], cuts, [len(sizes)]]))
+        for c0, c1 in zip(edges[:-1], edges[1:]):
+            positions = np.arange(self.starts[c0], self.ends[c1 - 1], dtype=np.int32)
+            partners = np.repeat(self.ends[c0:c1].astype(np.int32), sizes[c0:c1]) - positions - 1
+            p = np.repeat(positions, partners)
+            q = np.arange(len(p), dtype=np.int32) - np.repeat(np.cumsum(partners) - partners, partners)
+            q += p + 1
+            # The overlap's lower corner lies in this cell exactly when, on
+            # every axis, one of the two triangles starts in it.
+            home = (self.first_bits[p] | self.first_bits[q]) == 7
+            a = self.cell_triangles[p[home]]
+            b = self.cell_triangles[q[home]]
+            overlap = np.ones(len(a), dtype=bool)
+            for lo, hi in zip(self.box_lo, self.box_hi):
+                overlap &= np.maximum(lo[a], lo[b]) <= np.minimum(hi[a], hi[b])
+            yield np.stack([a[overlap], b[overlap]], axis=1)
+
+    def raycast(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_distance: float = np.inf,
+        ignore: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return distance and face index of each ray's first hit.
+
+        Rays walk the grid with a 3D-DDA; a cell's triangles are tested
+        only when the ray reaches it, and the walk stops at the first
+        cell with a hit closer than the cell's exit.  Misses return
+        ``inf`` and ``-1``.  ``ignore`` gives one face per ray to skip,
+        typically the face the ray starts on.
+        """
+
+        origins = np.asarray(origins, dtype=np.float64)
+        d = np.asarray(directions, dtype=np.float64)
+        d = d / np.linalg.norm(d, axis=1, keepdims=True)
+        n = len(origins)
+        distance = np.full(n, np.inf)
+        face = np.full(n, -1, dtype=np.int64)
+        if n == 0 or len(self.faces) == 0:
+            return distance, face
+        ignore = np.full(n, -1, dtype=np.int64) if ignore is None else np.asarray(ignore)
+
+        lo = self.origin
+        hi = self.origin + self.shape * self.cell_size
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = np.where(d != 0, 1.0 / d, np.inf)
+            t0 = np.where(d != 0, (lo - origins) * inv, -np.inf)
+            t1 = np.where(d != 0, (hi - origins) * inv, np.inf)
+        inside_slab = (d != 0) | ((origins >= lo) & (origins <= hi))
+        t_enter = np.maximum(np.minimum(t0, t1).max(axis=1), 0.0)
+        t_exit = np.minimum(np.maximum(t0, t1).min(axis=1), max_distance)
+        active = inside_slab.all(axis=1) & (t_enter <= t_exit)
+
+        cell = self._cell(origins + d * t_enter[:, None])
+        step = np.sign(d).astype(np.int64)
+        with np.errstate(invalid="ignore"):
+            boundary = lo + (cell + (step > 0)) * self.cell_size
+            t_next = np.where(d != 0, (boundary - origins) * inv, np.inf)
+            t_delta = np.where(d != 0, self.cell_size * np.abs(inv), np.inf)
+
+        rays = np.nonzero(active)[0]
+        while len(rays):
+            keys = self._key(cell[rays])
+            pos = np.searchsorted(self.cells, keys)
+            found = pos < len(self.cells)
+            found[found] = self.cells[pos[found]] == keys[found]
+            t_out = np.minimum(t_next[rays].min(axis=1), t_exit[rays])
+
+            hit_rays = rays[found]
+            counts = (self.ends - self.starts)[pos[found]]
+            owner, local = _expand(counts)
+            if len(owner):
+                ray = hit_rays[owner]
+                tri = self.cell_triangles[self.starts[pos[found]][owner] + local]
+                t = _ray_hits(origins[ray], d[ray], self.triangles[tri])
+                t[tri == ignore[ray]] = np.inf
+                limit = np.minimum(t_out[found][owner], t_exit[ray])
+                good = t <= limit + EPS * self.cell_size
+                ray, tri, t = ray[good], tri[good], t[good]
+                order = np.lexsort((t, ray))
+                ray, tri, t = ray[order], tri[order], t[order]
+                first = np.unique(ray, return_index=True)[1]
+                distance[ray[first]] = t[first]
+                face[ray[first]] = tri[first]
+
+            # advance the remaining rays to the next cell
+            axis = np.argmin(t_next[rays], axis=1)
+            leaving = t_next[rays, axis] > t_exit[rays]
+            cell[rays, axis] += step[rays, axis]
+            t_next[rays, axis] += t_delta[rays, axis]
+            outside = np.any((cell[rays] < 0) | (cell[rays] >= self.shape), axis=1)
+            rays = rays[(face[rays] < 0) & ~leaving & ~outside]
+        return distance, face
+
+    def distances(self, points: np.ndarray, upper: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the distance from each point to the nearest triangle.
+
+        Only cells within the current search radius of a point are
+        visited; the radius starts at an eighth of a cell, or at ``upper`` when
+        an upper bound is known (the distance to any one triangle), and
+        doubles until the nearest triangle found lies inside it.
+        """
+
+        points = np.asarray(points, dtype=np.float64)
+        n = len(points)
+        best = np.full(n, np.inf) if upper is None else np.array(upper, dtype=np.float64)
+        if n == 0 or len(self.faces) == 0:
+            return best
+        radius = np.full(n, 0.125 * self.cell_size)
+        todo = np.arange(n)
+        step = max(1, CHUNK // 64)
+        while len(todo):
+            r = np.minimum(best[todo], radius[todo])
+            for start in range(0, len(todo), step):
+                chunk = slice(start, start + step)
+                self._nearest(points, todo[chunk], r[chunk], best)
+            done = best[todo] <= r
+            radius[todo] *= 2.0
+            todo = todo[~done]
+        return best
+
+    def _nearest(self, points: np.ndarray, ids: np.ndarray, r: np.ndarray, best: np.ndarray) -> None:
+        p = points[ids]
+        lo = self._cell(p - r[:, None])
+        extent = self._cell(p + r[:, None]) - lo + 1
+        owner, local = _expand(extent[:, 0] * extent[:, 1] * extent[:, 2])
+        ex, ey = extent[owner, 0], extent[owner, 1]
+        cells = lo[owner] + np.stack([local % ex, (local // ex) % ey, local // (ex * ey)], axis=1)
+        keys = self._key(cells)
+        pos = np.minimum(np.searchsorted(self.cells, keys), len(self.cells) - 1)
+        found = self.cells[pos] == keys
+        owner, pos = owner[found], pos[found]
+        sub, local = _expand((self.ends - self.starts)[pos])
+        point = owner[sub]
+        tri = self.cell_triangles[self.starts[pos][sub] + local]
+        # skip triangles whose box is farther away than the radius
+        near = np.ones(len(tri), dtype=bool)
+        for axis, (lo_, hi_) in enumerate(zip(self.box_lo, self.box_hi)):
+            x = p[point, axis]
+            gap = np.maximum(lo_[tri] - x, x - hi_[tri])
+            near &= gap <= r[point]
+        point, tri = point[near], tri[near]
+        if len(tri):
+            d = point_triangle_distances(p[point], self.triangles[tri])
+            np.minimum.at(best, ids[point], d)
+
+
+def triangle_index(mesh: tm.Trimesh) -> TriangleIndex:
+    """Return the grid index of ``mesh``, building it on first use.
+
+    The index lives in the mesh's own cache, so it is shared by every
+    check and by cached copies and is dropped when the mesh changes.
+    """
+
+    index = mesh._cache[_CACHE_KEY]
+    if index is None:
+        with _build_lock:
+            index = mesh._cache[_CACHE_KEY]
+            if index is None:
+                index = TriangleIndex(mesh.vertices, mesh.faces)
+                mesh._cache[_CACHE_KEY] = index
+    return index
+
+
+def self_intersections(mesh: tm.Trimesh) -> np.ndarray:
+    """Return ``(k, 2)`` face index pairs whose triangles cross.
+
+    Faces sharing a vertex are skipped, as are triangles that only touch
+    along an edge or lie in the same plane.
+    """
+
+    index = triangle_index(mesh)
+    faces = index.faces
+    tris = index.triangles
+    found: List[np.ndarray] = []
+    for chunk in index.candidate_pairs():
+        a, b = chunk[:, 0], chunk[:, 1]
+        shared = (faces[a][:, :, None] == faces[b][:, None, :]).any(axis=(1, 2))
+        chunk = chunk[~shared]
+        ta, tb = tris[chunk[:, 0]], tris[chunk[:, 1]]
+        if not len(chunk):
+            continue
+        # reject pairs where one triangle lies entirely on one side of the other
+        na = np.cross(ta[:, 1] - ta[:, 0], ta[:, 2] - ta[:, 0])
+        nb = np.cross(tb[:, 1] - tb[:, 0], tb[:, 2] - tb[:, 0])
+        db = np.einsum("ij,ikj->ik", na, tb - ta[:, None, 0])
+        da = np.einsum("ij,ikj->ik", nb, ta - tb[:, None, 0])
+        straddle = (db.min(axis=1) < 0) & (db.max(axis=1) > 0) & (da.min(axis=1) < 0) & (da.max(axis=1) > 0)
+        chunk, ta, tb = chunk[straddle], ta[straddle], tb[straddle]
+        hit = np.zeros(len(chunk), dtype=bool)
+        for i, j in ((0, 1), (1, 2), (2, 0)):
+            hit |= _segment_hits(ta[:, i], ta[:, j], tb)
+            hit |= _segment_hits(tb[:, i], tb[:, j], ta)
+        found.append(chunk[hit])
+    if not found:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.sort(np.concatenate(found), axis=1)
+
+
+def wall_thickness(
+    mesh: tm.Trimesh,
+    faces: Optional[np.ndarray] = None,
+    max_distance: float = np.inf,
+) -> np.ndarray:
+    """Return the inward wall thickness measured at ``faces``.
+
+    A ray is cast from each face centroid against its normal; the
+    distance to the first surface hit is the local wall thickness.
+    Faces whose ray leaves the mesh or exceeds ``max_distance`` report
+    ``inf``.
+    """
+
+    faces = np.arange(len(mesh.faces)) if faces is None else np.asarray(faces)
+    index = triangle_index(mesh)
+    origins = mesh.triangles_center[faces]
+    directions = -mesh.face_normals[faces]
+    distance, _ = index.raycast(origins, directions, max_distance, ignore=faces)
+    return distance
+
+
+def thin_walls(
+    mesh: tm.Trimesh, minimum: float, samples: Optional[int] = 20000, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return faces (and their thickness) of walls thinner than ``minimum``.
+
+    At most ``samples`` faces are measured, chosen at random with a fixed
+    seed so results are reproducible.  A thin spot only counts as a wall
+    when the material extends at least ``minimum`` both ways in the
+    face's plane; small pins and nubs are left to the feature size rule.
+    """
+
+    faces = np.arange(len(mesh.faces))
+    if samples is not None and len(faces) > samples:
+        faces = np.sort(np.random.default_rng(seed).choice(faces, samples, replace=False))
+    thickness = wall_thickness(mesh, faces, max_distance=minimum)
+    thin = thickness < minimum
+    faces, thickness = faces[thin], thickness[thin]
+    if not len(faces):
+        return faces, thickness
+
+    # cast rays along the wall from its mid-plane to measure its width
+    normals = mesh.face_normals[faces]
+    middle = mesh.triangles_center[faces] - normals * (thickness / 2.0)[:, None]
+    edge = mesh.triangles[faces, 1] - mesh.triangles[faces, 0]
+    t1 = edge / np.linalg.norm(edge, axis=1, keepdims=True)
+    t2 = np.cross(normals, t1)
+    directions = np.concatenate([t1, -t1, t2, -t2])
+    origins = np.tile(middle, (4, 1))
+    reach, _ = triangle_index(mesh).raycast(origins, directions, max_distance=minimum)
+    reach = np.minimum(reach, minimum).reshape(4, -1)
+    wall = (reach[0] + reach[1] >= minimum) & (reach[2] + reach[3] >= minimum)
+    return faces[wall], thickness[wall]
+
+
+def _sorted_edges(mesh: tm.Trimesh) -> np.ndarray:
+    return np.sort(mesh.faces[:, [[0, 1], [1, 2], [2, 0]]], axis=2)
+
+
+def section_segments(
+    mesh: tm.Trimesh, axis: int, level: float, edges: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return 2D segments where the plane ``x[axis] = level`` cuts ``mesh``.
+
+    Returns ``(segments, faces)`` with ``segments`` of shape ``(k, 2, 2)``
+    in the remaining two coordinates.  Edge crossings are computed from
+    the edge's vertices in index order, so neighbouring faces produce
+    bit-identical endpoints.
+    """
+
+    vertices = mesh.vertices
+    above = vertices[:, axis] >= level
+    side = vertices[:, axis] - level
+    side = np.where(side == 0, 1e-12, side)
+    # only faces with vertices on both sides can be cut
+    flags = above[mesh.faces]
+    cut = np.nonzero(flags.any(axis=1) & ~flags.all(axis=1))[0]
+    if not len(cut):
+        return np.zeros((0, 2, 2)), cut
+    if edges is None:
+        edges = _sorted_edges(mesh)
+    edges = edges[cut]
+    crosses = above[edges[:, :, 0]] != above[edges[:, :, 1]]
+    edge_pairs = edges[crosses].reshape(-1, 2, 2)
+    va = vertices[edge_pairs[:, :, 0]]
+    vb = vertices[edge_pairs[:, :, 1]]
+    da = side[edge_pairs[:, :, 0]][:, :, None]
+    db = side[edge_pairs[:, :, 1]][:, :, None]
+    points3 = va + (vb - va) * (da / (da - db))
+    keep = [i for i in range(3) if i != axis]
+    return points3[:, :, keep], cut
+
+
+def small_holes(
+    mesh: tm.Trimesh, minimum: float, levels: int = 5
+) -> List[Tuple[float, np.ndarray]]:
+    """Return ``(diameter, faces)`` for holes narrower than ``minimum``.
+
+    The mesh is sectioned at ``levels`` planes along each axis.  Closed
+    loops nested inside an odd number of other loops are holes; their
+    diameter is the short side of the loop's minimum rotated rectangle.
+    """
+
+    found = []
+    bounds = mesh.bounds
+    edges = _sorted_edges(mesh)
+    for axis in range(3):
+        lo, hi = bounds[:, axis]
+        for i in range(levels):
+            # offset slightly so planes avoid vertices on round coordinates
+            level = lo + (hi - lo) * ((i + 0.5) / levels + 1e-4)
+            segments, faces = section_segments(mesh, axis, level, edges)
+            if not len(segments):
+                continue
+            merged = shapely.line_merge(shapely.multilinestrings(segments))
+            lines = getattr(merged, "geoms", [merged])
+            rings = [Polygon(line.coords) for line in lines if line.is_ring and len(line.coords) > 3]
+            if not rings:
+                continue
+            # nesting depth from an STRtree query: pairs (ring, other)
+            # with ring inside other, excluding each ring itself
+            inner, outer = shapely.STRtree(rings).query(rings, predicate="within")
+            depth = np.bincount(inner[inner != outer], minlength=len(rings))
+            mids = None
+            for k in np.flatnonzero(depth % 2):
+                ring = rings[k]
+                rect = ring.minimum_rotated_rectangle.exterior.coords
+                sides = np.linalg.norm(np.diff(np.asarray(rect)[:3], axis=0), axis=1)
+                diameter = float(sides.min())
+                if diameter < minimum:
+                    if mids is None:
+                        mids = shapely.points(segments.mean(axis=1))
+                    near = shapely.dwithin(ring.exterior, mids, 1e-6 * max(1.0, diameter))
+                    found.append((diameter, faces[near]))
+    return found
+
+
+def long_bridges(
+    mesh: tm.Trimesh, maximum: float, tolerance_deg: float = 5.0
+) -> List[Tuple[float, np.ndarray]]:
+    """Return ``(span, faces)`` for horizontal ceilings wider than ``maximum``.
+
+    Downward facing, near-horizontal faces above the bed are grouped by
+    height and merged into planar regions; a region's span is the short
+    side of its minimum rotated rectangle.
+    """
+
+    normals = mesh.face_normals
+    centers = mesh.triangles_center
+    min_z = mesh.bounds[0, 2]
+    ceiling = (normals[:, 2] < -np.cos(np.radians(tolerance_deg))) & (centers[:, 2] > min_z + 1e-6)
+    candidates = np.nonzero(ceiling)[0]
+    found = []
+    if not len(candidates):
+        return found
+    heights = np.round(centers[candidates, 2], 6)
+    for z in np.unique(heights):
+        faces = candidates[heights == z]
+        tris = mesh.triangles[faces][:, :, :2]
+        region = unary_union([Polygon(t) for t in tris]).buffer(0)
+        for poly in getattr(region, "geoms", [region]):
+            if poly.is_empty:
+                continue
+            rect = np.asarray(poly.minimum_rotated_rectangle.exterior.coords)
+            span = float(np.linalg.norm(np.diff(rect[:3], axis=0), axis=1).min())
+            if span > maximum:
+                inside = shapely.contains_xy(poly.buffer(1e-9), centers[faces, 0], centers[faces, 1])
+                found.append((span, faces[inside]))
+    return found
+
+
+__all__ = [
+    "TriangleIndex",
+    "triangle_index",
+    "point_triangle_distances",
+    "self_intersections",
+    "wall_thickness",
+    "thin_walls",
+    "section_segments",
+    "small_holes",
+    "long_bridges",
+]
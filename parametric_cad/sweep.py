@@ -0,0 +1,246 @@
+"""Design-space sweeps over gear and sprocket parameter grids.
+
+:func:`sweep` takes a grid of parameter values, expands it to every
+combination and yields the finished parts one at a time, so a catalog of
+thousands of gears never sits in memory at once::
+
+    from parametric_cad.sweep import sweep
+
+    grid = {"module": [1.0, 1.5], "teeth": [12, 16, 20], "bore_diameter": [5, 8]}
+    for params, path in sweep("SpurGear", grid, output_dir="output/catalog"):
+        print(params, path)
+
+Combinations are grouped into *branches* that share their expensive 2D
+pieces: gears with the same module and tooth count share the tooth
+polygon and the unioned hub and teeth, sprockets with the same pitch,
+roller, tooth count and clearance share the disc and the roller seats,
+and bore and hole cutters are shared per diameter.  Each piece is built
+once per process.  With ``workers > 1`` whole branches run on a process
+pool.  Only a bounded number of branches is in flight at a time.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .batch import resolve_class
+from .core import extrude, tm
+from .geometry import unary_union
+from .primitives.gear import SpurGear
+from .primitives.sprocket import ChainSprocket
+from .tessellation import TessellationPolicy, get_tessellation, tessellation
+
+# Shared 2D pieces kept per process; enough for a few hundred branches.
+PIECE_CACHE_SIZE = 256
+
+
+# Every piece takes the tessellation policy so that pieces built under
+# different tolerances are cached separately.
+
+
+@lru_cache(maxsize=PIECE_CACHE_SIZE)
+def _gear_body(policy: TessellationPolicy, module: float, teeth: int):
+    with tessellation(policy):
+        return SpurGear(module, teeth).body()
+
+
+@lru_cache(maxsize=PIECE_CACHE_SIZE)
+def _gear_cutters(
+    policy: TessellationPolicy,
+    bore_diameter: float,
+    hole_count: int,
+    hole_diameter: float,
+    hole_radius: float,
+):
+    gear = SpurGear(
+        1.0,
+        1,
+        bore_diameter=bore_diameter,
+        hole_count=hole_count,
+        hole_diameter=hole_diameter,
+        hole_radius=hole_radius,
+    )
+    with tessellation(policy):
+        return gear.cutters()
+
+
+@lru_cache(maxsize=PIECE_CACHE_SIZE)
+def _sprocket_rim(
+    policy: TessellationPolicy, pitch: float, roller_diameter: float, teeth: int, clearance: float
+):
+    sprocket = ChainSprocket(pitch, roller_diameter, teeth, clearance=clearance)
+    with tessellation(policy):
+        return sprocket.disc(), sprocket.seats()
+
+
+@lru_cache(maxsize=PIECE_CACHE_SIZE)
+def _sprocket_bore(policy: TessellationPolicy, bore_diameter: float):
+    with tessellation(policy):
+        return ChainSprocket(bore_diameter=bore_diameter).bore()
+
+
+def _gear_mesh(gear: SpurGear) -> tm.Trimesh:
+    policy = get_tessellation()
+    body = _gear_body(policy, gear.module, gear.teeth)
+    cutters = _gear_cutters(
+        policy,
+        gear.bore_diameter, gear.hole_count, gear.hole_diameter, gear.hole_radius
+    )
+    return extrude(body.difference(cutters), gear.width)
+
+
+def _sprocket_mesh(sprocket: ChainSprocket) -> tm.Trimesh:
+    policy = get_tessellation()
+    disc, seats = _sprocket_rim(
+        policy,
+        sprocket.pitch, sprocket.roller_diameter, sprocket.teeth, sprocket.clearance
+    )
+    cutters = unary_union([seats, _sprocket_bore(policy, sprocket.bore_diameter)])
+    return extrude(disc.difference(cutters), sprocket.thickness)
+
+
+def branch_key(part: Any) -> Tuple:
+    """Return the key of the shared pieces ``part`` can reuse."""
+
+    if getattr(part, "mode", None) == "2d":
+        if isinstance(part, SpurGear):
+            return ("SpurGear", part.module, part.teeth)
+        if isinstance(part, ChainSprocket):
+            return ("ChainSprocket", part.pitch, part.roller_diameter, part.teeth, part.clearance)
+    return (type(part).__name__, id(part))
+
+
+def build_mesh(part: Any) -> tm.Trimesh:
+    """Return the mesh of ``part``, reusing shared pieces where possible.
+
+    The result is the same geometry as ``part.mesh()``; parts without
+    shared pieces (3D mode, other classes) are meshed normally.
+    """
+
+    if getattr(part, "mode", None) == "2d":
+        if isinstance(part, SpurGear):
+            mesh = _gear_mesh(part)
+        elif isinstance(part, ChainSprocket):
+            mesh = _sprocket_mesh(part)
+        else:
+            return part.mesh()
+        mesh.apply_transform(part.transform_matrix())
+        return mesh
+    return part.mesh()
+
+
+def expand_grid(grid: Dict[str, Sequence[Any]], fixed: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Return every combination of ``grid`` merged over ``fixed``."""
+
+    names = list(grid)
+    return [
+        {**(fixed or {}), **dict(zip(names, values))}
+        for values in itertools.product(*(grid[n] for n in names))
+    ]
+
+
+def part_name(cls_name: str, params: Dict[str, Any]) -> str:
+    """Return a file name such as ``SpurGear_module1.5_teeth20``."""
+
+    return "_".join([cls_name, *(f"{k}{v}" for k, v in params.items())])
+
+
+def _build(
+    cls: type,
+    combos: Iterable[Dict[str, Any]],
+    output_dir: Optional[str],
+    binary: bool,
+    name: Callable[[str, Dict[str, Any]], str],
+) -> Iterator[Tuple[Dict[str, Any], Any]]:
+    """Build (and optionally export) ``combos`` one at a time."""
+
+    exporter = None
+    if output_dir is not None:
+        from .export.stl import STLExporter
+
+        exporter = STLExporter(output_dir=output_dir, binary=binary)
+    for params in combos:
+        mesh = build_mesh(cls(**params))
+        if exporter is None:
+            yield params, mesh
+        else:
+            yield params, exporter.export_mesh(mesh, name(cls.__name__, params), preview=False)
+
+
+def _run_branch(policy: TessellationPolicy, *args) -> List[Tuple[Dict[str, Any], Any]]:
+    """Process pool entry point: build one whole branch under ``policy``."""
+    with tessellation(policy):
+        return list(_build(*args))
+
+
+def sweep(
+    cls: str | type,
+    grid: Dict[str, Sequence[Any]],
+    *,
+    fixed: Optional[Dict[str, Any]] = None,
+    output_dir: Optional[str] = None,
+    binary: bool = True,
+    workers: int = 1,
+    name: Callable[[str, Dict[str, Any]], str] = part_name,
+) -> Iterator[Tuple[Dict[str, Any], Any]]:
+    """Yield ``(params, mesh)`` for every combination of ``grid``.
+
+    Parameters
+    ----------
+    cls:
+        Part class or its name as accepted by
+        :func:`~parametric_cad.batch.resolve_class`.
+    grid:
+        Mapping of constructor parameter to the values to sweep.
+    fixed:
+        Constructor parameters shared by every combination.
+    output_dir:
+        Export each part as STL there and yield ``(params, path)``
+        instead of meshes.
+    binary:
+        Write binary STL files.
+    workers:
+        Run branches on this many processes; ``1`` builds in-process.
+    name:
+        Returns the file name of a part from its class name and the
+        swept parameters; must be a module-level function when
+        ``workers > 1``.
+
+    Results are yielded branch by branch; with several workers the
+    branch order follows completion.
+    """
+
+    part_cls = resolve_class(cls) if isinstance(cls, str) else cls
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    branches: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for params in expand_grid(grid, fixed):
+        branches.setdefault(branch_key(part_cls(**params)), []).append(params)
+
+    if workers <= 1:
+        combos = itertools.chain.from_iterable(branches.values())
+        yield from _build(part_cls, combos, output_dir, binary, name)
+        return
+
+    policy = get_tessellation()
+    pending = iter(branches.values())
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        while True:
+            # two branches per worker keeps the pool busy without
+            # holding the whole family in memory
+            for combos in itertools.islice(pending, 2 * workers - len(running)):
+                running.add(pool.submit(_run_branch, policy, part_cls, combos, output_dir, binary, name))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+__all__ = ["sweep", "build_mesh", "branch_key", "expand_grid", "part_name"]
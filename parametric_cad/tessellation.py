@@ -0,0 +1,162 @@
+"""Tessellation policy shared by all primitives and mechanisms.
+
+Curves are split into as many segments as it takes to keep the chord
+error (the gap between a straight segment and the true arc) below
+``tolerance`` millimetres.  Small holes therefore get few segments and
+large discs many, in proportion to what the printer can resolve.
+
+The default tolerance is a quarter of the smaller of
+``nozzle_diameter_mm`` and ``layer_height_mm`` in
+``bambu_printability_rules.json`` (0.05 mm for a 0.4 mm nozzle at 0.2 mm
+layers).  Replace it process-wide with :func:`set_tessellation` or for a
+block of code with :func:`tessellation`::
+
+    with tessellation(0.01):
+        fine = SpurGear(module=1.0, teeth=20).mesh()
+
+Explicit segment counts (``Cylinder(..., sections=64)``) always win.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import math
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Icosahedron edge angle seen from the centre; halves per subdivision
+_ICOSAHEDRON_EDGE_ANGLE = 1.1071487177940904
+
+
+@dataclass(frozen=True)
+class TessellationPolicy:
+    """Pick segment counts from a chord-error ``tolerance`` in mm."""
+
+    tolerance: float = 0.05
+    min_segments: int = 8
+    max_segments: int = 1024
+    max_subdivisions: int = 6
+
+    def __post_init__(self) -> None:
+        if self.tolerance <= 0:
+            raise ValueError("tolerance must be positive")
+
+    def max_angle(self, radius: float) -> float:
+        """Return the largest arc angle one segment may span at ``radius``."""
+        if radius <= self.tolerance:
+            return math.pi
+        return 2.0 * math.acos(1.0 - self.tolerance / radius)
+
+    def segments(self, radius: float, angle: float = 2 * math.pi) -> int:
+        """Return the segment count for an arc of ``angle`` radians.
+
+        A full circle never gets fewer than ``min_segments``; partial arcs
+        are scaled down from that minimum.
+        """
+        count = math.ceil(abs(angle) / self.max_angle(abs(radius)) - 1e-9)
+        floor = math.ceil(self.min_segments * abs(angle) / (2 * math.pi))
+        return int(min(max(count, floor, 1), self.max_segments))
+
+    def subdivisions(self, radius: float) -> int:
+        """Return the icosphere subdivision level for a sphere of ``radius``."""
+        limit = self.max_angle(abs(radius))
+        level = 0
+        while _ICOSAHEDRON_EDGE_ANGLE / 2**level > limit and level < self.max_subdivisions:
+            level += 1
+        return level
+
+    def involute_steps(self, base_radius: float, outer_radius: float) -> int:
+        """Return the point count for an involute flank up to ``outer_radius``.
+
+        The flank turns through its roll angle ``tan(alpha)`` with a
+        radius of curvature of at most ``outer * sin(alpha)``.
+        """
+        if outer_radius <= base_radius:
+            return 2
+        alpha = math.acos(base_radius / outer_radius)
+        curvature = outer_radius * math.sin(alpha)
+        count = math.ceil(math.tan(alpha) / self.max_angle(curvature) - 1e-9)
+        return int(min(max(count, 3), self.max_segments)) + 1
+
+
+def _rules_path() -> Path:
+    return Path(__file__).resolve().parent.parent / "bambu_printability_rules.json"
+
+
+def policy_from_rules(path: str | Path | None = None) -> TessellationPolicy:
+    """Return the policy derived from a printability rules file."""
+
+    try:
+        with open(path or _rules_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return TessellationPolicy()
+    sizes = [data.get(k) for k in ("nozzle_diameter_mm", "layer_height_mm")]
+    sizes = [float(s) for s in sizes if s]
+    if not sizes:
+        return TessellationPolicy()
+    return TessellationPolicy(tolerance=min(sizes) / 4.0)
+
+
+_policy: Optional[TessellationPolicy] = None
+_override: contextvars.ContextVar[Optional[TessellationPolicy]] = contextvars.ContextVar(
+    "parametric_cad_tessellation", default=None
+)
+
+
+def _as_policy(policy: TessellationPolicy | float) -> TessellationPolicy:
+    if isinstance(policy, TessellationPolicy):
+        return policy
+    return TessellationPolicy(tolerance=float(policy))
+
+
+def get_tessellation() -> TessellationPolicy:
+    """Return the policy in effect for the current context."""
+    global _policy
+    override = _override.get()
+    if override is not None:
+        return override
+    if _policy is None:
+        _policy = policy_from_rules()
+    return _policy
+
+
+def set_tessellation(policy: TessellationPolicy | float | None) -> TessellationPolicy:
+    """Install ``policy`` (or a tolerance in mm) process-wide.
+
+    ``None`` restores the policy derived from the rules file.  Returns
+    the previous policy.
+    """
+    global _policy
+    previous = get_tessellation()
+    _policy = None if policy is None else _as_policy(policy)
+    return previous
+
+
+@contextmanager
+def tessellation(policy: TessellationPolicy | float) -> Iterator[TessellationPolicy]:
+    """Use ``policy`` (or a tolerance in mm) inside the ``with`` block."""
+    policy = _as_policy(policy)
+    token = _override.set(policy)
+    try:
+        yield policy
+    finally:
+        _override.reset(token)
+
+
+def segments(radius: float, angle: float = 2 * math.pi) -> int:
+    """Shorthand for ``get_tessellation().segments(radius, angle)``."""
+    return get_tessellation().segments(radius, angle)
+
+
+__all__ = [
+    "TessellationPolicy",
+    "policy_from_rules",
+    "get_tessellation",
+    "set_tessellation",
+    "tessellation",
+    "segments",
+]
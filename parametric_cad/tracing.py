@@ -0,0 +1,230 @@
+"""Lightweight tracing of the meshing, boolean, validation and export paths.
+
+Spans are opened with the :func:`span` context manager or the
+:func:`traced` decorator.  Each one records its wall time, thread and
+any attributes attached to it (vertex/face counts, the boolean engine
+used, ...).  While tracing is disabled :func:`span` returns a shared
+no-op object and :func:`traced` calls straight through, so the hooks
+left in the hot paths cost one global lookup.
+
+::
+
+    from parametric_cad import tracing
+
+    tracer = tracing.enable()
+    gear = SpurGear(module=1.0, teeth=40).mesh()
+    print(tracer.summary())
+    tracer.write_chrome_trace("trace.json")   # open in chrome://tracing
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+_tracer: Optional["Tracer"] = None
+_local = threading.local()
+
+
+class Span:
+    """One timed region; use :meth:`set` and :meth:`mesh` to annotate it."""
+
+    __slots__ = ("name", "args", "start", "tracer")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def set(self, **args: Any) -> "Span":
+        self.args.update(args)
+        return self
+
+    def mesh(self, mesh: Any, prefix: str = "") -> "Span":
+        """Record the vertex and face counts of ``mesh``."""
+        self.args[prefix + "vertices"] = len(mesh.vertices)
+        self.args[prefix + "faces"] = len(mesh.faces)
+        return self
+
+    def __enter__(self) -> "Span":
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end = time.perf_counter()
+        _local.stack.pop()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._add(self, end)
+
+
+class _NullSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set(self, **args: Any) -> "_NullSpan":
+        return self
+
+    def mesh(self, mesh: Any, prefix: str = "") -> "_NullSpan":
+        return self
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects finished spans and exports them."""
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def _add(self, span: Span, end: float) -> None:
+        event = {
+            "name": span.name,
+            "cat": "parametric_cad",
+            "ph": "X",
+            "ts": (span.start - self._origin) * 1e6,
+            "dur": (end - span.start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": span.args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.events.clear()
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Return the spans in Chrome trace-event format."""
+        with self._lock:
+            events = list(self.events)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> str:
+        """Write :meth:`chrome_trace` to ``path`` for chrome://tracing or Perfetto."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        return path
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Return call count, total, max and face count per span name."""
+        totals: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            row = totals.setdefault(
+                event["name"], {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "faces": 0}
+            )
+            ms = event["dur"] / 1000.0
+            row["calls"] += 1
+            row["total_ms"] += ms
+            row["max_ms"] = max(row["max_ms"], ms)
+            row["faces"] += event["args"].get("faces", 0)
+        return totals
+
+    def summary(self) -> str:
+        """Return a text table of :meth:`totals`, slowest first."""
+        rows = sorted(self.totals().items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+        width = max([len(name) for name, _ in rows] + [4])
+        lines = [f"{'span':<{width}}{'calls':>7}{'total ms':>11}{'mean ms':>10}{'max ms':>10}{'faces':>10}"]
+        for name, row in rows:
+            lines.append(
+                f"{name:<{width}}{row['calls']:>7}{row['total_ms']:>11.2f}"
+                f"{row['total_ms'] / row['calls']:>10.2f}{row['max_ms']:>10.2f}{row['faces']:>10}"
+            )
+        return "\n".join(lines)
+
+
+def enable(tracer: Optional[Tracer] = None) -> Tracer:
+    """Start recording spans into ``tracer`` (a new one by default)."""
+    global _tracer
+    _tracer = tracer or Tracer()
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Stop recording and return the tracer that was active."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **args: Any):
+    """Return a context manager timing ``name``, or a no-op when disabled."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, name, args)
+
+
+def annotate(**args: Any) -> None:
+    """Attach ``args`` to the innermost open span of this thread."""
+    if _tracer is None:
+        return
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].args.update(args)
+
+
+def traced(name: Optional[str] = None, *, method: bool = False) -> Callable:
+    """Decorate a function so each call is recorded as a span.
+
+    The span is named ``name`` or the function's qualified name; with
+    ``method=True`` the name is taken from the class of ``self`` so
+    subclasses are told apart.  Results that look like meshes have their
+    vertex and face counts recorded.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            span_name = f"{type(args[0]).__name__}.{func.__name__}" if method else label
+            with Span(_tracer, span_name, {}) as s:
+                result = func(*args, **kwargs)
+                # class-level check: lazy nodes would evaluate on attribute access
+                if hasattr(type(result), "faces"):
+                    s.mesh(result)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "enable",
+    "disable",
+    "get_tracer",
+    "span",
+    "annotate",
+    "traced",
+]
@@ -0,0 +1,291 @@
+"""Placement of parts as one immutable 4x4 transform.
+
+A :class:`Placement` is an affine transform that never changes once
+built; every operation returns a new placement.  :class:`Placeable`
+gives primitives and mechanisms the chainable placement methods::
+
+    part = Cylinder(2.0, 10.0).rotate([1, 0, 0], pi / 2).scale(1.5).at(10, 0, 5)
+
+``rotate``, ``scale`` and ``mirror`` act about the part's own origin and
+fold into one linear map in call order, while ``at`` sets where that
+origin ends up, so ``at`` may come before or after them.  ``translate``
+shifts relative to the current position and ``transform`` composes an
+arbitrary world-space matrix on top of everything.  :meth:`Placeable.mesh`
+applies the folded matrix to the shared base mesh in a single pass.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Sequence, TypeVar, Union
+
+import numpy as np
+
+from .cache import mesh_cache_key
+from .core import tm
+from .csg import Leaf, Node, Transform
+
+Vector = Sequence[float]
+
+
+def _frozen(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.array(matrix, dtype=np.float64)
+    if matrix.shape != (4, 4):
+        raise ValueError(f"expected a 4x4 matrix, got shape {matrix.shape}")
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _unit(vector: Vector, what: str) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float64).reshape(3)
+    norm = float(np.sqrt(vector @ vector))
+    if norm == 0.0:
+        raise ValueError(f"{what} must not be the zero vector")
+    return vector / norm
+
+
+class Placement:
+    """Immutable affine transform stored as a read-only 4x4 matrix."""
+
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix: Union[np.ndarray, Sequence[Sequence[float]], None] = None) -> None:
+        self.matrix = _frozen(np.eye(4) if matrix is None else matrix)
+
+    # -- constructors -------------------------------------------------
+
+    @classmethod
+    def translation(cls, offset: Vector) -> "Placement":
+        matrix = np.eye(4)
+        matrix[:3, 3] = offset
+        return cls(matrix)
+
+    @classmethod
+    def rotation(cls, axis: Vector, angle: float) -> "Placement":
+        """Rotation of ``angle`` radians about ``axis`` through the origin."""
+        x, y, z = _unit(axis, "rotation axis")
+        c, s = np.cos(angle), np.sin(angle)
+        t = 1.0 - c
+        matrix = np.eye(4)
+        matrix[:3, :3] = [
+            [t * x * x + c, t * x * y - s * z, t * x * z + s * y],
+            [t * x * y + s * z, t * y * y + c, t * y * z - s * x],
+            [t * x * z - s * y, t * y * z + s * x, t * z * z + c],
+        ]
+        return cls(matrix)
+
+    @classmethod
+    def scaling(cls, factor: Union[float, Vector]) -> "Placement":
+        factors = np.broadcast_to(np.asarray(factor, dtype=np.float64), (3,))
+        if np.any(factors == 0.0):
+            raise ValueError("scale factors must be non-zero")
+        return cls(np.diag([*factors, 1.0]))
+
+    @classmethod
+    def mirroring(cls, normal: Vector) -> "Placement":
+        """Reflection in the plane through the origin with ``normal``."""
+        n = _unit(normal, "mirror normal")
+        matrix = np.eye(4)
+        matrix[:3, :3] -= 2.0 * np.outer(n, n)
+        return cls(matrix)
+
+    # -- properties ---------------------------------------------------
+
+    @property
+    def linear(self) -> np.ndarray:
+        return self.matrix[:3, :3]
+
+    @property
+    def offset(self) -> np.ndarray:
+        return self.matrix[:3, 3]
+
+    @property
+    def is_identity(self) -> bool:
+        return bool(np.array_equal(self.matrix, _IDENTITY))
+
+    @property
+    def flips(self) -> bool:
+        """``True`` when the transform mirrors, reversing face winding."""
+        return bool(np.linalg.det(self.linear) < 0.0)
+
+    # -- composition --------------------------------------------------
+
+    def then(self, other: "Placement") -> "Placement":
+        """Return the placement applying ``self`` first, then ``other``."""
+        return Placement(other.matrix @ self.matrix)
+
+    def __matmul__(self, other: "Placement") -> "Placement":
+        return Placement(self.matrix @ other.matrix)
+
+    def with_linear(self, linear: np.ndarray) -> "Placement":
+        """Return a copy whose linear part is ``linear`` applied after this one's."""
+        matrix = self.matrix.copy()
+        matrix[:3, :3] = np.asarray(linear, dtype=np.float64) @ self.linear
+        return Placement(matrix)
+
+    def with_offset(self, offset: Vector) -> "Placement":
+        matrix = self.matrix.copy()
+        matrix[:3, 3] = offset
+        return Placement(matrix)
+
+    def inverse(self) -> "Placement":
+        return Placement(np.linalg.inv(self.matrix))
+
+    # -- application --------------------------------------------------
+
+    def apply(self, points: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Return ``points`` transformed, written into ``out`` when given.
+
+        One pass over the points: a single matrix product into the
+        output buffer followed by an in-place add of the offset.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if out is None:
+            out = np.empty_like(points)
+        if np.array_equal(self.linear, _IDENTITY[:3, :3]):
+            np.add(points, self.offset, out=out)
+        else:
+            np.matmul(points, self.linear.T, out=out)
+            out += self.offset
+        return out
+
+    def apply_to(self, mesh: tm.Trimesh) -> tm.Trimesh:
+        """Transform ``mesh`` in place and return it.
+
+        Like :meth:`trimesh.Trimesh.apply_transform`, cached normals are
+        carried over (exactly, for a pure translation) and cached
+        topology survives unless the winding is reversed.
+        """
+        if self.is_identity:
+            return mesh
+        cache = mesh._cache
+        normals = {key: getattr(mesh, key) for key in _NORMALS if key in cache}
+        if not np.array_equal(self.linear, _IDENTITY[:3, :3]):
+            # normals transform by the inverse transpose, which also
+            # keeps them outward across a mirror once winding is flipped
+            inverse = np.linalg.inv(self.linear)
+            for key, value in normals.items():
+                normals[key] = tm.util.unitize(value @ inverse)
+        flips = self.flips
+        vertices = self.apply(mesh.vertices.view(np.ndarray))
+        if flips:
+            mesh.faces = np.ascontiguousarray(mesh.faces.view(np.ndarray)[:, ::-1])
+        mesh.vertices = vertices
+        cache.clear(exclude=() if flips else _TOPOLOGY)
+        cache.cache.update(normals)
+        cache.id_set()
+        return mesh
+
+    # -- value semantics ----------------------------------------------
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Placement) and np.array_equal(self.matrix, other.matrix)
+
+    def __hash__(self) -> int:
+        # + 0.0 folds -0.0 into 0.0 so equal matrices hash alike
+        return hash((self.matrix + 0.0).tobytes())
+
+    def __repr__(self) -> str:
+        return f"Placement({self.matrix.tolist()!r})"
+
+
+_IDENTITY = _frozen(np.eye(4))
+IDENTITY = Placement(_IDENTITY)
+
+# mesh cache entries carried across a transform by Placement.apply_to
+_NORMALS = ("face_normals", "vertex_normals")
+_TOPOLOGY = (
+    "face_adjacency",
+    "face_adjacency_edges",
+    "face_adjacency_unshared",
+    "edges",
+    "edges_face",
+    "edges_sorted",
+    "edges_unique",
+    "edges_unique_idx",
+    "edges_unique_inverse",
+    "edges_sparse",
+    "body_count",
+    "faces_unique_edges",
+    "euler_number",
+)
+
+
+# the subclass a chained Placeable method returns (typing.Self needs 3.11)
+_P = TypeVar("_P", bound="Placeable")
+
+
+class Placeable:
+    """Chainable placement shared by primitives and mechanisms.
+
+    Subclasses provide :meth:`base_mesh` returning a fresh, untransformed
+    mesh; the placement itself lives in ``_placement``.
+    """
+
+    _placement: Placement = IDENTITY
+
+    def base_mesh(self) -> tm.Trimesh:
+        raise NotImplementedError
+
+    @property
+    def placement(self) -> Placement:
+        return self._placement
+
+    def at(self: _P, x: float, y: float, z: float) -> _P:
+        """Move the part's origin to ``(x, y, z)``."""
+        self._placement = self._placement.with_offset((x, y, z))
+        return self
+
+    def translate(self: _P, dx: float, dy: float, dz: float) -> _P:
+        """Shift the part by ``(dx, dy, dz)`` from where it is."""
+        self._placement = self._placement.with_offset(self._placement.offset + (dx, dy, dz))
+        return self
+
+    def rotate(self: _P, axis: Vector, angle: float) -> _P:
+        """Rotate the part around ``axis`` by ``angle`` radians."""
+        self._placement = self._placement.with_linear(Placement.rotation(axis, angle).linear)
+        return self
+
+    def scale(self: _P, factor: Union[float, Vector]) -> _P:
+        """Scale the part uniformly or per axis."""
+        self._placement = self._placement.with_linear(Placement.scaling(factor).linear)
+        return self
+
+    def mirror(self: _P, normal: Vector) -> _P:
+        """Mirror the part in the plane with ``normal`` through its origin."""
+        self._placement = self._placement.with_linear(Placement.mirroring(normal).linear)
+        return self
+
+    def transform(self: _P, matrix: Union[Placement, np.ndarray]) -> _P:
+        """Apply a world-space transform on top of the current placement."""
+        other = matrix if isinstance(matrix, Placement) else Placement(matrix)
+        self._placement = self._placement.then(other)
+        return self
+
+    def transform_matrix(self) -> np.ndarray:
+        """Return the 4x4 placement applied by :meth:`mesh`."""
+        return self._placement.matrix.copy()
+
+    def cache_key(self) -> str:
+        """Return the content hash identifying this part's geometry."""
+        return mesh_cache_key(self)
+
+    def copy(self: _P) -> _P:
+        """Return a copy sharing this part's geometry but placed independently."""
+        return copy.copy(self)
+
+    def with_placement(self: _P, placement: Placement) -> _P:
+        """Return a copy sharing this part's geometry placed at ``placement``."""
+        part = copy.copy(self)
+        part._placement = placement
+        return part
+
+    def node(self) -> Node:
+        """Return a lazy :class:`~parametric_cad.csg.Node` for this part."""
+        return Transform(Leaf(self), self.transform_matrix())
+
+    def mesh(self) -> tm.Trimesh:
+        return self._placement.apply_to(self.base_mesh())
+
+
+__all__ = ["Placement", "Placeable", "IDENTITY"]
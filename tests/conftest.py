@@ -0,0 +1,15 @@
+import pytest
+
+from parametric_cad import booleans
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Give a test its own engine registry and stats.
+
+    Engines registered with ``register_engine`` during the test are
+    dropped afterwards, so they cannot leak into later tests.
+    """
+
+    monkeypatch.setattr(booleans, "_engines", dict(booleans._engines))
+    monkeypatch.setattr(booleans, "_stats", {})
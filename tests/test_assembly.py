@@ -0,0 +1,71 @@
+import zipfile
+
+import numpy as np
+import pytest
+
+from parametric_cad import Assembly, Box, ButtHinge, Cylinder
+from parametric_cad.core import combine, tm
+from parametric_cad.export.threemf import ThreeMFExporter
+from parametric_cad.patterns import linear_transforms
+
+
+def _bracket():
+    bracket = Assembly("bracket")
+    bracket.add("base", Box(60, 40, 3).at(30, 20, 1.5))
+    bracket.add_array("screw", Cylinder(1.5, 8.0).at(10, 10, 4), linear_transforms(4, [13, 0, 0]))
+    return bracket
+
+
+def test_identical_parts_share_one_definition():
+    bracket = _bracket()
+    assert len(bracket) == 5
+    assert len(bracket.definitions) == 2
+    parts = bracket.parts()
+    assert [p.path for p in parts][-1] == "screw[3]"
+    assert parts[1].part is parts[4].part
+    flat = bracket.mesh()
+    expected = combine([part for _, part in bracket.items()])
+    assert np.allclose(flat.bounds, expected.bounds)
+    assert flat.volume == pytest.approx(expected.volume)
+
+
+def test_bounds_queries_use_placement_without_meshing():
+    car = Assembly("car")
+    car.add("frame", _bracket(), np.diag([1.0, 1.0, 1.0, 1.0]))
+    car.add("lid", Box(60, 40, 2).at(30, 20, 20))
+    car.at(100, 0, 0)
+    assert np.allclose(car.bounds("frame/screw[1]"), [[121.5, 8.5, 0], [124.5, 11.5, 8]], atol=0.1)
+    assert np.allclose(car.bounds("frame"), [[100, 0, 0], [160, 40, 8]])
+    assert car.clearance("frame", "lid") == pytest.approx(11.0)
+    assert car.overlaps() == [("frame/base", f"frame/screw[{i}]") for i in range(4)]
+    # screws sit 10 mm apart and 11 mm below the lid
+    assert len(car.overlaps(clearance=10.5)) == 7
+    assert len(car.overlaps(clearance=12.0)) == 11
+    assert "frame/base" in car and "frame/nothing" not in car
+    with pytest.raises(KeyError):
+        car.bounds("wheel")
+
+
+def test_tree_changes_invalidate_cached_bounds():
+    bracket = _bracket()
+    before = bracket.bounds()
+    bracket.remove("base")
+    assert len(bracket.definitions) == 1
+    assert bracket.bounds()[0, 0] > before[0, 0]
+    with pytest.raises(ValueError):
+        bracket.add("screw[0]", Box(1, 1, 1))
+    with pytest.raises(ValueError):
+        bracket.add("self", bracket)
+
+
+def test_threemf_streams_one_object_per_part(tmp_path):
+    door = Assembly("door")
+    door.add("panel", Box(100, 3, 40).at(50, 64.5, 20))
+    door.add("hinge", ButtHinge(leaf_length=40, pin_diameter=3).at(50, 61.5, 20))
+    door.add("spare_hinge", ButtHinge(leaf_length=40, pin_diameter=3).at(50, 61.5, 60))
+    path = ThreeMFExporter(output_dir=tmp_path, validate=False).export_meshes(door, "door")
+    with zipfile.ZipFile(path) as archive:
+        model = archive.read("3D/3dmodel.model").decode("utf-8")
+    assert model.count("<mesh>") == 2
+    assert 'name="spare_hinge"' in model
+    assert isinstance(door.mesh(), tm.Trimesh)
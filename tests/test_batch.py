@@ -0,0 +1,89 @@
+import json
+import os
+import time
+
+import pytest
+
+from parametric_cad.batch import PartSpec, load_manifest, main, resolve_class, run_batch
+from parametric_cad.primitives.box import Box
+
+
+class SlowBox(Box):
+    """Box whose meshing hangs, standing in for a stuck OpenSCAD call."""
+
+    def _create_mesh(self):
+        time.sleep(30)
+        return super()._create_mesh()
+
+
+class CrashingBox(Box):
+    """Box whose meshing kills its process, like a segfault or OOM kill."""
+
+    def _create_mesh(self):
+        os._exit(1)
+
+
+def test_resolve_class_finds_package_and_mechanism_classes():
+    assert resolve_class("Box") is Box
+    assert resolve_class("RightAngleMotorBracket").__name__ == "RightAngleMotorBracket"
+    assert resolve_class("parametric_cad.primitives.box:Box") is Box
+    with pytest.raises(ValueError):
+        resolve_class("NoSuchPart")
+
+
+def test_run_batch_exports_parts_with_stage_timings(tmp_path):
+    parts = [
+        {"class": "Box", "params": {"width": 10, "depth": 10, "height": 10}, "output": "box"},
+        {"class": "Cylinder", "params": {"radius": 5, "height": 10}, "output": "cyl"},
+        {"class": "Box", "params": {"width": 300, "depth": 1, "height": 1}, "output": "too_big"},
+    ]
+    report = run_batch(parts, str(tmp_path), workers=2)
+    by_name = {r.output: r for r in report.results}
+    assert by_name["box"].ok and os.path.isfile(by_name["box"].path)
+    assert by_name["cyl"].ok
+    assert by_name["too_big"].status == "failed"
+    assert "Printability validation failed" in by_name["too_big"].error
+    assert {"build", "mesh", "validate", "write"} <= set(by_name["box"].timings)
+    assert "too_big" in report.summary()
+
+
+def test_run_batch_times_out_and_retries_hung_parts(tmp_path):
+    parts = [
+        PartSpec("test_batch:SlowBox", "slow", {"width": 1, "depth": 1, "height": 1}),
+        PartSpec("Box", "fast", {"width": 1, "depth": 1, "height": 1}),
+    ]
+    start = time.perf_counter()
+    report = run_batch(parts, str(tmp_path), workers=2, timeout=1.0, retries=1)
+    assert time.perf_counter() - start < 20
+    slow, fast = report.results
+    assert slow.status == "timeout"
+    assert slow.attempts == 2
+    assert fast.ok
+
+
+@pytest.mark.parametrize("timeout", [None, 5.0])
+def test_run_batch_gives_up_on_parts_that_kill_their_worker(tmp_path, timeout):
+    parts = [
+        PartSpec("test_batch:CrashingBox", "crash", {"width": 1, "depth": 1, "height": 1}),
+        PartSpec("Box", "fast", {"width": 1, "depth": 1, "height": 1}),
+    ]
+    start = time.perf_counter()
+    report = run_batch(parts, str(tmp_path), workers=1, timeout=timeout, retries=1)
+    assert time.perf_counter() - start < 30
+    crash, fast = report.results
+    assert crash.status == "crashed"
+    assert crash.attempts == 2
+    assert fast.ok
+
+
+def test_cli_reads_manifest_and_writes_report(tmp_path):
+    manifest = tmp_path / "parts.json"
+    manifest.write_text(json.dumps({
+        "output_dir": str(tmp_path / "out"),
+        "parts": [{"class": "Cylinder", "params": {"radius": 5, "height": 2}, "output": "disc"}],
+    }))
+    assert load_manifest(manifest)["parts"][0].cls == "Cylinder"
+    report_path = tmp_path / "report.json"
+    assert main([str(manifest), "-j", "1", "--report", str(report_path)]) == 0
+    assert (tmp_path / "out" / "disc.stl").is_file()
+    assert json.loads(report_path.read_text())["parts"][0]["status"] == "ok"
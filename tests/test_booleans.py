@@ -0,0 +1,57 @@
+import pytest
+
+from parametric_cad.booleans import (
+    BooleanError,
+    difference,
+    engine_stats,
+    merge_cutters,
+    register_engine,
+)
+from parametric_cad.core import safe_difference, tm
+from parametric_cad.primitives.box import Box
+from parametric_cad.primitives.cylinder import Cylinder
+
+
+def test_merge_cutters_groups_disjoint_operands():
+    cutters = [Cylinder(0.5, 2.0, sections=8).at(x, 0, 0).mesh() for x in (0, 2, 4, 6)]
+    cutters.append(Cylinder(0.5, 2.0, sections=8).at(0.2, 0, 0).mesh())
+    merged = merge_cutters(cutters)
+    assert len(merged) == 2
+    assert sum(len(m.faces) for m in merged) == sum(len(c.faces) for c in cutters)
+
+
+def test_engine_called_once_with_merged_operands(engines):
+    calls = []
+
+    @register_engine("recording")
+    def recording(mesh, operands):
+        calls.append(len(operands))
+        return mesh
+
+    target = Box(10, 10, 1).mesh()
+    cutters = [Cylinder(0.5, 2.0, sections=8).at(x, 0, 0).mesh() for x in (-3, 0, 3)]
+    safe_difference(target, cutters, engine="recording")
+    assert calls == [1]
+    assert engine_stats()["recording"].calls == 1
+
+
+def test_strict_mode_raises_instead_of_returning_input(engines):
+    @register_engine("broken")
+    def broken(mesh, operands):
+        raise RuntimeError("boom")
+
+    target = Box(1, 1, 1).mesh()
+    cutter = Box(0.5, 0.5, 0.5).mesh()
+    assert difference(target, cutter, engine="broken", fallbacks=()) is target
+    with pytest.raises(BooleanError):
+        difference(target, cutter, engine="broken", fallbacks=(), strict=True)
+    assert engine_stats()["broken"].failures == 2
+
+
+def test_manifold_engine_removes_material():
+    pytest.importorskip("manifold3d")
+    target = Box(2, 2, 2).mesh()
+    cutter = Box(1, 1, 3).mesh()
+    result = safe_difference(target, cutter, engine="manifold", strict=True)
+    assert isinstance(result, tm.Trimesh)
+    assert result.volume == pytest.approx(8.0 - 2.0)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from parametric_cad.cache import MeshCache, mesh_cache_key, set_mesh_cache
+from parametric_cad.primitives.box import Box
+from parametric_cad.primitives.cylinder import Cylinder
+from parametric_cad.primitives.sprocket import ChainSprocket
+from parametric_cad.tessellation import TessellationPolicy, tessellation
+
+
+@pytest.fixture
+def cache():
+    cache = MeshCache()
+    previous = set_mesh_cache(cache)
+    yield cache
+    set_mesh_cache(previous)
+
+
+def test_cache_key_ignores_placement_but_not_parameters():
+    assert mesh_cache_key(Box(1, 2, 3)) == mesh_cache_key(Box(1, 2, 3).at(5, 0, 0))
+    assert mesh_cache_key(Box(1, 2, 3)) != mesh_cache_key(Box(1, 2, 4))
+    assert mesh_cache_key(ChainSprocket(teeth=12)) != mesh_cache_key(ChainSprocket(teeth=13))
+
+
+def test_cache_hits_apply_transform_after_lookup(cache):
+    first = Box(1.0, 1.0, 1.0).at(1.0, 0.0, 0.0).mesh()
+    second = Box(1.0, 1.0, 1.0).at(0.0, 2.0, 0.0).mesh()
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+    assert np.allclose(first.centroid, [1.0, 0.0, 0.0])
+    assert np.allclose(second.centroid, [0.0, 2.0, 0.0])
+
+
+def test_cache_key_covers_the_whole_tessellation_policy(cache):
+    fine = Cylinder(20, 5).mesh()
+    with tessellation(TessellationPolicy(tolerance=0.05, max_segments=12)):
+        coarse = Cylinder(20, 5).mesh()
+    assert cache.stats.hits == 0
+    assert len(coarse.faces) < len(fine.faces)
+
+
+def test_cache_evicts_least_recently_used():
+    mesh = Box(1, 1, 1).base_mesh()
+    size = mesh.vertices.nbytes + mesh.faces.nbytes
+    cache = MeshCache(max_bytes=2 * size)
+    for key in "abc":
+        cache.put(key, mesh)
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+
+def test_disk_tier_round_trip(tmp_path):
+    mesh = ChainSprocket(teeth=10).base_mesh()
+    key = mesh_cache_key(ChainSprocket(teeth=10))
+    MeshCache(cache_dir=tmp_path).put(key, mesh)
+    fresh = MeshCache(cache_dir=tmp_path)
+    loaded = fresh.get(key)
+    assert fresh.stats.disk_hits == 1
+    assert np.array_equal(loaded.vertices, mesh.vertices)
+    assert np.array_equal(loaded.faces, mesh.faces)
+    assert np.array_equal(loaded.face_normals, mesh.face_normals)
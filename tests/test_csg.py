@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from parametric_cad.booleans import register_engine
+from parametric_cad.core import combine, safe_difference, tm
+from parametric_cad.csg import Difference, Union
+from parametric_cad.primitives.box import Box
+from parametric_cad.primitives.cylinder import Cylinder
+
+
+def test_lazy_helpers_defer_evaluation():
+    node = combine([Box(1, 1, 1), Box(1, 1, 1).at(2, 0, 0)], lazy=True)
+    assert isinstance(node, Union)
+    assert node._result is None
+    assert np.allclose(node.bounds, [[-0.5, -0.5, -0.5], [2.5, 0.5, 0.5]])
+    assert node._result is None
+    assert isinstance(node.mesh(), tm.Trimesh)
+    assert node.is_watertight
+
+
+def test_identical_subtrees_are_built_once():
+    holes = [Cylinder(0.5, 3.0, sections=8).at(x, 0, 0) for x in range(-3, 5)]
+    node = combine(holes, lazy=True)
+    mesh = node.mesh()
+    # One leaf, eight transforms and the union
+    assert node.stats.nodes_built == 10
+    assert node.stats.nodes_reused == 7
+    assert len(mesh.faces) == 8 * len(holes[0].mesh().faces)
+
+
+def test_difference_prunes_cutters_outside_target(engines):
+    calls = []
+
+    @register_engine("counting")
+    def counting(mesh, operands):
+        calls.append(len(operands))
+        return mesh
+
+    plate = Box(10, 10, 1)
+    inside = Cylinder(1, 2, sections=8).at(2, 2, 0)
+    outside = Cylinder(1, 2, sections=8).at(40, 0, 0)
+    node = safe_difference(plate, [inside, outside], engine="counting", lazy=True)
+    assert isinstance(node, Difference)
+    node.mesh()
+    assert node.stats.cutters_pruned == 1
+    assert node.stats.booleans == 1
+
+    missed = safe_difference(plate, [outside], engine="counting", lazy=True)
+    missed.mesh()
+    assert missed.stats.booleans == 0
+    assert calls == [1]
+
+
+def test_lazy_matches_eager_geometry():
+    pytest.importorskip("manifold3d")
+    plate = Box(10, 10, 2)
+    hole = Cylinder(1, 4, sections=16).at(2, 2, 0)
+    eager = safe_difference(plate.mesh(), hole.mesh())
+    lazy = safe_difference(plate, hole, lazy=True)
+    assert lazy.volume == pytest.approx(eager.volume)
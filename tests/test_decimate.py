@@ -0,0 +1,43 @@
+import pytest
+
+from parametric_cad.decimate import decimate, surface_deviation
+from parametric_cad.export.stl import STLExporter
+from parametric_cad.primitives.box import Box
+from parametric_cad.primitives.cylinder import Cylinder
+from parametric_cad.primitives.sphere import Sphere
+
+
+def test_decimate_to_budget_keeps_mesh_watertight():
+    mesh = Sphere(10.0, subdivisions=3).mesh()
+    result, report = decimate(mesh, target_triangles=320)
+    assert len(result.faces) <= 320
+    assert report.faces_before == len(mesh.faces)
+    assert report.faces_after == len(result.faces)
+    assert result.is_watertight and result.is_winding_consistent
+    assert result.volume == pytest.approx(mesh.volume, rel=0.02)
+    assert report.max_error == pytest.approx(surface_deviation(mesh, result))
+
+
+def test_decimate_respects_max_deviation():
+    mesh = Sphere(10.0, subdivisions=4).mesh()
+    result, report = decimate(mesh, max_deviation=0.05)
+    assert len(result.faces) < len(mesh.faces)
+    assert report.max_error <= 0.05
+    # flat faces of a box carry no error but its corners must stay put
+    box, _ = decimate(Box(10.0, 6.0, 4.0).mesh(), max_deviation=0.0)
+    assert box.bounds.tolist() == [[-5.0, -3.0, -2.0], [5.0, 3.0, 2.0]]
+
+
+def test_decimate_requires_a_limit():
+    with pytest.raises(ValueError):
+        decimate(Box(1.0, 1.0, 1.0).mesh())
+
+
+def test_exporter_decimates_before_validation(tmp_path):
+    disc = Cylinder(20.0, 4.0, sections=256).at(0, 0, 2)
+    exporter = STLExporter(output_dir=tmp_path, binary=True, max_deviation=0.05)
+    exporter.export_mesh(disc, "disc", preview=False)
+    report = exporter.last_decimation
+    assert report.faces_after < report.faces_before
+    assert report.max_error <= 0.05
+    assert "decimate" in exporter.last_timings
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import parametric_cad
+from parametric_cad import tessellation
+from parametric_cad.core import lazy_module, tm
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(parametric_cad.__file__)))
+
+
+def _run(code, cwd=None):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, "-c", textwrap.dedent(code)], check=True, cwd=cwd, env=env)
+
+
+def test_import_defers_geometry_backends():
+    _run(
+        """
+        import sys
+        import parametric_cad
+        heavy = {"numpy", "trimesh", "shapely"} & set(sys.modules)
+        assert not heavy, heavy
+        from parametric_cad.primitives import Box
+        assert Box(1, 2, 3).mesh().volume == 6.0
+        """
+    )
+
+
+def test_public_names_resolve():
+    for name in parametric_cad.__all__:
+        assert getattr(parametric_cad, name) is not None
+        assert name in dir(parametric_cad)
+    # the function wins over the submodule of the same name
+    assert callable(tessellation)
+    assert lazy_module("trimesh").Trimesh is tm.Trimesh
+
+
+def test_hinge_does_not_create_output_dir(tmp_path):
+    _run(
+        """
+        import os
+        from parametric_cad import ButtHinge
+        ButtHinge()
+        assert not os.path.exists("output")
+        """,
+        cwd=tmp_path,
+    )
@@ -0,0 +1,81 @@
+import pytest
+
+from parametric_cad import Box, Cylinder, safe_difference
+from parametric_cad.model import Model
+from parametric_cad.tessellation import TessellationPolicy, tessellation
+
+
+def _plate_model():
+    model = Model(length=30.0, thickness=2.0, spacing=12.0)
+
+    @model.feature
+    def plate(p):
+        return Box(p.length, 20.0, p.thickness).at(0, 0, p.thickness / 2).mesh()
+
+    @model.feature
+    def holes(p):
+        return [Cylinder(1.5, 4.0).at(x * p.spacing / 2, 0, 1).mesh() for x in (-1, 1)]
+
+    @model.feature
+    def part(p):
+        return safe_difference(p.plate, p.holes)
+
+    return model
+
+
+def test_only_affected_features_rebuild():
+    model = _plate_model()
+    full = model.mesh().volume
+    assert model.rebuilt == ["plate", "holes", "part"]
+    model.set(spacing=16.0)
+    assert model.mesh().volume == pytest.approx(full)
+    assert model.rebuilt == ["holes", "part"]
+    model.set(spacing=12.0)
+    model.mesh()
+    assert model.rebuilt == []
+    model.set(thickness=3.0)
+    model.mesh()
+    assert model.rebuilt == ["plate", "part"]
+    assert model.inputs("holes") == ("spacing",)
+    with pytest.raises(ValueError):
+        model.set(width=3.0)
+
+
+def test_branches_and_handed_out_parts():
+    model = Model(rounded=False, radius=2.0, size=4.0)
+    calls = []
+
+    @model.feature
+    def body(p):
+        calls.append("body")
+        return Cylinder(p.radius, 1.0) if p.rounded else Box(p.size, p.size, 1.0)
+
+    @model.feature
+    def placed(p):
+        return p.body.at(10, 0, 0)
+
+    model.evaluate()
+    model.set(radius=3.0)  # not read while rounded is False
+    assert model.evaluate().mesh().bounds[0][0] == pytest.approx(8.0)
+    assert calls == ["body"]
+    # placing the copy handed to ``placed`` left the memoized body alone
+    assert model["body"].mesh().bounds[0][0] == pytest.approx(-2.0)
+    model.set(rounded=True)
+    assert model.evaluate().mesh().bounds[0][0] == pytest.approx(7.0, abs=0.01)
+
+
+def test_redefinition_tessellation_and_cycles():
+    model = _plate_model()
+    model.mesh()
+    model.add_feature("holes", lambda p: [Cylinder(1.0, 4.0).mesh()])
+    model.mesh()
+    assert model.rebuilt == ["holes", "part"]
+    with tessellation(TessellationPolicy(tolerance=0.01)):
+        model.mesh()
+    assert model.rebuilt == ["plate", "holes", "part"]
+
+    looped = Model()
+    looped.add_feature("a", lambda p: p.b)
+    looped.add_feature("b", lambda p: p.a)
+    with pytest.raises(ValueError, match="a -> b -> a"):
+        looped.evaluate("a")
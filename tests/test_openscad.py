@@ -0,0 +1,120 @@
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from parametric_cad.booleans import BooleanError, engine_stats
+from parametric_cad.core import safe_difference, tm
+from parametric_cad.openscad import (
+    ScadService,
+    _layout,
+    _Request,
+    batch_program,
+    configure_scad_service,
+    shutdown_scad_service,
+    split_cells,
+)
+from parametric_cad.primitives.box import Box
+
+# Stand-in for the OpenSCAD CLI understanding the programs ScadService
+# generates; booleans run on manifold3d.  A tetrahedron operand hangs it.
+FAKE_OPENSCAD = textwrap.dedent(
+    """\
+    #!{python}
+    import re, sys, time
+    import numpy as np
+
+    def read(name):
+        data = open(name, "rb").read()
+        count = int(np.frombuffer(data, "<u4", 1, 80)[0])
+        if count == 4:
+            time.sleep(60)
+        dtype = np.dtype([("n", "<f4", 3), ("v", "<f4", (3, 3)), ("a", "<u2")])
+        tris = np.frombuffer(data, dtype, count, 84)["v"].reshape(-1, 3)
+        verts, index = np.unique(tris, axis=0, return_inverse=True)
+        return manifold3d.Manifold(manifold3d.Mesh(verts, index.reshape(-1, 3).astype(np.uint32)))
+
+    args = sys.argv[1:]
+    out = args[args.index("-o") + 1]
+    program = open(args[-1]).read()
+    import manifold3d
+    total = None
+    pattern = r"translate\\(\\[(\\S+), (\\S+), (\\S+)\\]\\) (\\w+)\\(\\) \\{{(.*?)\\}}"
+    for x, y, z, op, body in re.findall(pattern, program, re.S):
+        parts = [read(n) for n in re.findall(r'import\\("(.*?)"\\)', body)]
+        result = parts[0]
+        for part in parts[1:]:
+            result = result - part if op == "difference" else result + part
+        result = result.translate([float(x), float(y), float(z)])
+        total = result if total is None else total + result
+    mesh = total.to_mesh()
+    tris = mesh.vert_properties[mesh.tri_verts]
+    with open(out, "wb") as f:
+        f.write(bytes(80) + np.uint32(len(tris)).tobytes())
+        blob = np.zeros(len(tris), [("n", "<f4", 3), ("v", "<f4", (3, 3)), ("a", "<u2")])
+        blob["v"] = tris
+        f.write(blob.tobytes())
+    """
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fake binary is a shebang script")
+
+
+@pytest.fixture
+def fake_scad(tmp_path):
+    pytest.importorskip("manifold3d")
+    path = tmp_path / "openscad"
+    path.write_text(FAKE_OPENSCAD.format(python=sys.executable))
+    path.chmod(0o755)
+    return str(path)
+
+
+def _plate(x):
+    return Box(4.0, 4.0, 2.0).at(x, 0, 0).mesh(), Box(1.0, 1.0, 4.0).at(x, 0, 0).mesh()
+
+
+def test_batch_layout_round_trip():
+    requests = [_Request("difference", list(_plate(x))) for x in (-10.0, 0.0, 25.0)]
+    offsets, cell, columns = _layout(requests)
+    program = batch_program(requests, offsets)
+    assert program.count("difference() {") == 3
+    assert 'import("r2_1.stl");' in program
+    placed = tm.util.concatenate(
+        [r.meshes[0].copy().apply_translation(o) for r, o in zip(requests, offsets)]
+    )
+    for part, request in zip(split_cells(placed, offsets, cell, columns), requests):
+        assert np.allclose(part.bounds, request.meshes[0].bounds)
+
+
+def test_service_batches_concurrent_requests(fake_scad):
+    with ScadService(fake_scad, max_processes=1, batch_window=0.5) as service:
+        futures = [service.submit("difference", list(_plate(x))) for x in range(6)]
+        results = [f.result(timeout=60) for f in futures]
+        union = service.union([Box(2, 2, 2).mesh(), Box(2, 2, 2).at(1, 0, 0).mesh()])
+    assert [r.volume for r in results] == pytest.approx([32.0 - 2.0] * 6)
+    assert results[3].bounds[0, 0] == pytest.approx(1.0)
+    assert union.volume == pytest.approx(12.0)
+    assert service.invocations < 6
+
+
+def test_hung_request_fails_alone(fake_scad):
+    tetra = tm.creation.icosphere(subdivisions=0)
+    tetra = tm.Trimesh(tetra.vertices[:4], [[0, 1, 2], [0, 2, 3], [0, 3, 1], [1, 3, 2]])
+    with ScadService(fake_scad, max_processes=2, batch_window=0.5, timeout=2.0) as service:
+        good = service.submit("difference", list(_plate(0.0)))
+        bad = service.submit("difference", [Box(4, 4, 2).mesh(), tetra])
+        with pytest.raises(BooleanError, match="timed out"):
+            bad.result(timeout=60)
+        assert good.result(timeout=60).volume == pytest.approx(30.0)
+
+
+def test_scad_engine_uses_shared_service(fake_scad):
+    configure_scad_service(binary=fake_scad)
+    try:
+        before = engine_stats().get("scad")
+        result = safe_difference(*_plate(0.0), engine="scad", strict=True)
+    finally:
+        shutdown_scad_service()
+    assert result.volume == pytest.approx(30.0)
+    assert engine_stats()["scad"].calls == (before.calls if before else 0) + 1
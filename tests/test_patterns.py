@@ -0,0 +1,50 @@
+from math import pi
+
+import numpy as np
+import pytest
+
+from parametric_cad.core import tm
+from parametric_cad.patterns import (
+    instance_mesh,
+    linear_array,
+    polar_array,
+    polar_transforms,
+)
+from parametric_cad.primitives.box import Box
+
+
+def test_polar_transforms_match_rotation_matrix():
+    transforms = polar_transforms(6, axis=[1, 1, 0], center=[1, 2, 3])
+    for i, matrix in enumerate(transforms):
+        expected = tm.transformations.rotation_matrix(2 * pi * i / 6, [1, 1, 0], [1, 2, 3])
+        assert np.allclose(matrix, expected)
+    assert polar_transforms(0).shape == (0, 4, 4)
+    assert polar_transforms(0, angle=pi).shape == (0, 4, 4)
+
+
+def test_polar_array_matches_per_copy_transforms():
+    template = Box(1, 1, 1).at(5, 0, 0).mesh()
+    arrayed = polar_array(template, 12)
+    copies = [
+        template.copy().apply_transform(tm.transformations.rotation_matrix(2 * pi * i / 12, [0, 0, 1]))
+        for i in range(12)
+    ]
+    expected = tm.util.concatenate(copies)
+    assert np.allclose(arrayed.vertices, expected.vertices)
+    assert np.array_equal(arrayed.faces, expected.faces)
+    assert arrayed.volume == pytest.approx(12.0)
+
+
+def test_linear_array_offsets_faces_and_vertices():
+    template = Box(1, 1, 1).mesh()
+    arrayed = linear_array(template, 4, [2, 0, 0])
+    assert len(arrayed.vertices) == 4 * len(template.vertices)
+    assert arrayed.faces.max() == len(arrayed.vertices) - 1
+    assert arrayed.bounds[1, 0] == pytest.approx(6.5)
+
+
+def test_mirrored_instances_keep_outward_normals():
+    template = Box(1, 1, 1).at(2, 0, 0).mesh()
+    mirror = np.diag([-1.0, 1.0, 1.0, 1.0])
+    arrayed = instance_mesh(template, np.stack([np.eye(4), mirror]))
+    assert arrayed.volume == pytest.approx(2.0)
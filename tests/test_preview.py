@@ -0,0 +1,67 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from parametric_cad.export.preview import (
+    PreviewRenderer,
+    available_backends,
+    contact_sheet,
+    encode_png,
+    rasterize,
+    view_cameras,
+)
+from parametric_cad.export.stl import STLExporter
+from parametric_cad.primitives.box import Box
+
+
+def _decode_png(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", data[16:24])
+    idat_len = struct.unpack(">I", data[33:37])[0]
+    raw = zlib.decompress(data[41:41 + idat_len])
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, width * 3 + 1)
+    return rows[:, 1:].reshape(height, width, 3)
+
+
+def test_rasterize_all_views():
+    mesh = Box(2.0, 2.0, 2.0).mesh()
+    images = rasterize(mesh, view_cameras(mesh), resolution=(64, 48))
+    assert len(images) == 8
+    for image in images:
+        assert image.shape == (48, 64, 3)
+        covered = np.any(image != 255, axis=2)
+        assert covered[24, 32]
+        assert not covered[0, 0]
+    # Top view of a cube is a single flat-shaded square
+    top = images[6][np.any(images[6] != 255, axis=2)]
+    assert len(np.unique(top, axis=0)) == 1
+
+
+def test_png_round_trip():
+    image = np.random.default_rng(0).integers(0, 255, (5, 7, 3), dtype=np.uint8)
+    assert np.array_equal(_decode_png(encode_png(image)), image)
+
+
+def test_contact_sheet_layout():
+    images = [np.full((4, 6, 3), i, dtype=np.uint8) for i in range(8)]
+    sheet = contact_sheet(images)
+    assert sheet.shape == (8, 24, 3)
+    assert sheet[5, 7, 0] == 5
+
+
+def test_unknown_backend():
+    assert "numpy" in available_backends()
+    with pytest.raises(ValueError):
+        PreviewRenderer(backend="missing")
+
+
+def test_exporter_async_previews_and_contact_sheet(tmp_path):
+    exporter = STLExporter(output_dir=tmp_path, contact_sheet=True, preview_async=True)
+    exporter.export_mesh(Box(1.0, 1.0, 1.0), "box")
+    paths = exporter.wait_previews()
+    names = sorted(p.name for p in paths)
+    assert names == sorted([f"box_view{i}.png" for i in range(1, 9)] + ["box_views.png"])
+    sheet = _decode_png((tmp_path / "box_views.png").read_bytes())
+    assert sheet.shape == (1200, 2400, 3)
@@ -69,3 +69,32 @@ def test_primitive_inheritance():
     assert isinstance(Sphere(1), Primitive)
     assert isinstance(SpurGear(module=1.0, teeth=8), Primitive)
     assert isinstance(ChainSprocket(), Primitive)
+
+
+@pytest.mark.parametrize("teeth", [8, 20, 61])
+def test_spur_gear_2d_mode_is_watertight_without_booleans(teeth):
+    gear = SpurGear(module=1.0, teeth=teeth, bore_diameter=3.0)
+    mesh = gear.mesh()
+    assert gear.mode == "2d"
+    assert mesh.is_watertight
+    outer = gear.pitch_diameter / 2 + gear.addendum
+    root = gear.pitch_diameter / 2 - gear.dedendum
+    assert mesh.extents[0] <= 2 * outer + 1e-6
+    assert pi * root ** 2 * gear.width < mesh.volume < pi * outer ** 2 * gear.width
+
+
+def test_spur_gear_3d_mode_still_available():
+    mesh = SpurGear(module=1.0, teeth=20, mode="3d").mesh()
+    assert isinstance(mesh, tm.Trimesh)
+    with pytest.raises(ValueError):
+        SpurGear(module=1.0, teeth=20, mode="bogus")
+
+
+def test_chain_sprocket_2d_outline_has_bore_and_open_seats():
+    sprocket = ChainSprocket(teeth=12, bore_diameter=10.0)
+    outline = sprocket.outline()
+    assert len(outline.interiors) == 1
+    assert outline.area < pi * sprocket.outer_radius ** 2 - pi * 5.0 ** 2
+    mesh = sprocket.mesh()
+    assert mesh.is_watertight
+    assert mesh.volume == pytest.approx(outline.area * sprocket.thickness)
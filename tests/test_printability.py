@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from parametric_cad.primitives.box import Box
 from parametric_cad.printability import PrintabilityValidator
@@ -17,3 +18,52 @@ def test_dimension_violation():
     validator = PrintabilityValidator(RULES_PATH)
     errors = validator.validate_mesh(big_box.mesh())
     assert any("X dimension" in e for e in errors)
+
+
+def test_checks_ordered_cheapest_first():
+    validator = PrintabilityValidator(RULES_PATH)
+    costs = [c.cost for c in validator.checks]
+    assert costs == sorted(costs)
+    assert validator.checks[-1].name == "self_intersection"
+
+
+def test_fail_fast_stops_at_first_error():
+    mesh = Box(300.0, 300.0, 0.1).mesh()
+    full = PrintabilityValidator(RULES_PATH).validate_mesh(mesh)
+    validator = PrintabilityValidator(RULES_PATH, fail_fast=True)
+    errors = validator.validate_mesh(mesh)
+    assert len(errors) < len(full)
+    assert errors[0].startswith("X dimension")
+    assert "overhang" not in validator.last_timings
+
+
+def test_results_cached_by_content():
+    validator = PrintabilityValidator(RULES_PATH)
+    validator.validate_mesh(Box(10.0, 10.0, 10.0).mesh())
+    assert set(validator.last_timings) == {c.name for c in validator.checks}
+    validator.validate_mesh(Box(10.0, 10.0, 10.0).mesh())
+    assert validator.last_timings == {}
+
+
+def test_threaded_matches_serial():
+    mesh = Box(300.0, 10.0, 0.2).mesh()
+    serial = PrintabilityValidator(RULES_PATH, cache_size=0).validate_mesh(mesh)
+    threaded = PrintabilityValidator(RULES_PATH, workers=4, cache_size=0).validate_mesh(mesh)
+    assert threaded == serial
+
+
+def test_through_hole_is_not_an_open_edge():
+    from parametric_cad.primitives.gear import SpurGear
+
+    validator = PrintabilityValidator(RULES_PATH)
+    errors = validator.validate_mesh(SpurGear(module=1.0, teeth=20).mesh())
+    assert "Mesh has open edges" not in errors
+
+
+def test_rules_file_reloaded_on_change(tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text('{"rules": {"max_model_size_mm": {"X": 5}}}')
+    assert PrintabilityValidator(rules).validate_mesh(Box(10.0, 1.0, 1.0).mesh())
+    rules.write_text('{"rules": {"max_model_size_mm": {"X": 50}}}')
+    os.utime(rules, ns=(0, 10**9))
+    assert PrintabilityValidator(rules).validate_mesh(Box(10.0, 1.0, 1.0).mesh()) == []
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from parametric_cad.core import combine, tm
+from parametric_cad.export.stl import STLExporter
+from parametric_cad.primitives.box import Box
+from parametric_cad.primitives.cylinder import Cylinder
+from parametric_cad.repair import repair_mesh, voxel_remesh
+
+
+def _part():
+    return combine([Box(10, 10, 10).at(0, 0, 5), Cylinder(3, 20).at(0, 0, 10)])
+
+
+def test_repair_fixes_soup_winding_and_holes():
+    part = _part()
+    rng = np.random.default_rng(0)
+    # unwelded triangle soup, a third of the faces flipped, one face missing
+    faces = np.arange(len(part.faces) * 3).reshape(-1, 3)
+    flip = rng.choice(len(faces), len(faces) // 3, replace=False)
+    faces[flip] = faces[flip][:, ::-1]
+    broken = tm.Trimesh(part.triangles.reshape(-1, 3), faces[1:], process=False)
+
+    repaired, report = repair_mesh(broken)
+    assert repaired.is_watertight and repaired.is_winding_consistent
+    assert repaired.volume == pytest.approx(part.volume)
+    assert report.merged_vertices > 0
+    assert report.holes_filled == 1
+    assert report.watertight and not report.remeshed and not report.hull
+    assert set(report.steps) >= {"merge", "winding", "stitch", "normals"}
+
+
+def test_repair_drops_duplicates_and_turns_shells_outwards():
+    part = _part()
+    faces = np.concatenate([part.faces[:, ::-1], part.faces[:5, ::-1]])
+    repaired, report = repair_mesh(tm.Trimesh(part.vertices, faces, process=False))
+    assert report.duplicate_faces == 5
+    assert repaired.volume == pytest.approx(part.volume)
+
+
+def test_voxel_remesh_closes_what_stitching_cannot():
+    remeshed = voxel_remesh(Box(4, 4, 4).mesh(), pitch=0.5)
+    assert remeshed.is_watertight and remeshed.is_winding_consistent
+    assert remeshed.volume == pytest.approx(4.5**3)
+
+
+def test_export_repairs_instead_of_taking_the_hull(tmp_path):
+    pytest.importorskip("manifold3d")
+    plate = Box(20, 20, 4).at(0, 0, 2).mesh()
+    bored = tm.boolean.difference([plate, Cylinder(4, 10).at(0, 0, 2).mesh()], engine="manifold")
+    bored.update_faces(np.arange(len(bored.faces)) != 0)
+    exporter = STLExporter(output_dir=tmp_path, binary=True)
+    path = exporter.export_mesh(bored, "bored", preview=False)
+    written = tm.load(path)
+    assert exporter.last_repair.holes_filled == 1
+    assert written.volume < plate.volume - 150
@@ -12,3 +12,81 @@ def test_scaffolding_generation():
     assert scaff.bounds[0, 2] == pytest.approx(mesh.bounds[0, 2])
     assert scaff.bounds[1, 2] <= mesh.bounds[1, 2]
     assert scaff.vertices.shape[0] > 0
+
+
+def test_cluster_points_matches_per_cell_loop():
+    import numpy as np
+    from parametric_cad.scaffolding import cluster_points
+
+    pts = np.random.default_rng(0).uniform(0, 50, (2000, 3))
+    xy, top_z = cluster_points(pts, 5.0)
+    snapped = np.round(pts[:, :2] / 5.0)
+    cells = np.unique(snapped, axis=0)
+    assert len(xy) == len(cells)
+    for (x, y), z in zip(xy, top_z):
+        cell = np.round(np.array([x, y]) / 5.0)
+        in_cell = np.all(snapped == cell, axis=1)
+        top = pts[in_cell][np.argmax(pts[in_cell, 2])]
+        assert z == top[2]
+        assert (x, y) == (top[0], top[1])
+
+    centred, centred_z = cluster_points(pts, 5.0, snap_to_grid=True)
+    assert np.array_equal(centred_z, top_z)
+    assert np.array_equal(np.round(centred / 5.0) * 5.0, centred)
+    assert np.all(np.abs(centred - xy) <= 2.5)
+
+
+def test_columns_stop_at_surface_below():
+    # a shelf hanging over a lower step: supports land on the step
+    step = Box(20.0, 20.0, 2.0).at(0, 0, 1)
+    wall = Box(2.0, 20.0, 12.0).at(-9, 0, 6)
+    shelf = Box(18.0, 20.0, 2.0).at(0, 0, 11)
+    mesh = combine([step, wall, shelf])
+    scaff = generate_scaffolding(mesh, grid_size=5.0)
+    assert scaff.bounds[0, 2] == pytest.approx(2.0)
+    assert scaff.bounds[1, 2] == pytest.approx(10.0)
+    legacy = generate_scaffolding(mesh, grid_size=5.0, to_surface=False)
+    assert legacy.bounds[0, 2] == pytest.approx(0.0)
+    assert scaff.volume < legacy.volume
+
+
+def _wide_ledge():
+    import trimesh
+
+    base = Box(20.0, 20.0, 10.0)
+    ledge = Box(40.0, 40.0, 5.0).at(15, 5, 20)
+    pillar = Box(2.0, 2.0, 20.0).at(0, 0, 10)
+    mesh = combine([base, ledge, pillar])
+    v, f = trimesh.remesh.subdivide_to_size(mesh.vertices, mesh.faces, 1.0)
+    return trimesh.Trimesh(v, f)
+
+
+def test_tree_mode_uses_less_material_than_columns():
+    mesh = _wide_ledge()
+    columns = generate_scaffolding(mesh, grid_size=2.0)
+    tree = generate_scaffolding(mesh, grid_size=2.0, mode="tree")
+    assert tree.volume < columns.volume
+    assert tree.bounds[0, 2] >= mesh.bounds[0, 2] - 1e-6
+
+
+def test_tree_branches_respect_angle():
+    import numpy as np
+    from parametric_cad.scaffolding import _tree_segments, cluster_points, overhang_points
+
+    mesh = _wide_ledge()
+    xy, top_z = cluster_points(overhang_points(mesh), 2.0)
+    (start, end, _), _, _ = _tree_segments(mesh, xy, top_z, 30.0, 6.0, True, 0.5, 1.0)
+    vec = end - start
+    angle = np.degrees(np.arctan2(np.linalg.norm(vec[:, :2], axis=1), vec[:, 2]))
+    assert len(angle) and angle.max() <= 30.0 + 1e-6
+    with pytest.raises(ValueError):
+        generate_scaffolding(mesh, branch_angle_deg=60.0)
+
+
+def test_max_triangles_bounds_output():
+    mesh = _wide_ledge()
+    for mode in ("columns", "tree"):
+        scaff = generate_scaffolding(mesh, grid_size=1.0, mode=mode, max_triangles=2000)
+        assert 0 < len(scaff.faces) <= 2000
+    with pytest.raises(ValueError):
+        generate_scaffolding(mesh, mode="lattice")
@@ -0,0 +1,131 @@
+import asyncio
+import struct
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from parametric_cad.server import (
+    DesignClient,
+    DesignServer,
+    DesignService,
+    Job,
+    LatencyStats,
+    _InFlight,
+    _read_head,
+)
+
+
+def _serve(test, debounce=0.05):
+    async def run():
+        async with DesignServer(DesignService(1, debounce=debounce), port=0) as server:
+            async with DesignClient(port=server.port) as client:
+                await test(client)
+
+    asyncio.run(run())
+
+
+GEAR = {"class": "SpurGear", "params": {"module": 1.0, "teeth": 16}}
+
+
+def test_http_build_formats_and_metrics():
+    async def test(client):
+        reply = await client.build(GEAR)
+        assert reply.status == 200
+        assert reply.headers["content-type"] == "model/stl"
+        (count,) = struct.unpack("<I", reply.body[80:84])
+        assert len(reply.body) == 84 + 50 * count
+
+        glb = await client.build(dict(GEAR, format="glb"))
+        assert glb.status == 200 and glb.body[:4] == b"glTF"
+
+        assert (await client.build(GEAR, etag=reply.headers["etag"])).status == 304
+        assert (await client.build({"class": "os:system"})).status == 400
+        assert (await client.build({"class": "SpurGear", "params": {"bogus": 1}})).status == 400
+        # package attributes that are not parts are never constructed
+        rejected = await client.build({"class": "STLExporter", "params": {"output_dir": "nowhere"}})
+        assert rejected.status == 400 and b"not a part class" in rejected.body
+        assert (await client.request("GET", "/nowhere")).status == 404
+
+        metrics = await client.metrics()
+        assert metrics["ok"] == 2 and metrics["not_modified"] == 1 and metrics["errors"] == 2
+        assert metrics["latency_ms"]["count"] == 2
+        assert metrics["latency_ms"]["p50"] <= metrics["latency_ms"]["p99"]
+
+    _serve(test)
+
+
+def test_bad_content_length_gets_400():
+    async def test(client):
+        for value in ("abc", "-5"):
+            reader, writer = await asyncio.open_connection(client.host, client.port)
+            writer.write(f"POST /build HTTP/1.1\r\nContent-Length: {value}\r\n\r\n".encode("ascii"))
+            start_line, _ = await _read_head(reader)
+            assert start_line.split(" ", 2)[1] == "400"
+            writer.close()
+        assert (await client.request("GET", "/health")).status == 200
+
+    _serve(test)
+
+
+def test_websocket_supersedes_rapid_updates():
+    async def test(client):
+        socket = await client.websocket()
+        for i, teeth in enumerate((12, 14, 16)):
+            await socket.send({"id": i, "class": "SpurGear", "params": {"module": 1.0, "teeth": teeth}})
+        replies = [await socket.receive() for _ in range(3)]
+        statuses = {header["id"]: header["status"] for header, _ in replies}
+        assert statuses == {0: "superseded", 1: "superseded", 2: "ok"}
+        header, payload = next(r for r in replies if r[0]["status"] == "ok")
+        assert len(payload) == header["bytes"]
+
+        # returning to the mesh already shown needs no build
+        await socket.send({"id": 3, "class": "SpurGear", "params": {"module": 1.0, "teeth": 16}})
+        header, payload = await socket.receive()
+        assert header["status"] == "unchanged" and payload is None
+        await socket.close()
+
+        metrics = await client.metrics()
+        assert metrics["superseded"] == 2 and metrics["ok"] == 1
+
+    _serve(test, debounce=0.2)
+
+
+def test_job_validation_and_percentiles():
+    with pytest.raises(ValueError):
+        Job.from_dict({"class": "SpurGear", "format": "obj"})
+    with pytest.raises(ValueError):
+        Job.from_dict({"params": {}})
+    a = Job.from_dict({"class": "SpurGear", "params": {"teeth": 20, "module": 1.0}})
+    b = Job.from_dict({"class": "SpurGear", "params": {"module": 1.0, "teeth": 20}})
+    assert a.etag == b.etag != Job.from_dict(dict(GEAR, format="glb")).etag
+
+    stats = LatencyStats(window=100)
+    for ms in range(1, 101):
+        stats.add(ms / 1000.0)
+    report = stats.percentiles()
+    assert (report["p50"], report["p90"], report["p99"], report["max"]) == (50.0, 90.0, 99.0, 100.0)
+
+
+def test_broken_pool_restarts_once():
+    async def run():
+        service = DesignService(1)
+        pools = [ProcessPoolExecutor(1)]
+
+        def new_executor():
+            pools.append(ProcessPoolExecutor(1))
+            return pools[-1]
+
+        service._new_executor = new_executor
+        service._executor = broken = pools[0]
+        # two jobs in flight on the same pool both fail when a worker dies
+        loop = asyncio.get_running_loop()
+        for key in ("a", "b"):
+            future = loop.create_future()
+            future.set_exception(BrokenProcessPool())
+            service._finished(key, _InFlight(Future(), future, broken))
+        assert len(pools) == 2 and service._executor is pools[1]
+        for pool in pools:
+            pool.shutdown()
+
+    asyncio.run(run())
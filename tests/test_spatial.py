@@ -0,0 +1,124 @@
+import numpy as np
+from shapely.geometry import Point, box as rect
+
+from parametric_cad import Box, combine
+from parametric_cad.core import extrude, tm
+from parametric_cad.printability import PrintabilityValidator
+from parametric_cad.spatial import (
+    long_bridges,
+    self_intersections,
+    small_holes,
+    thin_walls,
+    triangle_index,
+)
+
+
+def test_candidate_pairs_match_brute_force():
+    mesh = tm.creation.icosphere(subdivisions=2, radius=5.0)
+    index = triangle_index(mesh)
+    pairs = np.concatenate(list(index.candidate_pairs()))
+    found = {tuple(p) for p in np.sort(pairs, axis=1)}
+    assert len(found) == len(pairs)
+
+    lo, hi = mesh.triangles.min(axis=1), mesh.triangles.max(axis=1)
+    i, j = np.triu_indices(len(mesh.faces), k=1)
+    overlap = np.all(np.maximum(lo[i], lo[j]) <= np.minimum(hi[i], hi[j]), axis=1)
+    assert found == set(zip(i[overlap], j[overlap]))
+
+
+def test_index_is_shared_and_dropped_on_change():
+    mesh = Box(2.0, 2.0, 2.0).mesh()
+    assert triangle_index(mesh) is triangle_index(mesh)
+    before = triangle_index(mesh)
+    mesh.apply_translation([1.0, 0.0, 0.0])
+    assert triangle_index(mesh) is not before
+
+
+def test_raycast_matches_brute_force():
+    mesh = tm.creation.icosphere(subdivisions=3, radius=5.0)
+    rng = np.random.default_rng(1)
+    origins = rng.uniform(-8, 8, (200, 3))
+    directions = rng.normal(size=(200, 3))
+    distance, face = triangle_index(mesh).raycast(origins, directions)
+
+    d = directions / np.linalg.norm(directions, axis=1, keepdims=True)
+    tri = mesh.triangles
+    expected = np.full(200, np.inf)
+    for k in range(200):
+        e1, e2 = tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]
+        h = np.cross(d[k], e2)
+        a = np.einsum("ij,ij->i", e1, h)
+        s = origins[k] - tri[:, 0]
+        u = np.einsum("ij,ij->i", s, h) / a
+        q = np.cross(s, e1)
+        v = (q @ d[k]) / a
+        t = np.einsum("ij,ij->i", e2, q) / a
+        hit = (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 0)
+        if hit.any():
+            expected[k] = t[hit].min()
+    assert np.allclose(distance, expected)
+    assert np.all((face >= 0) == np.isfinite(expected))
+
+
+def test_self_intersections():
+    assert len(self_intersections(Box(10.0, 10.0, 10.0).mesh())) == 0
+    touching = combine([Box(10.0, 10.0, 10.0), Box(4.0, 4.0, 4.0).at(0, 0, 7)])
+    assert len(self_intersections(touching)) == 0
+    overlapping = combine([Box(10.0, 10.0, 10.0), Box(10.0, 10.0, 10.0).at(5, 5, 5)])
+    pairs = self_intersections(overlapping)
+    assert len(pairs) > 0
+    # every reported pair has one face from each box
+    assert np.all((pairs[:, 0] < 12) & (pairs[:, 1] >= 12))
+
+
+def test_thin_walls_ignore_small_features():
+    plate = Box(20.0, 20.0, 0.5).mesh()
+    faces, thickness = thin_walls(plate, 0.8)
+    assert np.allclose(thickness, 0.5)
+    assert np.all(np.abs(plate.face_normals[faces, 2]) > 0.99)
+    assert len(thin_walls(Box(0.5, 0.5, 0.5).mesh(), 0.8)[0]) == 0
+    assert len(thin_walls(Box(20.0, 20.0, 1.0).mesh(), 0.8)[0]) == 0
+
+
+def test_small_holes():
+    shape = rect(-10, -10, 10, 10).difference(Point(0, 0).buffer(0.75, 16))
+    shape = shape.difference(Point(5, 5).buffer(2.0, 16))
+    plate = extrude(shape, 3.0)
+    holes = small_holes(plate, 2.0)
+    assert holes
+    for diameter, faces in holes:
+        assert 1.4 < diameter < 1.6
+        centers = plate.triangles_center[faces]
+        assert np.all(np.hypot(centers[:, 0], centers[:, 1]) < 0.8)
+
+
+def test_small_holes_among_many_disjoint_parts():
+    # loose parts are depth 0, not holes of each other; the holed plate
+    # among them still reports its hole
+    shape = rect(-10, -10, 10, 10).difference(Point(0, 0).buffer(0.75, 16))
+    parts = [Box(2.0, 2.0, 3.0).at(15 + 3 * i, 3 * j, 1.5).mesh() for i in range(20) for j in range(20)]
+    plate = combine([extrude(shape, 3.0), *parts])
+    holes = small_holes(plate, 2.0)
+    assert holes and all(1.4 < d < 1.6 for d, _ in holes)
+    assert len(small_holes(combine(parts), 2.0)) == 0
+
+
+def _bridge(width):
+    pillars = [Box(2.0, width, 5.0).at(x, 0, 2.5) for x in (-6.0, 6.0)]
+    return combine(pillars + [Box(14.0, width, 1.0).at(0, 0, 5.5)])
+
+
+def test_long_bridges():
+    assert long_bridges(_bridge(3.0), 5.0) == []
+    wide = _bridge(8.0)
+    (span, faces), = long_bridges(wide, 5.0)
+    assert np.isclose(span, 8.0)
+    assert np.all(wide.face_normals[faces, 2] < -0.99)
+    assert np.allclose(wide.triangles_center[faces, 2], 5.0)
+
+
+def test_validator_reports_faces():
+    validator = PrintabilityValidator()
+    errors = validator.validate_mesh(Box(20.0, 20.0, 0.5).mesh())
+    assert any(e.startswith("Wall thickness") for e in errors)
+    assert len(validator.last_faces["wall_thickness"]) == 4
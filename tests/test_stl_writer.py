@@ -0,0 +1,59 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from parametric_cad.core import combine, tm
+from parametric_cad.export.stl import STLExporter
+from parametric_cad.export.stl_writer import write_stl_ascii, write_stl_binary
+from parametric_cad.primitives.box import Box
+from parametric_cad.primitives.cylinder import Cylinder
+from parametric_cad.primitives.sphere import Sphere
+
+EXPECTED_DIR = Path(__file__).parent / "expected_stl"
+
+
+def _combo():
+    return combine([
+        Box(1.0, 2.0, 1.0).at(0, 0, 0.5),
+        Cylinder(radius=2.0, height=1.0, sections=8).at(3, 0, 0.5),
+        Box(0.5, 0.5, 0.5).at(0, 3, 0.25),
+    ])
+
+
+@pytest.mark.parametrize("chunk_faces", [1, 7, 65536])
+def test_ascii_writer_matches_fixtures_byte_for_byte(tmp_path, chunk_faces):
+    box = combine([Box(1.0, 1.0, 1.0)])
+    for name, mesh in [("test_box", box), ("combo", _combo())]:
+        path = tmp_path / f"{name}.stl"
+        write_stl_ascii(mesh, path, chunk_faces=chunk_faces)
+        assert path.read_bytes() == (EXPECTED_DIR / f"{name}.stl").read_bytes()
+
+
+def test_ascii_writer_matches_trimesh():
+    mesh = Sphere(radius=3.0, subdivisions=2).mesh()
+    buffer = io.BytesIO()
+    write_stl_ascii(mesh, buffer, chunk_faces=33)
+    assert buffer.getvalue() == tm.exchange.stl.export_stl_ascii(mesh).encode("utf-8")
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_binary_writer_matches_trimesh(tmp_path, mmap):
+    mesh = Sphere(radius=3.0, subdivisions=3).mesh()
+    path = tmp_path / "sphere.stl"
+    write_stl_binary(mesh, path, chunk_faces=100, mmap=mmap)
+    assert path.read_bytes() == tm.exchange.stl.export_stl(mesh)
+
+
+def test_binary_writer_accepts_file_objects():
+    mesh = _combo()
+    buffer = io.BytesIO()
+    write_stl_binary(mesh, buffer, chunk_faces=5)
+    assert buffer.getvalue() == tm.exchange.stl.export_stl(mesh)
+
+
+def test_exporter_binary_round_trip(tmp_path):
+    exporter = STLExporter(output_dir=tmp_path, binary=True, mmap=True)
+    path = exporter.export_mesh(Box(2.0, 3.0, 4.0), "box", preview=False)
+    loaded = tm.load(path)
+    assert loaded.extents == pytest.approx([2.0, 3.0, 4.0])
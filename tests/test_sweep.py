@@ -0,0 +1,37 @@
+import os
+import types
+
+import pytest
+
+from parametric_cad import ChainSprocket, SpurGear
+from parametric_cad.sweep import branch_key, expand_grid, sweep
+
+
+def test_sweep_matches_individual_meshes():
+    grid = {"teeth": [12, 18], "bore_diameter": [4, 6], "hole_count": [0, 4]}
+    results = sweep(SpurGear, grid, fixed={"module": 1.0})
+    assert isinstance(results, types.GeneratorType)
+    results = list(results)
+    assert len(results) == 8
+    for params, mesh in results:
+        expected = SpurGear(**params).mesh()
+        assert mesh.is_watertight
+        assert mesh.volume == pytest.approx(expected.volume)
+        assert len(mesh.faces) == len(expected.faces)
+
+
+def test_sprocket_branches_share_rim():
+    combos = expand_grid({"teeth": [10, 14], "bore_diameter": [6, 8, 10]})
+    keys = {branch_key(ChainSprocket(**p)) for p in combos}
+    assert len(keys) == 2
+    for params, mesh in sweep("ChainSprocket", {"teeth": [10], "bore_diameter": [6, 8]}):
+        assert mesh.volume == pytest.approx(ChainSprocket(**params).mesh().volume)
+
+
+def test_sweep_exports_on_worker_processes(tmp_path):
+    grid = {"teeth": [10, 12], "bore_diameter": [6, 8]}
+    results = list(sweep("ChainSprocket", grid, output_dir=str(tmp_path), workers=2))
+    assert len(results) == 4
+    for params, path in results:
+        assert os.path.isfile(path)
+        assert f"teeth{params['teeth']}" in os.path.basename(path)
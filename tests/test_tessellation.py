@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pytest
+
+from parametric_cad import ChainSprocket, Cylinder, SpurGear
+from parametric_cad.cache import mesh_cache_key
+from parametric_cad.tessellation import (
+    TessellationPolicy,
+    get_tessellation,
+    policy_from_rules,
+    tessellation,
+)
+
+
+def test_default_tolerance_follows_rules_file():
+    # 0.4 mm nozzle, 0.2 mm layers
+    assert policy_from_rules().tolerance == pytest.approx(0.05)
+
+
+@pytest.mark.parametrize("radius", [0.5, 2.0, 10.0, 80.0])
+def test_segments_keep_chord_error_within_tolerance(radius):
+    policy = TessellationPolicy(tolerance=0.05)
+    n = policy.segments(radius)
+    assert radius * (1 - math.cos(math.pi / n)) <= 0.05 + 1e-12
+    assert n >= policy.min_segments
+
+
+def test_cylinder_sections_scale_with_radius_and_override():
+    small = Cylinder(1.0, 2.0).mesh()
+    large = Cylinder(40.0, 2.0).mesh()
+    assert len(large.faces) > len(small.faces)
+    assert len(Cylinder(40.0, 2.0, sections=8).mesh().faces) == 32
+    with tessellation(0.5):
+        coarse = Cylinder(40.0, 2.0).mesh()
+    assert len(coarse.faces) < len(large.faces)
+
+
+def test_tolerance_is_part_of_cache_key():
+    key = mesh_cache_key(ChainSprocket(teeth=12))
+    with tessellation(get_tessellation().tolerance / 2):
+        assert mesh_cache_key(ChainSprocket(teeth=12)) != key
+    assert mesh_cache_key(ChainSprocket(teeth=12)) == key
+
+
+def test_gear_and_sprocket_outlines_have_no_slivers():
+    for teeth in (12, 27, 45, 80):
+        for part in (SpurGear(module=1.0, teeth=teeth), ChainSprocket(teeth=teeth)):
+            mesh = part.mesh()
+            assert mesh.is_watertight
+            assert np.min(mesh.edges_unique_length) > 0.3
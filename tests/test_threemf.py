@@ -0,0 +1,106 @@
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+import trimesh
+
+from parametric_cad.export.threemf import ThreeMFExporter
+from parametric_cad.primitives.box import Box
+from parametric_cad.primitives.cylinder import Cylinder
+
+NS = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+
+
+def _model(path):
+    with zipfile.ZipFile(path) as archive:
+        assert "[Content_Types].xml" in archive.namelist()
+        assert "_rels/.rels" in archive.namelist()
+        return ET.fromstring(archive.read("3D/3dmodel.model"))
+
+
+def test_identical_parts_share_one_mesh(tmp_path):
+    exporter = ThreeMFExporter(output_dir=tmp_path)
+    parts = {f"peg{i}": Cylinder(radius=1.0, height=2.0, sections=8).at(4 * i, 0, 1) for i in range(5)}
+    parts["base"] = Box(20.0, 4.0, 1.0).at(8, 0, 0.5)
+    path = exporter.export_meshes(parts, "plate")
+
+    root = _model(path)
+    objects = root.findall("m:resources/m:object", NS)
+    meshes = [o for o in objects if o.find("m:mesh", NS) is not None]
+    named = {o.get("name"): o for o in objects if o.get("name")}
+    assert len(meshes) == 2
+    assert set(named) == set(parts)
+    assert len(root.findall("m:build/m:item", NS)) == 6
+
+    meta = {m.get("name"): m.text for m in named["base"].iter(f"{{{NS['m']}}}metadata")}
+    assert meta["class"] == "Box"
+    assert meta["width"] == "20.0"
+
+
+def test_build_item_transform_places_part(tmp_path):
+    exporter = ThreeMFExporter(output_dir=tmp_path)
+    box = Box(2.0, 2.0, 2.0).rotate([0, 0, 1], 90).at(5, 6, 1)
+    root = _model(exporter.export_mesh(box, "single"))
+
+    values = np.array(root.find("m:build/m:item", NS).get("transform").split(), dtype=float)
+    matrix = np.eye(4)
+    matrix[:3, :4] = values.reshape(4, 3).T
+    vertices = np.array(
+        [[float(v.get(a)) for a in "xyz"] for v in root.iter(f"{{{NS['m']}}}vertex")]
+    )
+    placed = vertices @ matrix[:3, :3].T + matrix[:3, 3]
+    assert np.allclose(placed.min(axis=0), box.mesh().bounds[0])
+    assert np.allclose(placed.max(axis=0), box.mesh().bounds[1])
+
+
+def test_xml_round_trip_rebuilds_placed_parts(tmp_path):
+    box = Box(1.0, 1.0, 1.0).at(0, 0, 0.5)
+    pegs = [Cylinder(radius=1.0, height=1.0, sections=8).at(3 * i, 3, 0.5) for i in range(1, 3)]
+    root = _model(ThreeMFExporter(output_dir=tmp_path).export_meshes([box, *pegs], "round"))
+
+    objects = {o.get("id"): o for o in root.findall("m:resources/m:object", NS)}
+    volume = 0.0
+    for item in root.findall("m:build/m:item", NS):
+        component = objects[item.get("objectid")].find("m:components/m:component", NS)
+        mesh = objects[component.get("objectid")].find("m:mesh", NS)
+        vertices = [[float(v.get(a)) for a in "xyz"] for v in mesh.iter(f"{{{NS['m']}}}vertex")]
+        faces = [[int(t.get(k)) for k in ("v1", "v2", "v3")] for t in mesh.iter(f"{{{NS['m']}}}triangle")]
+        matrix = np.eye(4)
+        matrix[:3, :4] = np.array(item.get("transform").split(), dtype=float).reshape(4, 3).T
+        placed = trimesh.Trimesh(vertices, faces, process=False).apply_transform(matrix)
+        assert placed.is_watertight
+        volume += placed.volume
+    assert np.isclose(volume, box.mesh().volume + sum(p.mesh().volume for p in pegs))
+
+
+def test_validation_sees_parts_as_placed(tmp_path):
+    upright = Box(4.0, 4.0, 4.0).at(0, 0, 2)
+    tipped = Box(4.0, 4.0, 4.0).rotate([1, 0, 0], 45).at(10, 0, 3)
+    exporter = ThreeMFExporter(output_dir=tmp_path)
+    exporter.export_meshes({"upright": upright}, "upright")
+    # same definition as the upright box, but the rotation makes overhangs
+    with pytest.raises(ValueError, match="tipped"):
+        exporter.export_meshes({"upright": upright, "tipped": tipped}, "tipped")
+
+
+def test_compression_setting(tmp_path):
+    parts = [Cylinder(radius=2.0, height=2.0, sections=64).at(0, 0, 1)]
+    stored = ThreeMFExporter(tmp_path, compression="stored", validate=False).export_meshes(parts, "stored")
+    deflated = ThreeMFExporter(tmp_path, compresslevel=9, validate=False).export_meshes(parts, "deflated")
+    with zipfile.ZipFile(stored) as a, zipfile.ZipFile(deflated) as b:
+        assert a.getinfo("3D/3dmodel.model").compress_type == zipfile.ZIP_STORED
+        assert b.getinfo("3D/3dmodel.model").compress_size < a.getinfo("3D/3dmodel.model").compress_size
+    with pytest.raises(ValueError):
+        ThreeMFExporter(output_dir=tmp_path, compression="lzma")
+
+
+def test_trimesh_can_load_export(tmp_path):
+    pytest.importorskip("networkx")
+    pytest.importorskip("lxml")
+
+    box = Box(1.0, 1.0, 1.0).at(0, 0, 0.5)
+    cyl = Cylinder(radius=1.0, height=1.0, sections=8).at(3, 0, 0.5)
+    path = ThreeMFExporter(output_dir=tmp_path).export_meshes([box, cyl], "loaded")
+    scene = trimesh.load(path)
+    assert np.isclose(scene.to_geometry().volume, box.mesh().volume + cyl.mesh().volume)
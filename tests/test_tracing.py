@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from parametric_cad import Box, Cylinder, PrintabilityValidator, combine, safe_difference, tracing
+
+
+def test_disabled_tracing_records_nothing():
+    tracer = tracing.enable()
+    tracing.disable()
+    assert tracing.span("x") is tracing.span("y")
+    Box(1, 1, 1).mesh()
+    assert tracer.events == []
+
+
+def test_spans_record_counts_and_engine(tmp_path):
+    pytest.importorskip("manifold3d")
+    tracer = tracing.enable()
+    try:
+        # unusual size so the mesh cache cannot serve it
+        plate = combine([Box(10.125, 9.875, 2)])
+        safe_difference(plate, Cylinder(1, 5).mesh(), engine="manifold")
+        PrintabilityValidator(cache_size=0).validate_mesh(plate)
+    finally:
+        tracing.disable()
+
+    by_name = {e["name"]: e for e in tracer.events}
+    assert by_name["Box.mesh"]["args"]["faces"] == 12
+    assert "Box._create_mesh" in by_name
+    assert by_name["combine"]["args"]["parts"] == 1
+    assert by_name["safe_difference"]["args"]["engine"] == "manifold"
+    assert by_name["safe_difference"]["args"]["faces"] > 12
+    assert by_name["PrintabilityValidator.validate_mesh"]["args"]["errors"] == 0
+    assert "check.watertight" in by_name
+
+    path = tracer.write_chrome_trace(str(tmp_path / "trace.json"))
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert "safe_difference" in tracer.summary()
+
+
+def test_traced_decorator_names_and_errors():
+    @tracing.traced("work")
+    def work(fail=False):
+        if fail:
+            raise ValueError("boom")
+        return 3
+
+    tracer = tracing.enable()
+    try:
+        assert work() == 3
+        try:
+            work(fail=True)
+        except ValueError:
+            pass
+    finally:
+        tracing.disable()
+    assert [e["name"] for e in tracer.events] == ["work", "work"]
+    assert tracer.events[1]["args"]["error"] == "ValueError"
+    assert tracer.totals()["work"]["calls"] == 2
@@ -0,0 +1,53 @@
+from math import pi
+
+import numpy as np
+import pytest
+
+from parametric_cad import Box, Cylinder
+from parametric_cad.mechanisms import ButtHinge, RightAngleMotorBracket
+from parametric_cad.transform import IDENTITY, Placement
+
+
+def test_rotations_compose_and_at_order_does_not_matter():
+    twice = Box(2, 4, 6).rotate([0, 0, 1], pi / 4).rotate([0, 0, 1], pi / 4).at(1, 2, 3)
+    once = Box(2, 4, 6).at(1, 2, 3).rotate([0, 0, 1], pi / 2)
+    assert np.allclose(twice.transform_matrix(), once.transform_matrix())
+    assert np.allclose(twice.mesh().extents, [4, 2, 6])
+    assert np.allclose(twice.mesh().centroid, [1, 2, 3])
+    assert np.allclose(Box(1, 1, 1).at(5, 0, 0).translate(1, 0, 0).mesh().centroid, [6, 0, 0])
+
+
+def test_scale_and_mirror_keep_solid_outward():
+    part = Cylinder(1.0, 2.0, sections=32).scale([2, 1, 1]).mirror([1, 1, 0]).at(0, 0, 1)
+    mesh = part.mesh()
+    assert part.placement.flips
+    assert mesh.is_watertight and mesh.is_winding_consistent
+    assert mesh.volume == pytest.approx(2 * Cylinder(1.0, 2.0, sections=32).mesh().volume)
+    # cached normals were carried over and agree with the geometry
+    assert np.allclose(mesh.face_normals, mesh.copy().face_normals)
+
+
+def test_placement_is_immutable_value():
+    moved = IDENTITY.with_offset((1, 2, 3))
+    assert IDENTITY.is_identity and not moved.is_identity
+    with pytest.raises(ValueError):
+        moved.matrix[0, 3] = 5.0
+    turn = Placement.rotation([0, 0, 1], pi / 2)
+    assert turn.then(moved) == moved @ turn
+    assert hash(Placement.translation((0.0, -0.0, 0.0))) == hash(IDENTITY)
+    assert np.allclose(turn.apply([[1.0, 0.0, 0.0]]), [[0.0, 1.0, 0.0]])
+    with pytest.raises(ValueError):
+        Placement.scaling(0)
+
+
+@pytest.mark.parametrize("cls", [ButtHinge, RightAngleMotorBracket])
+def test_mechanisms_place_without_mutating_shared_mesh(cls):
+    part = cls()
+    start = part.mesh().bounds[0]
+    part.at(1, 2, 3)
+    part.at(1, 2, 3)
+    other = part.copy().at(0, 0, 0)
+    assert np.allclose(part.mesh().bounds[0], start + [1, 2, 3])
+    assert np.allclose(other.mesh().bounds[0], start)
+    assert other.base_mesh().vertices.tolist() == part.base_mesh().vertices.tolist()
+    assert other.cache_key() == part.cache_key()